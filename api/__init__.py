@@ -0,0 +1 @@
+# api package
@@ -0,0 +1,344 @@
+"""
+API HTTP/JSON (WSGI) exposant les services métier à des clients concurrents.
+
+Routes (`<entité>` parmi `users`, `customers`, `contracts`, `events`) :
+- `POST /auth/token` : `{"username", "password"}` -> `{"token", "expires_in"}` ;
+- `GET /<entité>?after=<id>&limit=<n>` : page de résultats (`list_page` du service),
+    `{"items": [...], "next_cursor": id | null}` et en-tête `Link` vers la page suivante ;
+- `GET /<entité>/<id>` : détail (relations de `DETAIL_LOAD` incluses) ;
+- `POST /<entité>`, `PATCH /<entité>/<id>`, `DELETE /<entité>/<id>` : `create`,
+    `update` et `delete` du service, dans une transaction. Les règles métier
+    (appartenance, contrat signé...) sont appliquées par les services, comme
+    pour la CLI ; un champ du corps portant le nom d'un paramètre du service
+    (`user`, `event_id`...) est refusé (400).
+
+Chaque requête (hors connexion) porte `Authorization: Bearer <token>` : les claims
+sont vérifiés par `AuthService.decode_token_cached`, puis l'utilisateur est relu
+avec son rôle. Chaque requête ouvre sa propre session sur le pool partagé
+(`get_engine`) et la referme en sortie ; le serveur traite les requêtes dans
+des fils distincts (`ThreadingWSGIServer`).
+
+Les réponses `GET` portent un `ETag` (empreinte du corps JSON) : un client qui
+renvoie `If-None-Match` reçoit `304 Not Modified` sans corps si rien n'a changé.
+Erreurs : `ValueError` -> 400 (404 si l'entité visée n'existe pas),
+`PermissionError` -> 403, token absent ou invalide -> 401, pool saturé -> 503.
+"""
+import hashlib
+import inspect
+import json
+from socketserver import ThreadingMixIn
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.config import API_MAX_BODY_BYTES, JWT_EXP_SECONDS
+from app.db.session import create_engine_and_session
+from app.db.transaction import transactional
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.user import User
+from app.repositories.loading import load_options
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+from app.services.permission_service import PermissionService
+from app.services.serialization import json_default
+from app.services.user_service import UserService
+from sentry import report_exception, trace
+
+
+class Resource(NamedTuple):
+    service_class: type
+    model: type
+    # préfixe des permissions (`customer:read`, ...)
+    permission: str
+    detail_load: Optional[dict] = None
+
+
+RESOURCES = {
+    "users": Resource(UserService, User, "user", UserService.DETAIL_LOAD),
+    "customers": Resource(CustomerService, Customer, "customer", CustomerService.DETAIL_LOAD),
+    "contracts": Resource(ContractService, Contract, "contract", ContractService.DETAIL_LOAD),
+    "events": Resource(EventService, Event, "event"),
+}
+
+# colonnes jamais renvoyées par l'API
+HIDDEN_COLUMNS = frozenset({"password_hash"})
+
+# utilisateur authentifié relu à chaque requête (le nom du rôle sert aux services)
+_USER_LOAD = {"role": "joined"}
+
+_STATUS = {
+    200: "200 OK",
+    201: "201 Created",
+    204: "204 No Content",
+    304: "304 Not Modified",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    403: "403 Forbidden",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+    413: "413 Payload Too Large",
+    500: "500 Internal Server Error",
+    503: "503 Service Unavailable",
+}
+
+
+class ApiError(Exception):
+    """Erreur traduite telle quelle en réponse HTTP (`status`, message JSON)."""
+
+    def __init__(self, status: int, message: str, headers: Optional[list] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or []
+
+
+def to_dict(obj, relations=()) -> dict:
+    """
+    Colonnes d'une entité (hors `HIDDEN_COLUMNS`), plus les relations simples
+    listées dans `relations` (déjà chargées, cf. `DETAIL_LOAD`) sous forme d'objets imbriqués.
+    """
+    data = {
+        attr.key: getattr(obj, attr.key)
+        for attr in sa_inspect(obj).mapper.column_attrs
+        if attr.key not in HIDDEN_COLUMNS
+    }
+    for name in relations:
+        related = getattr(obj, name)
+        data[name] = to_dict(related) if related is not None else None
+    return data
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Compare `If-None-Match` à l'ETag courant (comparaison faible, `*` accepté)."""
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class ApiApplication:
+    """
+    Application WSGI de l'API.
+
+    - `session_factory` : fabrique de sessions (par défaut celle de l'engine
+        partagé de `DB_NAME`, cf. `create_engine_and_session`) ; une session par requête.
+    - `auth_service` : `AuthService` utilisé pour les tokens et les mots de passe.
+    """
+
+    def __init__(self, session_factory=None, auth_service: Optional[AuthService] = None) -> None:
+        if session_factory is None:
+            _, session_factory = create_engine_and_session()
+        self.session_factory = session_factory
+        self.auth = auth_service or AuthService()
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"].upper()
+        segments = [s for s in environ.get("PATH_INFO", "").split("/") if s]
+        headers = []
+        try:
+            with trace("http.server", f"{method} /{'/'.join(segments[:1])}"):
+                status, payload, headers = self.dispatch(environ, method, segments)
+        except ApiError as exc:
+            status, payload, headers = exc.status, {"error": str(exc)}, exc.headers
+        except PoolTimeoutError:
+            status, payload = 503, {"error": "Base de données saturée, réessayez dans un instant"}
+        except Exception as exc:
+            report_exception(exc)
+            status, payload = 500, {"error": "Erreur interne"}
+
+        body = b""
+        if payload is not None:
+            body = json.dumps(payload, default=json_default, ensure_ascii=False).encode("utf-8")
+            headers.append(("Content-Type", "application/json; charset=utf-8"))
+        if method == "GET" and status == 200:
+            etag = etag_for(body)
+            # réponses propres à l'utilisateur : revalidation obligatoire
+            headers += [("ETag", etag), ("Cache-Control", "private, no-cache"), ("Vary", "Authorization")]
+            if etag_matches(environ.get("HTTP_IF_NONE_MATCH"), etag):
+                status, body = 304, b""
+                headers = [h for h in headers if h[0] != "Content-Type"]
+        headers.append(("Content-Length", str(len(body))))
+        start_response(_STATUS[status], headers)
+        return [body]
+
+    # ---- routage ----
+    def dispatch(self, environ, method: str, segments: list):
+        if segments == ["auth", "token"]:
+            self._allow(method, "POST")
+            return self.login(self._read_json(environ))
+        if not segments or segments[0] not in RESOURCES or len(segments) > 2:
+            raise ApiError(404, "Ressource inconnue")
+        resource = RESOURCES[segments[0]]
+        item_id = self._parse_id(segments[1]) if len(segments) == 2 else None
+        self._allow(method, *(("GET", "PATCH", "DELETE") if item_id is not None else ("GET", "POST")))
+
+        session = self.session_factory()
+        try:
+            user = self.authenticate(session, environ.get("HTTP_AUTHORIZATION", ""))
+            service = resource.service_class(session, PermissionService(session))
+            if method == "GET" and item_id is None:
+                return self.list_page(service, user, self._query(environ), segments[0])
+            if method == "GET":
+                return self.detail(session, resource, user, item_id)
+            return self.write(session, service, resource, user, method, item_id, environ)
+        finally:
+            session.close()
+
+    @staticmethod
+    def _allow(method: str, *allowed: str) -> None:
+        if method not in allowed:
+            raise ApiError(405, "Méthode non autorisée", [("Allow", ", ".join(allowed))])
+
+    @staticmethod
+    def _parse_id(raw: str) -> int:
+        if not raw.isdigit():
+            raise ApiError(404, "Ressource inconnue")
+        return int(raw)
+
+    @staticmethod
+    def _query(environ) -> dict:
+        params = {}
+        for name, values in parse_qs(environ.get("QUERY_STRING", "")).items():
+            if name not in ("after", "limit"):
+                continue
+            try:
+                params[name] = int(values[-1])
+            except ValueError:
+                raise ApiError(400, f"Paramètre {name} invalide : entier attendu") from None
+        return params
+
+    @staticmethod
+    def _read_json(environ) -> dict:
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        if length > API_MAX_BODY_BYTES:
+            raise ApiError(413, f"Corps de requête limité à {API_MAX_BODY_BYTES} octets")
+        raw = environ["wsgi.input"].read(length) if length else b""
+        try:
+            data = json.loads(raw or b"{}")
+        except ValueError:
+            raise ApiError(400, "Corps JSON invalide") from None
+        if not isinstance(data, dict):
+            raise ApiError(400, "Un objet JSON est attendu")
+        return data
+
+    # ---- authentification ----
+    def login(self, data: dict):
+        session = self.session_factory()
+        try:
+            user = UserRepository(session).get_by_username(str(data.get("username", "")))
+            try:
+                # vérification Argon2 sur le pool borné d'`AuthService`
+                ok = user is not None and self.auth.submit_verify_password(
+                    user.password_hash, str(data.get("password", ""))).result()
+            except RuntimeError as exc:
+                raise ApiError(503, str(exc)) from exc
+            if not ok:
+                raise ApiError(401, "Authentification échouée")
+            return 200, {"token": self.auth.create_token(user.id), "expires_in": JWT_EXP_SECONDS}, []
+        finally:
+            session.close()
+
+    def authenticate(self, session, authorization: str):
+        """Utilisateur porteur du token `Bearer` (claims vérifiés puis mis en cache)."""
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            raise ApiError(401, "Authentification requise", [("WWW-Authenticate", "Bearer")])
+        try:
+            user_id = int(self.auth.decode_token_cached(token.strip()).get("sub", ""))
+        except Exception:
+            raise ApiError(401, "Token invalide ou expiré", [("WWW-Authenticate", 'Bearer error="invalid_token"')]) from None
+        user = session.get(User, user_id, options=load_options(User, _USER_LOAD))
+        if user is None:
+            raise ApiError(401, "Utilisateur inconnu", [("WWW-Authenticate", 'Bearer error="invalid_token"')])
+        return user
+
+    # ---- lectures ----
+    def list_page(self, service, user, params: dict, name: str):
+        try:
+            page = service.list_page(user, params.get("after"), params.get("limit"))
+        except PermissionError as exc:
+            raise ApiError(403, str(exc)) from exc
+        headers = []
+        if page.has_next:
+            query = {"after": page.next_cursor, **({"limit": params["limit"]} if "limit" in params else {})}
+            headers.append(("Link", f'</{name}?{urlencode(query)}>; rel="next"'))
+        return 200, {"items": [to_dict(item) for item in page.items], "next_cursor": page.next_cursor}, headers
+
+    def detail(self, session, resource: Resource, user, item_id: int):
+        if not PermissionService(session).user_has_permission(user, f"{resource.permission}:read"):
+            raise ApiError(403, "Permission refusée")
+        load = resource.detail_load or {}
+        obj = session.get(resource.model, item_id, options=load_options(resource.model, load) if load else None)
+        if obj is None:
+            raise ApiError(404, "Ressource introuvable")
+        return 200, to_dict(obj, [name for name in load if "." not in name]), []
+
+    # ---- écritures ----
+    def write(self, session, service, resource: Resource, user, method: str, item_id: Optional[int], environ):
+        data = self._read_json(environ) if method != "DELETE" else {}
+        if method in ("POST", "PATCH"):
+            # `user`, `customer_id`... sont fournis par l'URL et le token, jamais par le corps
+            method_fn = service.create if method == "POST" else service.update
+            reserved = sorted(set(data) & named_parameters(method_fn))
+            if reserved:
+                raise ApiError(400, f"Champ(s) non autorisé(s) : {', '.join(reserved)}")
+        try:
+            with transactional(session):
+                if method == "POST":
+                    obj = service.create(user, **data)
+                elif method == "PATCH":
+                    obj = service.update(user, item_id, **data)
+                else:
+                    service.delete(user, item_id)
+                    obj = None
+        except PermissionError as exc:
+            raise ApiError(403, str(exc)) from exc
+        except ValueError as exc:
+            # relecture seulement en cas d'échec : distingue l'entité absente d'une donnée invalide
+            if item_id is not None and session.get(resource.model, item_id) is None:
+                raise ApiError(404, str(exc)) from exc
+            raise ApiError(400, str(exc)) from exc
+        if obj is None:
+            return 204, None, []
+        if method == "POST":
+            return 201, to_dict(obj), [("Location", f"/{environ['PATH_INFO'].strip('/')}/{obj.id}")]
+        return 200, to_dict(obj), []
+
+
+def named_parameters(method) -> set[str]:
+    """Paramètres nommés d'une méthode de service, hors `**fields` (ex. `user`, `event_id`)."""
+    return {name for name, param in inspect.signature(method).parameters.items()
+            if param.kind is not inspect.Parameter.VAR_KEYWORD}
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """Serveur WSGI de la bibliothèque standard, un fil par requête."""
+    daemon_threads = True
+    # file d'attente des connexions (5 par défaut) : au-delà, les clients simultanés
+    # subissent une retransmission SYN (~1 s) avant d'être acceptés
+    request_queue_size = 128
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def make_api_server(host: str, port: int, app: Optional[ApiApplication] = None, quiet: bool = False):
+    """Serveur prêt à lancer (`serve_forever`) ; `port=0` choisit un port libre."""
+    handler = _QuietHandler if quiet else WSGIRequestHandler
+    return make_server(host, port, app or ApiApplication(), server_class=ThreadingWSGIServer, handler_class=handler)
@@ -0,0 +1,78 @@
+import threading
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.db.session import _pool_options, configure_sqlite_engine, get_backend, get_database_url, get_engine
+
+
+# drivers asyncio substitués aux drivers synchrones (pymysql, sqlite3)
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite-memory": "sqlite+aiosqlite",
+}
+
+# registre des engines asyncio : une seule instance (et donc un seul pool) par URL
+_ASYNC_ENGINES = {}
+_ASYNC_SESSION_FACTORIES = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_async_database_url(db_name=None, backend=None) -> str:
+    """URL de `get_database_url` avec le driver asyncio du moteur (aiomysql, aiosqlite)."""
+    backend = get_backend(backend)
+    url = make_url(get_database_url(db_name, backend)).set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine(db_name=None, backend=None, **kwargs):
+    """
+    Retourne l'`AsyncEngine` partagé pour la base `db_name` (créé au premier appel),
+    avec les mêmes réglages de pool que l'engine synchrone (cf. `get_engine`).
+    """
+    backend = get_backend(backend)
+    url = get_async_database_url(db_name, backend)
+    engine = _ASYNC_ENGINES.get(url)
+    if engine is not None:
+        return engine
+    if backend == "sqlite-memory":
+        # la base en mémoire partagée est maintenue en vie par le registre synchrone
+        get_engine(db_name, backend)
+    with _REGISTRY_LOCK:
+        engine = _ASYNC_ENGINES.get(url)
+        if engine is None:
+            options = _pool_options(backend)
+            # même pool borné, dans sa version asyncio (y compris pour SQLite en mémoire)
+            options["poolclass"] = AsyncAdaptedQueuePool
+            options.update(kwargs)
+            engine = create_async_engine(url, echo=False, **options)
+            if backend != "mysql":
+                configure_sqlite_engine(engine.sync_engine)
+            _ASYNC_ENGINES[url] = engine
+            # pas d'expiration au commit : un attribut expiré ne peut être relu hors `await`
+            _ASYNC_SESSION_FACTORIES[url] = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    return engine
+
+
+def get_async_session(db_name=None, backend=None, **kwargs):
+    """
+    Retourne une `AsyncSession` liée à l'engine asyncio partagé de la base.
+
+    Usage :
+        async with get_async_session() as session:
+            events = await AsyncEventService(session).list_page(user)
+    """
+    get_async_engine(db_name, backend, **kwargs)
+    return _ASYNC_SESSION_FACTORIES[get_async_database_url(db_name, backend)]()
+
+
+async def dispose_async_engines() -> None:
+    """Ferme les pools de tous les engines asyncio enregistrés et vide le registre."""
+    with _REGISTRY_LOCK:
+        engines = list(_ASYNC_ENGINES.values())
+        _ASYNC_ENGINES.clear()
+        _ASYNC_SESSION_FACTORIES.clear()
+    for engine in engines:
+        await engine.dispose()
@@ -4,12 +4,46 @@ import os
 # Charge les variables d'environnement depuis le fichier .env
 load_dotenv()
 
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = int(os.getenv("DB_PORT"))
+# Moteur de base de données :
+# - "mysql" : serveur MySQL (DB_HOST, DB_PORT, DB_USER, DB_PASS) ;
+# - "sqlite" : fichier SQLite `<DB_NAME>.sqlite3` dans DB_SQLITE_DIR ;
+# - "sqlite-memory" : base SQLite en mémoire partagée par les connexions du processus.
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+DB_SQLITE_DIR = os.getenv("DB_SQLITE_DIR", ".")
+
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = int(os.getenv("DB_PORT", "3306"))
 DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS")
-DB_NAME = os.getenv("DB_NAME")
+DB_NAME = os.getenv("DB_NAME", "epic_events")
+
+# Réglages du pool de connexions (un pool partagé par URL de base de données)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Profil de coût Argon2 utilisé par défaut (cf. AuthService.HASH_PROFILES)
+ARGON2_PROFILE = os.getenv("ARGON2_PROFILE", "default")
+# Vérifications Argon2 hors du fil principal : nombre de threads dédiés (et donc de
+# cœurs mobilisables au maximum) et nombre de vérifications en attente toléré
+AUTH_VERIFY_WORKERS = int(os.getenv("AUTH_VERIFY_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+AUTH_VERIFY_MAX_PENDING = int(os.getenv("AUTH_VERIFY_MAX_PENDING", "64"))
 
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
-JWT_EXP_SECONDS = int(os.getenv("JWT_EXP_SECONDS"))
+JWT_EXP_SECONDS = int(os.getenv("JWT_EXP_SECONDS", "3600"))
+# Ré-émission du token seulement s'il expire dans moins de JWT_REFRESH_MARGIN secondes
+JWT_REFRESH_MARGIN = int(os.getenv("JWT_REFRESH_MARGIN", "300"))
+# Durée de conservation en mémoire des claims d'un token déjà vérifié
+JWT_CLAIMS_CACHE_TTL = int(os.getenv("JWT_CLAIMS_CACHE_TTL", "60"))
+# Cache de lecture des entités peu modifiées (utilisateurs, rôles) :
+# "memory" (dans le processus) ou "none" (désactivé), durée de vie et nombre d'entrées
+ENTITY_CACHE_BACKEND = os.getenv("ENTITY_CACHE_BACKEND", "memory").lower()
+ENTITY_CACHE_TTL = int(os.getenv("ENTITY_CACHE_TTL", "300"))
+ENTITY_CACHE_MAX_SIZE = int(os.getenv("ENTITY_CACHE_MAX_SIZE", "1024"))
+# API HTTP/JSON (`python -m main serve`) : adresse d'écoute et taille maximale d'un corps de requête
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", str(1024 * 1024)))
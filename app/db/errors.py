@@ -0,0 +1,61 @@
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+
+# MySQL : "Duplicate entry 'a@b.fr' for key 'customers.email'" (ou 'email' avant 8.0.19)
+_MYSQL_DUPLICATE_KEY = re.compile(r"for key '([^']+)'")
+# SQLite : "UNIQUE constraint failed: customers.email"
+_SQLITE_UNIQUE = re.compile(r"unique constraint failed: (.+)$", re.IGNORECASE)
+
+
+def unique_violation_field(exc: IntegrityError, fields: Iterable[str]) -> Optional[str]:
+    """
+    Retourne le champ (parmi `fields`) dont la contrainte d'unicité a été violée,
+    d'après le message d'erreur du driver, ou None si on ne peut pas le déterminer
+    (autre type de violation, driver non reconnu).
+    """
+    message = str(getattr(exc, "orig", exc))
+    match = _MYSQL_DUPLICATE_KEY.search(message) or _SQLITE_UNIQUE.search(message.strip())
+    if not match:
+        return None
+    # la clé peut être qualifiée (table.colonne) ou lister plusieurs colonnes
+    names = {part.split(".")[-1].strip() for part in match.group(1).split(",")}
+    for field in fields:
+        if field in names:
+            return field
+    return None
+
+
+def check_unique(session, model, unique_fields: dict, values: dict, exclude_id: Optional[int] = None) -> None:
+    """
+    Vérifie en une requête qu'aucune autre ligne de `model` n'utilise déjà les valeurs
+    des champs uniques renseignés dans `values` (l'égalité SQL suit la collation de la
+    base ; les lignes renvoyées sont comparées sans tenir compte de la casse).
+    `unique_fields` associe chaque champ au message de la ValueError levée ;
+    `exclude_id` écarte la ligne modifiée.
+    """
+    fields = [f for f in unique_fields if values.get(f)]
+    if not fields:
+        return
+    query = session.query(model.id, *[getattr(model, f) for f in fields]).filter(
+        or_(*[getattr(model, f) == values[f] for f in fields])
+    )
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+    conflicts = query.limit(len(fields)).all()
+    for field in fields:
+        wanted = str(values[field]).casefold()
+        if any(str(getattr(row, field)).casefold() == wanted for row in conflicts):
+            raise ValueError(unique_fields[field])
+
+
+def constraint_error(exc: IntegrityError, unique_fields: dict,
+                     default: str = "Violation de contrainte en base (doublon possible)") -> ValueError:
+    """Traduit une IntegrityError en ValueError : message du champ unique violé, sinon `default`."""
+    field = unique_violation_field(exc, unique_fields)
+    if field:
+        return ValueError(unique_fields[field])
+    return ValueError(default)
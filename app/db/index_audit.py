@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.event_repository import EventRepository
+from app.repositories.user_repository import UserRepository
+
+
+# requêtes des repositories passées au crible de `index-audit` : (nom, appel sur une session).
+# Les valeurs des paramètres importent peu : seul le plan d'exécution est examiné.
+# `list_all` (parcours complet voulu) n'y figure pas ; `list_page` est audité à partir
+# d'un curseur, comme pour toutes les pages après la première.
+AUDITED_QUERIES: tuple[tuple[str, Callable[[Session], object]], ...] = (
+    ("UserRepository.get_by_id", lambda s: UserRepository(s).get_by_id(1)),
+    ("UserRepository.get_by_username", lambda s: UserRepository(s).get_by_username("audit")),
+    ("UserRepository.list_page", lambda s: UserRepository(s).list_page(after_id=1)),
+    ("CustomerRepository.get_by_id", lambda s: CustomerRepository(s).get_by_id(1)),
+    ("CustomerRepository.list_page", lambda s: CustomerRepository(s).list_page(after_id=1)),
+    ("CustomerRepository.list_by_sales_user", lambda s: CustomerRepository(s).list_by_sales_user(1)),
+    ("ContractRepository.get_by_id", lambda s: ContractRepository(s).get_by_id(1)),
+    ("ContractRepository.list_page", lambda s: ContractRepository(s).list_page(after_id=1)),
+    ("ContractRepository.list_by_management_user", lambda s: ContractRepository(s).list_by_management_user(1)),
+    ("ContractRepository.list_by_customer_ids", lambda s: ContractRepository(s).list_by_customer_ids([1, 2])),
+    ("ContractRepository.list_by_management_user[signed=False]",
+     lambda s: ContractRepository(s).list_by_management_user(1, signed=False)),
+    ("ContractRepository.list_by_customer_ids[unpaid=True]",
+     lambda s: ContractRepository(s).list_by_customer_ids([1, 2], unpaid=True)),
+    ("EventRepository.get_by_id", lambda s: EventRepository(s).get_by_id(1)),
+    ("EventRepository.list_page", lambda s: EventRepository(s).list_page(after_id=1)),
+    ("EventRepository.list_by_support_user", lambda s: EventRepository(s).list_by_support_user(1)),
+    ("EventRepository.list_by_customer", lambda s: EventRepository(s).list_by_customer(1)),
+    ("EventRepository.list_by_customer_ids", lambda s: EventRepository(s).list_by_customer_ids([1, 2])),
+    ("EventRepository.list_by_sales_user", lambda s: EventRepository(s).list_by_sales_user(1)),
+    ("EventRepository.list_without_support", lambda s: EventRepository(s).list_without_support()),
+)
+
+
+@dataclass
+class QueryPlan:
+    """
+    Plan d'exécution d'une requête auditée : les lignes brutes d'EXPLAIN et les
+    tables lues intégralement (`full_scans`, vide si tous les accès passent par un index).
+    """
+    name: str
+    statement: str
+    plan: list[str] = field(default_factory=list)
+    full_scans: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans
+
+
+def _explain(connection, statement: str, parameters) -> tuple[list[str], list[str]]:
+    """
+    Exécute EXPLAIN sur la requête capturée et retourne (lignes du plan, tables parcourues en entier).
+    - SQLite : `EXPLAIN QUERY PLAN`, parcours complet = ligne « SCAN <table> » ;
+    - MySQL : `EXPLAIN`, parcours complet = `type` à `ALL`.
+    """
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        details = [row[-1] for row in rows]
+        scans = [
+            d.split()[1] for d in details
+            if d.startswith("SCAN ") and not d.startswith("SCAN CONSTANT ROW")
+        ]
+        return details, scans
+    result = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    rows = [dict(row._mapping) for row in result]
+    details = [
+        f"{row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')}"
+        for row in rows
+    ]
+    scans = [row.get("table") for row in rows if str(row.get("type")).upper() == "ALL"]
+    return details, scans
+
+
+def audit_queries(engine, queries=AUDITED_QUERIES) -> list[QueryPlan]:
+    """
+    Exécute chaque requête de `queries` en capturant les instructions SQL émises,
+    puis retourne le plan EXPLAIN de chacune (une entrée par instruction SELECT).
+    Les requêtes sont jouées dans une transaction annulée à la fin.
+    """
+    reports = []
+    with engine.connect() as connection:
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        transaction = connection.begin()
+        try:
+            with Session(bind=connection) as session:
+                for name, run in queries:
+                    captured.clear()
+                    event.listen(connection, "before_cursor_execute", capture)
+                    try:
+                        run(session)
+                    finally:
+                        event.remove(connection, "before_cursor_execute", capture)
+                    for statement, parameters in list(captured):
+                        plan, scans = _explain(connection, statement, parameters)
+                        reports.append(QueryPlan(name, statement, plan, scans))
+        finally:
+            transaction.rollback()
+    return reports
@@ -1,6 +1,10 @@
+import os
 import pymysql
 from sqlalchemy import text
-from app.db.session import create_engine_and_session, get_database_url
+from app.db.session import (
+    create_engine_and_session, dispose_engines, drop_memory_database, get_backend, get_database_url, sqlite_path,
+)
+from app.db.schema import check_schema_version, stamp_schema_version
 from app.models.base import Base
 from app.models.role import Role
 from app.models.permission import Permission
@@ -16,9 +20,24 @@ from app.db.config import DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME
 
 def drop_create_database():
     """
-    Supprime puis crée la base de données MySQL utilisée par l'application
+    Supprime puis crée la base de données utilisée par l'application, selon
+    le moteur configuré (`DB_BACKEND`) :
+    - MySQL : DROP/CREATE DATABASE ;
+    - SQLite : suppression du fichier (recréé à la première connexion) ;
+    - SQLite en mémoire : fermeture de la base partagée (recréée vide ensuite).
 
     """
+    backend = get_backend()
+    if backend == "sqlite":
+        dispose_engines()
+        path = sqlite_path()
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    if backend == "sqlite-memory":
+        drop_memory_database()
+        return
+
     # ouvre une connexion MySQL qui va chercher les identifiants dans .env
     conn = pymysql.connect(host=DB_HOST, port=DB_PORT, user=DB_USER, password=DB_PASS or "")
     try:
@@ -101,22 +120,24 @@ def seed(session):
     session.flush()
 
     # création users: 3 sales, 2 management, 2 support
-    auth = AuthService()
+    # les 7 mots de passe sont hachés en parallèle, avec le profil de coût « seed »
+    auth = AuthService(profile="seed")
+    password_hashes = iter(auth.hash_passwords(["password"] * 7))
     users = []
     # management
-    manager1 = User(role_id=role_management.id, user_first_name="Pierre", user_last_name="Manager", email="manager1@example.com", phone_number="+33100000001", username="manager1", password_hash=auth.hash_password("password"))
-    manager2 = User(role_id=role_management.id, user_first_name="Laura", user_last_name="Manager", email="manager2@example.com", phone_number="+33100000002", username="manager2", password_hash=auth.hash_password("password"))
+    manager1 = User(role_id=role_management.id, user_first_name="Pierre", user_last_name="Manager", email="manager1@example.com", phone_number="+33100000001", username="manager1", password_hash=next(password_hashes))
+    manager2 = User(role_id=role_management.id, user_first_name="Laura", user_last_name="Manager", email="manager2@example.com", phone_number="+33100000002", username="manager2", password_hash=next(password_hashes))
     users.extend([manager1, manager2])
 
     # sales
-    sales1 = User(role_id=role_sales.id, user_first_name="Paul", user_last_name="Sales", email="sales1@example.com", phone_number="+33100000011", username="sales1", password_hash=auth.hash_password("password"))
-    sales2 = User(role_id=role_sales.id, user_first_name="Sophie", user_last_name="Sales", email="sales2@example.com", phone_number="+33100000012", username="sales2", password_hash=auth.hash_password("password"))
-    sales3 = User(role_id=role_sales.id, user_first_name="Thomas", user_last_name="Sales", email="sales3@example.com", phone_number="+33100000013", username="sales3", password_hash=auth.hash_password("password"))
+    sales1 = User(role_id=role_sales.id, user_first_name="Paul", user_last_name="Sales", email="sales1@example.com", phone_number="+33100000011", username="sales1", password_hash=next(password_hashes))
+    sales2 = User(role_id=role_sales.id, user_first_name="Sophie", user_last_name="Sales", email="sales2@example.com", phone_number="+33100000012", username="sales2", password_hash=next(password_hashes))
+    sales3 = User(role_id=role_sales.id, user_first_name="Thomas", user_last_name="Sales", email="sales3@example.com", phone_number="+33100000013", username="sales3", password_hash=next(password_hashes))
     users.extend([sales1, sales2, sales3])
 
     # support
-    support1 = User(role_id=role_support.id, user_first_name="Claire", user_last_name="Support", email="support1@example.com", phone_number="+33100000021", username="support1", password_hash=auth.hash_password("password"))
-    support2 = User(role_id=role_support.id, user_first_name="Virgile", user_last_name="Support", email="support2@example.com", phone_number="+33100000022", username="support2", password_hash=auth.hash_password("password"))
+    support1 = User(role_id=role_support.id, user_first_name="Claire", user_last_name="Support", email="support1@example.com", phone_number="+33100000021", username="support1", password_hash=next(password_hashes))
+    support2 = User(role_id=role_support.id, user_first_name="Virgile", user_last_name="Support", email="support2@example.com", phone_number="+33100000022", username="support2", password_hash=next(password_hashes))
     users.extend([support1, support2])
 
     session.add_all(users)
@@ -165,27 +186,52 @@ def seed(session):
     session.commit()
 
 
-def main():
+def init_schema():
+    """
+    Réinitialise la base (DROP + CREATE), crée les tables SQLAlchemy puis
+    enregistre la version du schéma. Aucune donnée n'est insérée.
     """
-    Point d'entrée d'initialisation de la base de données.
+    drop_create_database()
+    # la base vient d'être recréée : les connexions déjà ouvertes sont obsolètes
+    dispose_engines()
+    engine, _ = create_engine_and_session()
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        stamp_schema_version(conn)
 
-    Étapes exécutées :
-    1. suppression/création de la base MySQL via `drop_create_database()` ;
-    2. création des tables SQLAlchemy (`Base.metadata.create_all` sur l'engine) ;
-    3. exécution du `seed(session)` pour pré-remplir les données ;
-    4. fermeture propre de la session.
 
+def seed_database() -> bool:
+    """
+    Exécute le `seed` sur une base déjà initialisée.
+    Retourne False (sans rien modifier) si la base contient déjà des rôles.
     """
-
-    drop_create_database()
     engine, SessionLocal = create_engine_and_session()
-    Base.metadata.create_all(engine)
+    check_schema_version(engine)
     session = SessionLocal()
     try:
+        if session.query(Role.id).first() is not None:
+            return False
         seed(session)
+        return True
     finally:
         session.close()
 
 
+def main():
+    """
+    Point d'entrée d'initialisation complète de la base de données.
+
+    Étapes exécutées :
+    1. suppression/création de la base (MySQL ou SQLite selon `DB_BACKEND`), création des tables SQLAlchemy
+        et enregistrement de la version du schéma via `init_schema()` ;
+    2. exécution du `seed(session)` pour pré-remplir les données ;
+    3. fermeture propre de la session.
+
+    """
+
+    init_schema()
+    seed_database()
+
+
 if __name__ == "__main__":
     main()
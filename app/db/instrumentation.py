@@ -0,0 +1,198 @@
+import contextvars
+import functools
+import heapq
+import inspect
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+
+
+# nombre de requêtes les plus lentes conservées par périmètre
+SLOWEST_KEPT = 5
+
+
+@dataclass
+class QueryStats:
+    """
+    Statistiques SQL d'un périmètre (action CLI, méthode de service, bloc de test) :
+    nombre d'instructions, temps cumulé passé en base, durée totale du périmètre
+    et les `SLOWEST_KEPT` instructions les plus lentes, sous forme (durée en s, SQL).
+    `statements` n'est renseigné que si `keep_statements` est vrai.
+    """
+    count: int = 0
+    db_time: float = 0.0
+    elapsed: float = 0.0
+    calls: int = 0
+    slowest: list = field(default_factory=list)
+    keep_statements: bool = False
+    statements: list = field(default_factory=list)
+
+    def record(self, duration: float, statement: str) -> None:
+        self.count += 1
+        self.db_time += duration
+        if self.keep_statements:
+            self.statements.append(statement)
+        entry = (duration, statement)
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def merge(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.db_time += other.db_time
+        self.elapsed += other.elapsed
+        self.calls += other.calls
+        for duration, statement in other.slowest:
+            if len(self.slowest) < SLOWEST_KEPT:
+                heapq.heappush(self.slowest, (duration, statement))
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (duration, statement))
+
+    def slowest_first(self) -> list:
+        return sorted(self.slowest, reverse=True)
+
+
+@dataclass
+class _Frame:
+    label: str
+    stats: QueryStats
+    children: dict = field(default_factory=dict)
+
+
+class QueryProfiler:
+    """
+    Instrumentation des requêtes SQL branchée sur les évènements
+    `before_cursor_execute` / `after_cursor_execute` d'un engine.
+
+    Les requêtes sont imputées à tous les périmètres ouverts (`scope(label)`),
+    emboîtables : une action CLI contient les méthodes de service qu'elle appelle.
+    À la fermeture d'un périmètre, ses statistiques sont cumulées dans `totals[label]`
+    et dans les `children` du périmètre parent ; `on_action_end(label, stats, children)`
+    est appelé à la fermeture d'un périmètre de premier niveau.
+    Les requêtes émises hors de tout périmètre ne sont pas comptées.
+    """
+
+    def __init__(self, on_action_end: Optional[Callable] = None, keep_statements: bool = False) -> None:
+        self.on_action_end = on_action_end
+        self.keep_statements = keep_statements
+        self.totals: dict[str, QueryStats] = {}
+        self._frames = contextvars.ContextVar(f"query_frames_{id(self)}", default=())
+        self._engines = []
+        self._patched = []
+
+    # ---- engine ----
+    def attach(self, engine) -> None:
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        self._engines.append(engine)
+
+    def detach(self) -> None:
+        """Retire les écouteurs et restaure les méthodes instrumentées."""
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_execute)
+            event.remove(engine, "after_cursor_execute", self._after_execute)
+        self._engines.clear()
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched.clear()
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        # horodatage porté par le contexte d'exécution : rien ne reste en suspens si la requête échoue
+        context._query_start_time = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        start = getattr(context, "_query_start_time", None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        for frame in self._frames.get():
+            frame.stats.record(duration, statement)
+
+    # ---- périmètres ----
+    @contextmanager
+    def scope(self, label: str):
+        frame = _Frame(label, QueryStats(calls=1, keep_statements=self.keep_statements))
+        parents = self._frames.get()
+        token = self._frames.set(parents + (frame,))
+        start = time.perf_counter()
+        try:
+            yield frame.stats
+        finally:
+            frame.stats.elapsed = time.perf_counter() - start
+            self._frames.reset(token)
+            self.totals.setdefault(label, QueryStats()).merge(frame.stats)
+            if parents:
+                parents[-1].children.setdefault(label, QueryStats()).merge(frame.stats)
+            elif self.on_action_end is not None:
+                self.on_action_end(label, frame.stats, frame.children)
+
+    def wrap(self, func: Callable, label: str) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.scope(label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def profile_class(self, cls, exclude: Iterable[str] = ()) -> None:
+        """
+        Instrumente les méthodes publiques de `cls` (un périmètre `Classe.méthode`
+        par appel), sauf celles listées dans `exclude`. Annulé par `detach()`.
+        """
+        exclude = set(exclude)
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or name in exclude or not inspect.isfunction(member):
+                continue
+            self._patched.append((cls, name, member))
+            setattr(cls, name, self.wrap(member, f"{cls.__name__}.{name}"))
+
+
+def format_stats(label: str, stats: QueryStats, children: Optional[dict] = None, width: int = 120) -> list[str]:
+    """Lignes de résumé d'un périmètre : totaux, détail par méthode, requêtes les plus lentes."""
+    lines = [
+        f"[profil] {label} : {stats.count} requête(s), {stats.db_time * 1000:.1f} ms en base "
+        f"({stats.elapsed * 1000:.1f} ms au total)"
+    ]
+    for child_label, child in sorted((children or {}).items(), key=lambda item: -item[1].db_time):
+        lines.append(
+            f"    {child_label} x{child.calls} : {child.count} requête(s), {child.db_time * 1000:.1f} ms"
+        )
+    for duration, statement in stats.slowest_first()[:3]:
+        sql = " ".join(statement.split())
+        if len(sql) > width:
+            sql = sql[:width - 3] + "..."
+        lines.append(f"    {duration * 1000:7.2f} ms  {sql}")
+    return lines
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Compte les requêtes émises par `engine` dans le bloc ; retourne les
+    `QueryStats` (avec la liste des instructions dans `statements`).
+    """
+    profiler = QueryProfiler(keep_statements=True)
+    profiler.attach(engine)
+    try:
+        with profiler.scope("count_queries") as stats:
+            yield stats
+    finally:
+        profiler.detach()
+
+
+@contextmanager
+def assert_max_queries(engine, expected: int):
+    """
+    Échoue (AssertionError listant les instructions) si le bloc émet plus de
+    `expected` requêtes : garde-fou contre les régressions N+1 dans les tests.
+    """
+    with count_queries(engine) as stats:
+        yield stats
+    if stats.count > expected:
+        statements = "\n".join(f"  {s}" for s in stats.statements)
+        raise AssertionError(f"{stats.count} requêtes SQL émises (maximum attendu : {expected}) :\n{statements}")
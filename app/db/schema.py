@@ -0,0 +1,49 @@
+from typing import Optional
+
+from sqlalchemy import Column, Integer, Table, inspect, select
+from app.models.base import Base
+
+
+# version du schéma attendue par le code ; à incrémenter à chaque évolution des tables
+SCHEMA_VERSION = 2
+
+# table technique (une seule ligne) renseignée par `init-db`
+schema_version = Table(
+    "schema_version",
+    Base.metadata,
+    Column("version", Integer, nullable=False),
+)
+
+
+def stamp_schema_version(connection, version: int = SCHEMA_VERSION) -> None:
+    """
+    Enregistre la version du schéma (remplace la valeur existante).
+    """
+    connection.execute(schema_version.delete())
+    connection.execute(schema_version.insert().values(version=version))
+
+
+def get_schema_version(engine) -> Optional[int]:
+    """
+    Retourne la version enregistrée en base, ou None si la base n'a pas été
+    initialisée (table absente ou vide).
+    """
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_version.name):
+            return None
+        return conn.execute(select(schema_version.c.version)).scalar()
+
+
+def check_schema_version(engine) -> None:
+    """
+    Vérifie que la base a été initialisée avec la version de schéma attendue.
+    Lève RuntimeError avec un message explicite sinon.
+    """
+    version = get_schema_version(engine)
+    if version is None:
+        raise RuntimeError("Base non initialisée : lancer `python -m main init-db` puis `python -m main seed`")
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Version de schéma incompatible (base : {version}, attendue : {SCHEMA_VERSION}) : "
+            "relancer `python -m main init-db`"
+        )
@@ -1,13 +1,109 @@
-from sqlalchemy import create_engine
+import os
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
-from app.db.config import DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME
+from sqlalchemy.pool import QueuePool
+from app.db.config import (
+    DB_BACKEND, DB_SQLITE_DIR,
+    DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+)
+
+
+# registre des engines : une seule instance (et donc un seul pool) par URL
+_ENGINES = {}
+_SESSION_FACTORIES = {}
+_REGISTRY_LOCK = threading.Lock()
+# connexions sqlite3 gardées ouvertes : une base SQLite en mémoire partagée
+# disparaît à la fermeture de sa dernière connexion
+_MEMORY_KEEPERS = {}
+
+BACKENDS = ("mysql", "sqlite", "sqlite-memory")
 
-def get_database_url(db_name=None):
+
+class PoolStats:
     """
-    Construit l'URL de connexion à la base de données MySQL.
+    Compteurs cumulés sur les demandes de connexion adressées au pool.
+    Le temps d'attente correspond au délai entre la demande d'une connexion
+    et sa mise à disposition (attente d'une connexion libre, ouverture, pre-ping).
     """
 
-    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    `QueuePool` qui mesure le temps d'attente de chaque checkout.
+    Les statistiques survivent à un `recreate()` (ex. après `engine.dispose()`).
+    """
+
+    def __init__(self, creator, stats: PoolStats | None = None, **kw) -> None:
+        super().__init__(creator, **kw)
+        self.stats = stats or PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+
+def get_backend(backend=None) -> str:
+    """Retourne le moteur configuré (`DB_BACKEND`), après validation."""
+    backend = (backend or DB_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"DB_BACKEND inconnu : {backend} (attendu : {', '.join(BACKENDS)})")
+    return backend
+
+
+def sqlite_path(db_name=None) -> str:
+    """Chemin du fichier SQLite de la base `db_name` (backend `sqlite`)."""
+    return os.path.join(DB_SQLITE_DIR, f"{db_name or DB_NAME}.sqlite3")
+
+
+def _sqlite_memory_uri(db_name=None) -> str:
+    return f"file:{db_name or DB_NAME}?mode=memory&cache=shared"
+
+
+def get_database_url(db_name=None, backend=None):
+    """
+    Construit l'URL de connexion à la base de données selon le moteur configuré
+    (`DB_BACKEND` : MySQL, fichier SQLite ou SQLite en mémoire partagée).
+    """
+    backend = get_backend(backend)
+    if backend == "sqlite":
+        return f"sqlite:///{sqlite_path(db_name)}"
+    if backend == "sqlite-memory":
+        return f"sqlite:///{_sqlite_memory_uri(db_name)}&uri=true"
+
     db = db_name or DB_NAME
     user = DB_USER
     password = DB_PASS or ""
@@ -16,27 +112,152 @@ def get_database_url(db_name=None):
     return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db}?charset=utf8mb4"
 
 
-def create_engine_and_session(db_name=None, **kwargs):
-    """ 
-    Convenience helper: crée un engine + SessionLocal SQLAlchemy prêts à l'emploi.
+def _pool_options(backend=None) -> dict:
+    """Options du pool lues depuis `app.db.config`, adaptées au moteur."""
+    backend = get_backend(backend)
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if backend != "mysql":
+        # connexions locales : ni recyclage ni pre-ping ; partage entre threads autorisé
+        options.update(pool_recycle=-1, pool_pre_ping=False, connect_args={"check_same_thread": False})
+    return options
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    # SQLite n'applique les clés étrangères que sur demande (MySQL/InnoDB toujours)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+    # plus de transaction implicite du driver sqlite3 : SQLAlchemy émet BEGIN (`_begin_sqlite`)
+    dbapi_connection.isolation_level = None
+
+
+def _begin_sqlite(conn) -> None:
+    # sans BEGIN explicite, sqlite3 n'ouvre la transaction qu'à la première écriture : un
+    # SAVEPOINT (`begin_nested`) émis avant devient la transaction englobante et son
+    # RELEASE valide les lignes, que le rollback de la session n'annule plus
+    conn.exec_driver_sql("BEGIN")
+
+
+def configure_sqlite_engine(engine) -> None:
+    """Clés étrangères actives et transactions explicites (SAVEPOINT fiables) pour un engine SQLite."""
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    event.listen(engine, "begin", _begin_sqlite)
+
+
+def get_engine(db_name=None, backend=None, **kwargs):
+    """
+    Retourne l'engine partagé pour la base `db_name` (créé au premier appel),
+    sur le moteur `backend` (par défaut `DB_BACKEND`).
+
+    Les `**kwargs` complètent/écrasent les options du pool mais ne sont pris
+    en compte qu'à la création : les appels suivants pour la même URL
+    retournent l'engine déjà enregistré.
+    """
+    backend = get_backend(backend)
+    url = get_database_url(db_name, backend)
+    engine = _ENGINES.get(url)
+    if engine is not None:
+        return engine
+    with _REGISTRY_LOCK:
+        engine = _ENGINES.get(url)
+        if engine is None:
+            options = _pool_options(backend)
+            options.update(kwargs)
+            if backend == "sqlite-memory" and url not in _MEMORY_KEEPERS:
+                _MEMORY_KEEPERS[url] = sqlite3.connect(_sqlite_memory_uri(db_name), uri=True, check_same_thread=False)
+            engine = create_engine(url, future=True, echo=False, **options)
+            if backend != "mysql":
+                configure_sqlite_engine(engine)
+            _ENGINES[url] = engine
+            _SESSION_FACTORIES[url] = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    return engine
+
+
+def create_engine_and_session(db_name=None, backend=None, **kwargs):
+    """
+    Convenience helper: retourne l'engine partagé + SessionLocal SQLAlchemy prêts à l'emploi.
     """
-    url = get_database_url(db_name)
-    engine = create_engine(url, future=True, echo=False, **kwargs)
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    return engine, SessionLocal
+    engine = get_engine(db_name, backend, **kwargs)
+    return engine, _SESSION_FACTORIES[get_database_url(db_name, backend)]
 
 
 def get_session(db_name=None, **kwargs):
     """
-    Convenience helper: crée un engine + SessionLocal puis retourne une
-    instance de session SQLAlchemy prête à l'emploi.
+    Convenience helper: retourne une instance de session SQLAlchemy prête
+    à l'emploi, liée à l'engine (et au pool) partagé de la base.
 
     Usage :
         session = get_session()
 
     Paramètres :
     - `db_name` (optionnel) : si fourni, construit l'URL pour cette base.
-    - `**kwargs` : arguments supplémentaires passés à `create_engine`.
+    - `**kwargs` : arguments supplémentaires passés à `create_engine`
+        lors de la première création de l'engine.
     """
     engine, SessionLocal = create_engine_and_session(db_name, **kwargs)
     return SessionLocal()
+
+
+def pool_statistics(db_name=None) -> dict:
+    """
+    Retourne l'état du pool de la base `db_name` : connexions ouvertes,
+    empruntées, débordement, ainsi que les temps d'attente cumulés.
+    Retourne un dictionnaire vide si aucun engine n'a encore été créé.
+    """
+    engine = _ENGINES.get(get_database_url(db_name))
+    if engine is None:
+        return {}
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size() if hasattr(pool, "size") else None,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+    }
+    pool_stats = getattr(pool, "stats", None)
+    if pool_stats is not None:
+        stats.update({
+            "checkouts": pool_stats.checkouts,
+            "timeouts": pool_stats.timeouts,
+            "wait_total_s": pool_stats.wait_total,
+            "wait_max_s": pool_stats.wait_max,
+            "wait_avg_ms": (pool_stats.wait_total / pool_stats.checkouts * 1000) if pool_stats.checkouts else 0.0,
+        })
+    return stats
+
+
+def dispose_engines() -> None:
+    """
+    Ferme les pools de tous les engines enregistrés et vide le registre
+    (utile après un DROP/CREATE de la base ou en fin de tests).
+    Les bases SQLite en mémoire ne sont pas concernées : elles vivent jusqu'à
+    `drop_memory_database()` ou la fin du processus.
+    """
+    with _REGISTRY_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+        _SESSION_FACTORIES.clear()
+
+
+def drop_memory_database(db_name=None) -> None:
+    """
+    Supprime la base SQLite en mémoire `db_name` (backend `sqlite-memory`) :
+    ferme son engine et la connexion qui la maintenait en vie.
+    """
+    url = get_database_url(db_name, backend="sqlite-memory")
+    with _REGISTRY_LOCK:
+        engine = _ENGINES.pop(url, None)
+        _SESSION_FACTORIES.pop(url, None)
+        if engine is not None:
+            engine.dispose()
+        keeper = _MEMORY_KEEPERS.pop(url, None)
+        if keeper is not None:
+            keeper.close()
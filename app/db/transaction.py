@@ -1,4 +1,4 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 @contextmanager
 def transactional(session):
@@ -15,3 +15,14 @@ def transactional(session):
     except Exception:
         session.rollback()
         raise
+
+
+@asynccontextmanager
+async def async_transactional(session):
+    """Variante de `transactional` pour une `AsyncSession` (commit ou rollback attendus)."""
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, Boolean, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -15,6 +15,13 @@ class Contract(TimestampMixin, Base):
     balance_due = Column(Numeric(10, 2), nullable=False)
     signed = Column(Boolean, default=False, nullable=False)
 
+    # index des filtres chauds : contrats d'un gestionnaire (signés ou non),
+    # contrats d'un client (soldés ou non)
+    __table_args__ = (
+        Index("ix_contracts_management_signed", "user_management_id", "signed"),
+        Index("ix_contracts_customer_balance", "customer_id", "balance_due"),
+    )
+
     customer = relationship("Customer", back_populates="contracts")
     manager = relationship("User", back_populates="managed_contracts")
     events = relationship("Event", back_populates="contract")
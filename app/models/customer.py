@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -16,6 +16,10 @@ class Customer(TimestampMixin, Base):
     phone_number = Column(String(20), unique=True, nullable=False)
     company_name = Column(String(100), unique=True, nullable=False)
 
+    __table_args__ = (
+        Index("ix_customers_sales_user", "user_sales_id"),
+    )
+
     sales_user = relationship("User", back_populates="customers")
     contracts = relationship("Contract", back_populates="customer")
     events = relationship("Event", back_populates="customer")
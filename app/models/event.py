@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -19,6 +19,14 @@ class Event(TimestampMixin, Base):
     attendees = Column(Integer, nullable=True)
     note = Column(Text, nullable=True)
 
+    # index des filtres chauds : évènements d'un support (ou sans support : un index
+    # B-tree couvre aussi `user_support_id IS NULL`), d'un client, d'un contrat
+    __table_args__ = (
+        Index("ix_events_support_start", "user_support_id", "start_datetime"),
+        Index("ix_events_customer", "customer_id"),
+        Index("ix_events_contract", "contract_id"),
+    )
+
     contract = relationship("Contract", back_populates="events")
     customer = relationship("Customer", back_populates="events")
     support_user = relationship("User", back_populates="support_events")
@@ -0,0 +1,71 @@
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.event_repository import EventRepository
+from app.repositories.user_repository import UserRepository
+
+
+def _delegate(name: str):
+    async def method(self, *args, **kwargs):
+        return await self._run(name, *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = f"Variante asynchrone de `{name}` (mêmes paramètres, même résultat)."
+    return method
+
+
+class AsyncAdapter:
+    """
+    Variante asynchrone d'une classe synchrone (`sync_class`) sur une `AsyncSession`.
+
+    Chaque méthode publique de `sync_class` devient une coroutine qui exécute la
+    méthode d'origine via `AsyncSession.run_sync` : requêtes, validation et
+    permissions restent celles du code synchrone, seules les entrées/sorties de
+    la base passent par le driver asyncio (aiomysql, aiosqlite) sans bloquer
+    la boucle d'évènements.
+
+    Les entités retournées restent liées à la session : leurs colonnes sont
+    lisibles, mais une relation non préchargée (`load=...`) ne peut pas être
+    chargée hors `await` (MissingGreenlet). Une `AsyncSession` ne se partage pas
+    entre tâches concurrentes : une session par tâche.
+    """
+
+    sync_class = None
+    # les itérateurs (curseur côté serveur) ne peuvent pas être consommés hors `run_sync`
+    exclude = ("stream_columns",)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.sync_class is None:
+            return
+        for name, member in vars(cls.sync_class).items():
+            if name.startswith("_") or name in cls.exclude or name in vars(cls):
+                continue
+            if callable(member):
+                setattr(cls, name, _delegate(name))
+            elif name.isupper():
+                # constantes de classe (LIST_COLUMNS, DETAIL_LOAD, ...)
+                setattr(cls, name, member)
+
+    def __init__(self, session) -> None:
+        self.session = session
+
+    def _sync(self, sync_session):
+        return self.sync_class(sync_session)
+
+    async def _run(self, name: str, *args, **kwargs):
+        return await self.session.run_sync(lambda sync_session: getattr(self._sync(sync_session), name)(*args, **kwargs))
+
+
+class AsyncUserRepository(AsyncAdapter):
+    sync_class = UserRepository
+
+
+class AsyncCustomerRepository(AsyncAdapter):
+    sync_class = CustomerRepository
+
+
+class AsyncContractRepository(AsyncAdapter):
+    sync_class = ContractRepository
+
+
+class AsyncEventRepository(AsyncAdapter):
+    sync_class = EventRepository
@@ -0,0 +1,18 @@
+from typing import Iterable, Iterator
+
+
+# nombre maximal de valeurs par clause IN : reste sous les limites de paramètres
+# des drivers (SQLite : 999 avant 3.32) et garde des requêtes de taille raisonnable
+IN_CHUNK_SIZE = 900
+
+
+def in_chunks(ids: Iterable[int], size: int | None = None) -> Iterator[list[int]]:
+    """
+    Découpe `ids` (dédoublonnés, ordre conservé) en lots d'au plus `size` valeurs
+    (`IN_CHUNK_SIZE` par défaut), à utiliser chacun dans une clause `IN`.
+    Ne produit rien si `ids` est vide.
+    """
+    size = size or IN_CHUNK_SIZE
+    unique = list(dict.fromkeys(ids))
+    for start in range(0, len(unique), size):
+        yield unique[start:start + size]
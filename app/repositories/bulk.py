@@ -0,0 +1,69 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.util import identity_key
+
+
+# nombre de lignes par INSERT/UPDATE multi-lignes
+DEFAULT_BULK_CHUNK_SIZE = 500
+
+
+@dataclass
+class BulkResult:
+    """
+    Résultat d'une écriture en masse :
+    - `affected` : nombre de lignes insérées ou mises à jour ;
+    - `failures` : (position dans la liste reçue, exception) des lignes refusées par la base.
+    """
+    affected: int = 0
+    failures: list = field(default_factory=list)
+
+
+def _chunks(rows: list, chunk_size: int | None):
+    size = chunk_size or DEFAULT_BULK_CHUNK_SIZE
+    for start in range(0, len(rows), size):
+        yield start, rows[start:start + size]
+
+
+def _write(session, statement, rows: list[dict], chunk_size: int | None) -> BulkResult:
+    """
+    Exécute `statement` par lots (un aller-retour par lot, dans un SAVEPOINT).
+    Si la base refuse un lot, il est rejoué ligne à ligne pour isoler les lignes
+    fautives : les autres lignes du lot sont conservées.
+    """
+    result = BulkResult()
+    for start, chunk in _chunks(rows, chunk_size):
+        try:
+            with session.begin_nested():
+                session.execute(statement, chunk)
+            result.affected += len(chunk)
+            continue
+        except IntegrityError:
+            pass
+        for offset, row in enumerate(chunk):
+            try:
+                with session.begin_nested():
+                    session.execute(statement, [row])
+                result.affected += 1
+            except IntegrityError as exc:
+                result.failures.append((start + offset, exc))
+    return result
+
+
+def bulk_insert(session, model, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+    """INSERT multi-lignes de `rows` (dictionnaires de colonnes) dans la table de `model`."""
+    return _write(session, insert(model), rows, chunk_size)
+
+
+def bulk_update(session, model, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+    """
+    UPDATE par clé primaire : chaque dictionnaire contient `id` et les colonnes à modifier.
+    Les instances déjà chargées dans la session sont expirées (relues au prochain accès).
+    """
+    result = _write(session, update(model), rows, chunk_size)
+    for row in rows:
+        instance = session.identity_map.get(identity_key(model, row["id"]))
+        if instance is not None:
+            session.expire(instance)
+    return result
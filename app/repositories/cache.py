@@ -0,0 +1,299 @@
+import fnmatch
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.config import ENTITY_CACHE_BACKEND, ENTITY_CACHE_MAX_SIZE, ENTITY_CACHE_TTL
+
+
+BACKENDS = ("memory", "none")
+
+# valeur absente du cache (None est une valeur comme une autre pour les backends)
+MISSING = object()
+
+# clés à invalider de nouveau en fin de transaction, par session
+_PENDING_KEY = "entity_cache_pending"
+
+
+class MemoryBackend:
+    """
+    Backend dans le processus : dictionnaire ordonné borné à `max_size` entrées.
+    Une entrée expire après son TTL ; au-delà de `max_size`, l'entrée la moins
+    récemment lue est évincée (LRU).
+    """
+
+    def __init__(self, max_size: int = ENTITY_CACHE_MAX_SIZE, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_size = max_size
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NullBackend:
+    """Backend désactivé (`ENTITY_CACHE_BACKEND=none`) : chaque lecture est un échec."""
+
+    def get(self, key: str):
+        return MISSING
+
+    def set(self, key: str, value, ttl: float) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self, prefix: str = "") -> None:
+        pass
+
+
+class SharedBackend:
+    """
+    Backend partagé entre processus, adossé à un client de type Redis
+    (`get`, `set(name, value, ex=ttl)`, `delete(*names)`, `scan_iter(match=...)`).
+    Le TTL est délégué au serveur (qui applique aussi sa propre politique
+    d'éviction) ; les valeurs sont sérialisées avec pickle.
+
+    Usage : `configure_cache(SharedBackend(redis.Redis(...)))` au démarrage.
+    """
+
+    def __init__(self, client, prefix: str = "epic_events:cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return MISSING
+        return pickle.loads(raw)
+
+    def set(self, key: str, value, ttl: float) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self, prefix: str = "") -> None:
+        names = list(self.client.scan_iter(match=f"{self.prefix}{prefix}*"))
+        if names:
+            self.client.delete(*names)
+
+
+class LocalSharedClient:
+    """
+    Remplaçant local d'un client Redis, limité aux commandes utilisées par
+    `SharedBackend` (tests, développement sans serveur).
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[name] = (value, self._clock() + ex if ex is not None else None)
+        return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*") -> Iterable[str]:
+        with self._lock:
+            names = [name for name in self._data if fnmatch.fnmatchcase(name, match)]
+        yield from names
+
+
+class CacheStats:
+    """Compteurs cumulés des lectures d'un cache (succès / échecs)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def build_backend(name: Optional[str] = None):
+    """Backend correspondant à `ENTITY_CACHE_BACKEND` (ou `name`), après validation."""
+    name = (name or ENTITY_CACHE_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"ENTITY_CACHE_BACKEND inconnu : {name} (attendu : {', '.join(BACKENDS)})")
+    return MemoryBackend() if name == "memory" else NullBackend()
+
+
+_state = {"backend": None}
+_CACHES = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def current_backend():
+    if _state["backend"] is None:
+        with _REGISTRY_LOCK:
+            if _state["backend"] is None:
+                _state["backend"] = build_backend()
+    return _state["backend"]
+
+
+def configure_cache(backend):
+    """
+    Remplace le backend de tous les caches d'entités (ex. `SharedBackend`)
+    et retourne le précédent. Les compteurs sont conservés.
+    """
+    with _REGISTRY_LOCK:
+        previous, _state["backend"] = _state["backend"], backend
+    return previous
+
+
+def database_key(session) -> Optional[str]:
+    """
+    Identifiant de la base de `session`, préfixe des clés du cache.
+    None (pas de cache) pour une session sans engine ou une base SQLite
+    en mémoire privée, dont le contenu n'est visible que de son engine.
+    """
+    try:
+        url = session.get_bind().url
+    except Exception:
+        return None
+    if not url.database or url.database == ":memory:":
+        return None
+    return url.render_as_string(hide_password=True)
+
+
+class ReadThroughCache:
+    """
+    Cache de lecture d'un espace de noms (ex. `users`), devant les repositories.
+
+    `get_or_load(session, key, loader)` retourne la valeur en cache ou appelle
+    `loader()` et conserve son résultat pendant `ttl` secondes (un résultat None
+    n'est pas conservé). Les repositories invalident leurs clés à chaque
+    écriture (`invalidate`) : immédiatement, puis de nouveau au commit ou au
+    rollback de la transaction, pour écarter une valeur relue entre-temps.
+    Les valeurs doivent être de simples valeurs immuables, jamais des entités ORM
+    (liées à une session).
+    """
+
+    def __init__(self, namespace: str, ttl: float = ENTITY_CACHE_TTL) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def _key(self, scope: str, key) -> str:
+        return f"{self.namespace}:{scope}:{key}"
+
+    def get(self, session, key):
+        scope = database_key(session)
+        if scope is None:
+            return MISSING
+        value = current_backend().get(self._key(scope, key))
+        self.stats.record(value is not MISSING)
+        return value
+
+    def set(self, session, key, value) -> None:
+        scope = database_key(session)
+        if scope is not None and value is not None:
+            current_backend().set(self._key(scope, key), value, self.ttl)
+
+    def get_or_load(self, session, key, loader: Callable[[], object]):
+        value = self.get(session, key)
+        if value is MISSING:
+            value = loader()
+            self.set(session, key, value)
+        return value
+
+    def invalidate(self, session, *keys) -> None:
+        scope = database_key(session)
+        if scope is None or not keys:
+            return
+        names = [self._key(scope, key) for key in keys]
+        current_backend().delete(*names)
+        session.info.setdefault(_PENDING_KEY, set()).update(names)
+
+    def clear(self) -> None:
+        current_backend().clear(f"{self.namespace}:")
+
+
+def get_cache(namespace: str) -> ReadThroughCache:
+    """Cache (unique par processus) de l'espace de noms `namespace`."""
+    cache = _CACHES.get(namespace)
+    if cache is None:
+        with _REGISTRY_LOCK:
+            cache = _CACHES.setdefault(namespace, ReadThroughCache(namespace))
+    return cache
+
+
+def cache_statistics() -> dict:
+    """Succès, échecs et taux de succès de chaque cache d'entités."""
+    return {
+        namespace: {"hits": cache.stats.hits, "misses": cache.stats.misses, "hit_rate": cache.stats.hit_rate}
+        for namespace, cache in _CACHES.items()
+    }
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_pending(session) -> None:
+    names = session.info.pop(_PENDING_KEY, None)
+    if names:
+        current_backend().delete(*names)
@@ -1,18 +1,66 @@
+from decimal import Decimal
+from typing import Iterator
+
 from sqlalchemy.orm import Session
 from app.models.contract import Contract
+from app.models.customer import Customer
+from app.repositories.batching import in_chunks
+from app.repositories.bulk import BulkResult, bulk_insert, bulk_update
+from app.repositories.loading import LoadSpec, load_options
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.repositories.projection import ColumnSpec, project
+from app.repositories.streaming import select_columns, stream_rows
+from sentry import traced_methods
 
 
+@traced_methods("db.repository")
 class ContractRepository:
     """
     Repository pour l'entité Contract — fournis des opérations de lecture/écriture via une session SQLAlchemy.
     Responsabilités
     - Encapsuler l'accès à la base de données pour l'entité Contract.
     - Fournir des opérations CRUD courantes sans gérer la transaction (flush effectué, commit/rollback laissé à l'appelant).
+    - Les méthodes de lecture acceptent `load` (une `LoadSpec`, cf. `app.repositories.loading`)
+      pour précharger les relations affichées et éviter les requêtes N+1.
+    - Les méthodes de liste acceptent aussi `columns` (une `ColumnSpec`, cf. `app.repositories.projection`) :
+      elles retournent alors des lignes nommées limitées à ces colonnes, sans entité ORM.
+    - `bulk_create` / `bulk_update` écrivent des dictionnaires de colonnes par INSERT/UPDATE
+      multi-lignes (lots de `chunk_size`) ; les lignes refusées par la base sont listées dans le `BulkResult`.
+    - `stream_columns` lit des colonnes en flux (curseur côté serveur) pour les exports.
+    - Les méthodes de liste acceptent des critères (`signed`, `unpaid`, `min_balance`,
+      `max_balance`) traduits en clauses WHERE : seul le résultat filtré quitte la base.
 
     """
     def __init__(self, session: Session) -> None:
         self.session = session
 
+    def _query(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None):
+        if columns:
+            return project(self.session, Contract, columns)
+        query = self.session.query(Contract)
+        if load:
+            query = query.options(*load_options(Contract, load))
+        return query
+
+    def _filter(
+        self,
+        query,
+        signed: bool | None = None,
+        unpaid: bool | None = None,
+        min_balance: Decimal | None = None,
+        max_balance: Decimal | None = None,
+    ):
+        # critère à None = pas de filtre ; les bornes du solde sont incluses
+        if signed is not None:
+            query = query.filter(Contract.signed.is_(signed))
+        if unpaid is not None:
+            query = query.filter(Contract.balance_due > 0 if unpaid else Contract.balance_due == 0)
+        if min_balance is not None:
+            query = query.filter(Contract.balance_due >= min_balance)
+        if max_balance is not None:
+            query = query.filter(Contract.balance_due <= max_balance)
+        return query
+
     def create(self, **fields) -> Contract:
         c = Contract(**fields)
         self.session.add(c)
@@ -25,20 +73,50 @@ class ContractRepository:
         self.session.flush()
         return contract
 
+    def bulk_create(self, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+        return bulk_insert(self.session, Contract, rows, chunk_size)
+
+    def bulk_update(self, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+        # chaque ligne contient `id` et les colonnes à modifier
+        return bulk_update(self.session, Contract, rows, chunk_size)
+
     def delete(self, contract: Contract) -> None:
         self.session.delete(contract)
         self.session.flush()
         
-    def get_by_id(self, contract_id: int) -> Contract | None:
-        return self.session.query(Contract).filter(Contract.id == contract_id).one_or_none()
+    def get_by_id(self, contract_id: int, load: LoadSpec | None = None) -> Contract | None:
+        return self._query(load).filter(Contract.id == contract_id).one_or_none()
+
+    def list_by_ids(self, ids: list[int], load: LoadSpec | None = None) -> list[Contract]:
+        # une requête IN par lot d'identifiants (cf. `in_chunks`)
+        items = []
+        for chunk in in_chunks(ids):
+            items.extend(self._query(load).filter(Contract.id.in_(chunk)).all())
+        return items
+
+    def list_all(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Contract]:
+        return self._filter(self._query(load, columns), **criteria).all()
 
-    def list_all(self) -> list[Contract]:
-        return self.session.query(Contract).all()
+    def list_page(self, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE, load: LoadSpec | None = None, columns: ColumnSpec | None = None) -> Page[Contract]:
+        return paginate(self._query(load, columns), Contract.id, after_id, limit)
 
-    def list_by_management_user(self, user_id: int) -> list[Contract]:
-        return self.session.query(Contract).filter(Contract.user_management_id == user_id).all()
+    def list_by_management_user(self, user_id: int, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Contract]:
+        query = self._query(load, columns).filter(Contract.user_management_id == user_id)
+        return self._filter(query, **criteria).all()
 
-    def list_by_customer_ids(self, customer_ids: list[int]) -> list[Contract]:
-        return self.session.query(Contract).filter(Contract.customer_id.in_(customer_ids)).all()
+    def list_by_customer_ids(self, customer_ids: list[int], load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Contract]:
+        # une requête IN par lot d'identifiants (cf. `in_chunks`)
+        contracts = []
+        for chunk in in_chunks(customer_ids):
+            query = self._query(load, columns).filter(Contract.customer_id.in_(chunk))
+            contracts.extend(self._filter(query, **criteria).all())
+        return contracts
 
-    
+    def stream_columns(
+        self, columns: list[str] | None = None, user_sales_id: int | None = None, batch_size: int | None = None, **criteria
+    ) -> Iterator:
+        # lecture en flux des seules colonnes demandées (tuples, pas d'objets ORM), restreinte aux clients d'un commercial
+        query = self.session.query(*select_columns(Contract, columns))
+        if user_sales_id is not None:
+            query = query.join(Customer, Contract.customer_id == Customer.id).filter(Customer.user_sales_id == user_sales_id)
+        return stream_rows(self._filter(query, **criteria).order_by(Contract.id), batch_size)
@@ -1,19 +1,49 @@
+from typing import Iterator
+
 from sqlalchemy.orm import Session
 from app.models.customer import Customer
+from app.repositories.batching import in_chunks
+from app.repositories.bulk import BulkResult, bulk_insert, bulk_update
+from app.repositories.loading import LoadSpec, load_options
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.repositories.projection import ColumnSpec, project
+from app.repositories.streaming import select_columns, stream_rows
+from sentry import traced_methods
 
 
+@traced_methods("db.repository")
 class CustomerRepository:
     """
     Repository pour l'entité Customer — fournis des opérations de lecture/écriture via une session SQLAlchemy.
     Responsabilités
     - Encapsuler l'accès à la base de données pour l'entité Customer.
     - Fournir des opérations CRUD courantes sans gérer la transaction (flush effectué, commit/rollback laissé à l'appelant).
+    - Les méthodes de lecture acceptent `load` (une `LoadSpec`, cf. `app.repositories.loading`)
+      pour précharger les relations affichées et éviter les requêtes N+1.
+    - Les méthodes de liste acceptent aussi `columns` (une `ColumnSpec`, cf. `app.repositories.projection`) :
+      elles retournent alors des lignes nommées limitées à ces colonnes, sans entité ORM.
+    - `bulk_create` / `bulk_update` écrivent des dictionnaires de colonnes par INSERT/UPDATE
+      multi-lignes (lots de `chunk_size`) ; les lignes refusées par la base sont listées dans le `BulkResult`.
+    - `stream_columns` lit des colonnes en flux (curseur côté serveur) pour les exports.
 
     """
     
     def __init__(self, session: Session) -> None:
         self.session = session
 
+    def _query(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None):
+        if columns:
+            return project(self.session, Customer, columns)
+        query = self.session.query(Customer)
+        if load:
+            query = query.options(*load_options(Customer, load))
+        return query
+
+    def _filter(self, query):
+        # aucun critère propre aux clients : même signature que les autres repositories,
+        # un critère inconnu lève TypeError
+        return query
+
     def create(self, **fields) -> Customer:
         c = Customer(**fields)
         self.session.add(c)
@@ -26,16 +56,40 @@ class CustomerRepository:
         self.session.flush()
         return customer
 
+    def bulk_create(self, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+        return bulk_insert(self.session, Customer, rows, chunk_size)
+
+    def bulk_update(self, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+        # chaque ligne contient `id` et les colonnes à modifier
+        return bulk_update(self.session, Customer, rows, chunk_size)
+
     def delete(self, customer: Customer) -> None:
         self.session.delete(customer)
         self.session.flush()
-    def get_by_id(self, customer_id: int) -> Customer | None:
-        return self.session.query(Customer).filter(Customer.id == customer_id).one_or_none()
+    def get_by_id(self, customer_id: int, load: LoadSpec | None = None) -> Customer | None:
+        return self._query(load).filter(Customer.id == customer_id).one_or_none()
 
-    def list_all(self) -> list[Customer]:
-        return self.session.query(Customer).all()
+    def list_by_ids(self, ids: list[int], load: LoadSpec | None = None) -> list[Customer]:
+        # une requête IN par lot d'identifiants (cf. `in_chunks`)
+        items = []
+        for chunk in in_chunks(ids):
+            items.extend(self._query(load).filter(Customer.id.in_(chunk)).all())
+        return items
 
-    def list_by_sales_user(self, user_id: int) -> list[Customer]:
-        return self.session.query(Customer).filter(Customer.user_sales_id == user_id).all()
+    def list_all(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None) -> list[Customer]:
+        return self._query(load, columns).all()
 
-    
+    def list_page(self, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE, load: LoadSpec | None = None, columns: ColumnSpec | None = None) -> Page[Customer]:
+        return paginate(self._query(load, columns), Customer.id, after_id, limit)
+
+    def list_by_sales_user(self, user_id: int, load: LoadSpec | None = None, columns: ColumnSpec | None = None) -> list[Customer]:
+        return self._query(load, columns).filter(Customer.user_sales_id == user_id).all()
+
+    def stream_columns(
+        self, columns: list[str] | None = None, user_sales_id: int | None = None, batch_size: int | None = None, **criteria
+    ) -> Iterator:
+        # lecture en flux des seules colonnes demandées (tuples, pas d'objets ORM), restreinte aux clients d'un commercial
+        query = self.session.query(*select_columns(Customer, columns))
+        if user_sales_id is not None:
+            query = query.filter(Customer.user_sales_id == user_sales_id)
+        return stream_rows(self._filter(query, **criteria).order_by(Customer.id), batch_size)
@@ -1,18 +1,63 @@
+from datetime import datetime
+from typing import Iterator
+
 from sqlalchemy.orm import Session
+from app.models.customer import Customer
 from app.models.event import Event
+from app.repositories.batching import in_chunks
+from app.repositories.bulk import BulkResult, bulk_insert, bulk_update
+from app.repositories.loading import LoadSpec, load_options
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.repositories.projection import ColumnSpec, project
+from app.repositories.streaming import select_columns, stream_rows
+from sentry import traced_methods
 
 
+@traced_methods("db.repository")
 class EventRepository:
     """
     Repository pour l'entité Event — fournis des opérations de lecture/écriture via une session SQLAlchemy.
     Responsabilités
     - Encapsuler l'accès à la base de données pour l'entité Event.
     - Fournir des opérations CRUD courantes sans gérer la transaction (flush effectué, commit/rollback laissé à l'appelant).
+    - Les méthodes de lecture acceptent `load` (une `LoadSpec`, cf. `app.repositories.loading`)
+      pour précharger les relations affichées et éviter les requêtes N+1.
+    - Les méthodes de liste acceptent aussi `columns` (une `ColumnSpec`, cf. `app.repositories.projection`) :
+      elles retournent alors des lignes nommées limitées à ces colonnes, sans entité ORM.
+    - `bulk_create` / `bulk_update` écrivent des dictionnaires de colonnes par INSERT/UPDATE
+      multi-lignes (lots de `chunk_size`) ; les lignes refusées par la base sont listées dans le `BulkResult`.
+    - `stream_columns` lit des colonnes en flux (curseur côté serveur) pour les exports.
+    - Les méthodes de liste acceptent des critères (`unassigned`, `start_after`,
+      `start_before`) traduits en clauses WHERE : seul le résultat filtré quitte la base.
 
     """
     def __init__(self, session: Session) -> None:
         self.session = session
 
+    def _query(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None):
+        if columns:
+            return project(self.session, Event, columns)
+        query = self.session.query(Event)
+        if load:
+            query = query.options(*load_options(Event, load))
+        return query
+
+    def _filter(
+        self,
+        query,
+        unassigned: bool | None = None,
+        start_after: datetime | None = None,
+        start_before: datetime | None = None,
+    ):
+        # critère à None = pas de filtre ; fenêtre de dates [start_after, start_before[
+        if unassigned is not None:
+            query = query.filter(Event.user_support_id.is_(None) if unassigned else Event.user_support_id.is_not(None))
+        if start_after is not None:
+            query = query.filter(Event.start_datetime >= start_after)
+        if start_before is not None:
+            query = query.filter(Event.start_datetime < start_before)
+        return query
+
     def create(self, **fields) -> Event:
         e = Event(**fields)
         self.session.add(e)
@@ -25,20 +70,66 @@ class EventRepository:
         self.session.flush()
         return event
 
+    def bulk_create(self, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+        return bulk_insert(self.session, Event, rows, chunk_size)
+
+    def bulk_update(self, rows: list[dict], chunk_size: int | None = None) -> BulkResult:
+        # chaque ligne contient `id` et les colonnes à modifier
+        return bulk_update(self.session, Event, rows, chunk_size)
+
     def delete(self, event: Event) -> None:
         self.session.delete(event)
         self.session.flush()
 
-    def get_by_id(self, event_id: int) -> Event | None:
-        return self.session.query(Event).filter(Event.id == event_id).one_or_none()
+    def get_by_id(self, event_id: int, load: LoadSpec | None = None) -> Event | None:
+        return self._query(load).filter(Event.id == event_id).one_or_none()
+
+    def list_by_ids(self, ids: list[int], load: LoadSpec | None = None) -> list[Event]:
+        # une requête IN par lot d'identifiants (cf. `in_chunks`)
+        items = []
+        for chunk in in_chunks(ids):
+            items.extend(self._query(load).filter(Event.id.in_(chunk)).all())
+        return items
+
+    def list_all(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Event]:
+        return self._filter(self._query(load, columns), **criteria).all()
+
+    def list_page(self, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE, load: LoadSpec | None = None, columns: ColumnSpec | None = None) -> Page[Event]:
+        return paginate(self._query(load, columns), Event.id, after_id, limit)
+
+    def list_by_support_user(self, user_id: int, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Event]:
+        query = self._query(load, columns).filter(Event.user_support_id == user_id)
+        return self._filter(query, **criteria).all()
+
+    def list_by_customer(self, customer_id: int, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Event]:
+        query = self._query(load, columns).filter(Event.customer_id == customer_id)
+        return self._filter(query, **criteria).all()
 
-    def list_all(self) -> list[Event]:
-        return self.session.query(Event).all()
+    def list_by_customer_ids(self, customer_ids: list[int], load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Event]:
+        # une requête IN par lot d'identifiants (cf. `in_chunks`)
+        events = []
+        for chunk in in_chunks(customer_ids):
+            query = self._query(load, columns).filter(Event.customer_id.in_(chunk))
+            events.extend(self._filter(query, **criteria).all())
+        return events
 
-    def list_by_support_user(self, user_id: int) -> list[Event]:
-        return self.session.query(Event).filter(Event.user_support_id == user_id).all()
+    def list_by_sales_user(self, user_id: int, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Event]:
+        # une seule requête : jointure sur les clients du commercial
+        query = (
+            self._query(load, columns)
+            .join(Customer, Event.customer_id == Customer.id)
+            .filter(Customer.user_sales_id == user_id)
+        )
+        return self._filter(query, **criteria).all()
 
-    def list_by_customer(self, customer_id: int) -> list[Event]:
-        return self.session.query(Event).filter(Event.customer_id == customer_id).all()
+    def list_without_support(self, load: LoadSpec | None = None, columns: ColumnSpec | None = None, **criteria) -> list[Event]:
+        return self.list_all(load, columns, unassigned=True, **criteria)
 
-    
+    def stream_columns(
+        self, columns: list[str] | None = None, user_sales_id: int | None = None, batch_size: int | None = None, **criteria
+    ) -> Iterator:
+        # lecture en flux des seules colonnes demandées (tuples, pas d'objets ORM), restreinte aux clients d'un commercial
+        query = self.session.query(*select_columns(Event, columns))
+        if user_sales_id is not None:
+            query = query.join(Customer, Event.customer_id == Customer.id).filter(Customer.user_sales_id == user_sales_id)
+        return stream_rows(self._filter(query, **criteria).order_by(Event.id), batch_size)
@@ -0,0 +1,46 @@
+from typing import Mapping, Optional
+
+from sqlalchemy.orm import defaultload, joinedload, lazyload, raiseload, selectinload, subqueryload
+
+
+# stratégies de chargement disponibles, désignées par leur nom dans une LoadSpec
+STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+    "subquery": subqueryload,
+    "lazy": lazyload,
+    "raise": raiseload,
+}
+
+# Description déclarative des relations à charger, par ex. :
+#   {"customer": "joined", "role.permissions": "selectin"}
+# Une clé pointée décrit un chemin de relations ; seule la dernière relation
+# reçoit la stratégie indiquée, les relations intermédiaires gardent la leur
+# (à déclarer explicitement si elles doivent aussi être chargées).
+LoadSpec = Mapping[str, str]
+
+
+def load_options(model, spec: Optional[LoadSpec]) -> list:
+    """
+    Traduit une `LoadSpec` en options SQLAlchemy (`selectinload`, `joinedload`, ...)
+    utilisables avec `query.options(...)` ou `session.get(..., options=...)`.
+    """
+    if not spec:
+        return []
+    options = []
+    for path, strategy in spec.items():
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Stratégie de chargement inconnue : {strategy}")
+        current = model
+        loader = None
+        parts = path.split(".")
+        for index, name in enumerate(parts):
+            attr = getattr(current, name)
+            last = index == len(parts) - 1
+            if loader is None:
+                loader = STRATEGIES[strategy](attr) if last else defaultload(attr)
+            else:
+                loader = getattr(loader, STRATEGIES[strategy].__name__)(attr) if last else loader.defaultload(attr)
+            current = attr.property.mapper.class_
+        options.append(loader)
+    return options
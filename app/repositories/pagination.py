@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from typing import Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    Page de résultats issue d'une pagination par curseur (keyset sur `id`).
+
+    - `items` : les éléments de la page, triés par `id` croissant.
+    - `next_cursor` : `id` à passer en `after_id` pour obtenir la page suivante,
+        `None` s'il n'y a plus de résultats.
+    """
+    items: list[T] = field(default_factory=list)
+    next_cursor: Optional[int] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Ramène la taille de page demandée dans l'intervalle [1, MAX_PAGE_SIZE]."""
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def paginate(query, id_column, after_id: Optional[int] = None, limit: Optional[int] = DEFAULT_PAGE_SIZE) -> Page:
+    """
+    Applique une pagination keyset à une requête `session.query(...)`.
+
+    Plutôt qu'un OFFSET (qui relit toutes les lignes précédentes), on filtre
+    sur `id > after_id` et on lit `limit + 1` lignes via l'index primaire :
+    la ligne supplémentaire indique seulement s'il existe une page suivante.
+    """
+    limit = clamp_limit(limit)
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+    return Page(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,33 @@
+from typing import Sequence
+
+
+# Colonnes à lire, désignées par leur nom, par ex. :
+#   ("id", "event_name") ou ("id", "customer.company_name")
+# Un nom pointé suit une relation (jointure interne) ; la colonne est alors
+# exposée sous le nom `relation_colonne` (ici `customer_company_name`).
+ColumnSpec = Sequence[str]
+
+
+def project(session, model, spec: ColumnSpec):
+    """
+    Requête `session.query(...)` sur les seules colonnes de `spec`.
+    Le résultat est une liste de lignes nommées (`Row`, accès par attribut comme
+    un namedtuple) : aucune entité n'est construite ni suivie par l'identity map,
+    ce qui suffit aux menus de liste et coûte bien moins cher à hydrater.
+    """
+    columns = []
+    joins = []
+    for name in spec:
+        *path, column = name.split(".")
+        current = model
+        for relation in path:
+            attr = getattr(current, relation)
+            if attr not in joins:
+                joins.append(attr)
+            current = attr.property.mapper.class_
+        expression = getattr(current, column)
+        columns.append(expression.label("_".join(path + [column])) if path else expression)
+    query = session.query(*columns).select_from(model)
+    for attr in joins:
+        query = query.join(attr)
+    return query
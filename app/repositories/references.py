@@ -0,0 +1,48 @@
+from typing import Sequence
+
+from sqlalchemy import exists, func, or_, select
+
+
+# Références vers une ligne, sous la forme (libellé, colonne de clé étrangère), par ex. :
+#   (("contrat(s)", Contract.customer_id), ("évènement(s)", Event.customer_id))
+References = Sequence[tuple[str, object]]
+
+
+def has_references(session, references: References, value) -> bool:
+    """
+    Indique en une requête si au moins une ligne référence `value` :
+    `SELECT EXISTS(...) OR EXISTS(...)`, chaque EXISTS s'arrêtant à la première
+    ligne trouvée (via l'index de la clé étrangère).
+    """
+    if not references:
+        return False
+    condition = or_(*[exists().where(column == value) for _, column in references])
+    return bool(session.execute(select(condition)).scalar())
+
+
+def count_references(session, references: References, value) -> dict[str, int]:
+    """
+    Nombre de lignes référençant `value`, par libellé, en une seule instruction :
+    une sous-requête scalaire `COUNT(*)` par référence dans le même SELECT.
+    """
+    if not references:
+        return {}
+    counts = [
+        select(func.count()).select_from(column.class_).where(column == value).scalar_subquery().label(f"ref_{index}")
+        for index, (_, column) in enumerate(references)
+    ]
+    row = session.execute(select(*counts)).one()
+    return {label: count for (label, _), count in zip(references, row)}
+
+
+def ensure_unreferenced(session, references: References, value, message: str) -> None:
+    """
+    Lève ValueError (« <message> 2 contrat(s), 1 évènement(s). ») si `value` est encore référencée.
+    Cas courant (rien ne la référence) : une seule requête EXISTS ; le détail
+    des comptes n'est lu qu'en cas de refus, pour le message.
+    """
+    if not has_references(session, references, value):
+        return
+    counts = count_references(session, references, value)
+    parts = [f"{count} {label}" for label, count in counts.items() if count]
+    raise ValueError(f"{message} {', '.join(parts)}.")
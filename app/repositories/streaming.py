@@ -0,0 +1,33 @@
+from typing import Iterator
+
+
+# lignes récupérées par aller-retour lors d'une lecture en flux
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+
+def column_names(model) -> list[str]:
+    """Colonnes de la table du modèle : clé primaire d'abord, puis ordre de déclaration."""
+    table = model.__table__
+    return [column.key for column in table.primary_key.columns] + [
+        column.key for column in table.columns if not column.primary_key
+    ]
+
+
+def select_columns(model, names: list[str] | None = None) -> list:
+    """Attributs de colonnes à sélectionner (toutes par défaut) ; ValueError si un nom est inconnu."""
+    known = column_names(model)
+    if not names:
+        names = known
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"Colonne(s) inconnue(s) : {', '.join(unknown)} (disponibles : {', '.join(known)})")
+    return [getattr(model, name) for name in names]
+
+
+def stream_rows(query, batch_size: int | None = None) -> Iterator:
+    """
+    Parcourt le résultat de `query` (requête sur des colonnes) par lots de `batch_size` lignes
+    avec un curseur côté serveur (`yield_per` active `stream_results`) : la mémoire
+    reste constante quelle que soit la taille de la table.
+    """
+    yield from query.yield_per(batch_size or DEFAULT_STREAM_BATCH_SIZE)
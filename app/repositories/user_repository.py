@@ -1,42 +1,116 @@
+from itertools import chain
+from typing import NamedTuple, Optional
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from app.models.role import Role
 from app.models.user import User
+from app.repositories.cache import MISSING, get_cache
+from app.repositories.loading import LoadSpec, load_options
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from sentry import traced_methods
 
 
+# résumés d'utilisateurs ("id:<id>") et identifiants par nom d'utilisateur ("username:<nom>")
+USER_CACHE = get_cache("users")
+
+
+class UserSummary(NamedTuple):
+    """Données d'un utilisateur conservées en cache (jamais l'entité elle-même)."""
+    id: int
+    username: str
+    role_id: Optional[int]
+    role_name: Optional[str]
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_role_changes(session, flush_context) -> None:
+    # un rôle renommé ou supprimé rend obsolètes les `role_name` en cache
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Role):
+            USER_CACHE.clear()
+            return
+
+
+@traced_methods("db.repository")
 class UserRepository:
     """
     Repository pour l'entité User — fournis des opérations de lecture/écriture via une session SQLAlchemy.
     Responsabilités
     - Encapsuler l'accès à la base de données pour l'entité User.
     - Fournir des opérations CRUD courantes sans gérer la transaction (flush effectué, commit/rollback laissé à l'appelant).
+    - Les méthodes de lecture acceptent `load` (une `LoadSpec`, cf. `app.repositories.loading`)
+      pour précharger les relations affichées et éviter les requêtes N+1.
+    - `get_summary` et `get_by_username` passent par le cache de lecture `users`
+      (`app.repositories.cache`), invalidé par `create`, `update` et `delete`.
 
     """
     def __init__(self, session: Session) -> None:
         self.session = session
 
+    def _query(self, load: LoadSpec | None = None):
+        query = self.session.query(User)
+        if load:
+            query = query.options(*load_options(User, load))
+        return query
+
     def create(self, **fields) -> User:
         u = User(**fields)
         self.session.add(u)
         self.session.flush()
+        self._invalidate(u)
         return u
 
     def update(self, user: User, **fields) -> User:
+        # l'ancien nom d'utilisateur est aussi une clé du cache
+        self._invalidate(user)
         for k, v in fields.items():
             if hasattr(user, k):
                 setattr(user, k, v)
         self.session.flush()
+        self._invalidate(user)
         return user
 
     def delete(self, user: User) -> None:
+        self._invalidate(user)
         self.session.delete(user)
         self.session.flush()
 
-    def get_by_username(self, username: str) -> User | None:
-        return self.session.query(User).filter(User.username == username).one_or_none()
+    def _invalidate(self, user: User) -> None:
+        USER_CACHE.invalidate(self.session, f"id:{getattr(user, 'id', None)}", f"username:{getattr(user, 'username', None)}")
+
+    def get_by_username(self, username: str, load: LoadSpec | None = None) -> User | None:
+        # l'identifiant en cache permet un accès par clé primaire (identity map d'abord)
+        key = f"username:{username}"
+        user_id = USER_CACHE.get(self.session, key)
+        if user_id is not MISSING:
+            user = self.session.get(User, user_id, options=load_options(User, load))
+            if user is not None and user.username == username:
+                return user
+            USER_CACHE.invalidate(self.session, key)
+        user = self._query(load).filter(User.username == username).one_or_none()
+        if user is not None:
+            USER_CACHE.set(self.session, key, getattr(user, "id", None))
+        return user
+
+    def get_summary(self, user_id: int) -> UserSummary | None:
+        """Identifiant, nom d'utilisateur et rôle, lus en cache (une requête en cas d'échec)."""
+        return USER_CACHE.get_or_load(self.session, f"id:{user_id}", lambda: self._load_summary(user_id))
+
+    def _load_summary(self, user_id: int) -> UserSummary | None:
+        user = self.get_by_id(user_id, load={"role": "joined"})
+        if user is None:
+            return None
+        role = getattr(user, "role", None)
+        return UserSummary(user.id, getattr(user, "username", None), getattr(user, "role_id", None),
+                           getattr(role, "name", None))
+
+    def list_all(self, load: LoadSpec | None = None) -> list[User]:
+        return self._query(load).all()
 
-    def list_all(self) -> list[User]:
-        return self.session.query(User).all()
+    def list_page(self, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE, load: LoadSpec | None = None) -> Page[User]:
+        return paginate(self._query(load), User.id, after_id, limit)
 
-    def get_by_id(self, user_id: int) -> User | None:
-        return self.session.query(User).filter(User.id == user_id).one_or_none()
+    def get_by_id(self, user_id: int, load: LoadSpec | None = None) -> User | None:
+        return self._query(load).filter(User.id == user_id).one_or_none()
 
 
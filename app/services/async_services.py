@@ -0,0 +1,45 @@
+from app.repositories.async_repositories import AsyncAdapter
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+from app.services.permission_service import PermissionService
+from app.services.user_service import UserService
+
+
+class AsyncServiceAdapter(AsyncAdapter):
+    """
+    Variante asynchrone d'un service : chaque méthode publique s'exécute dans
+    `run_sync` avec le service synchrone, dont elle partage la validation
+    Pydantic et les vérifications de permission.
+
+    Sans `permission_service`, un `PermissionService` est créé sur la session
+    synchrone sous-jacente (`AsyncSession.sync_session`) ; ses lectures ont lieu
+    pendant l'appel du service, donc dans `run_sync`.
+
+    Usage :
+        async with get_async_session() as session, async_transactional(session):
+            event = await AsyncEventService(session).create(user, **fields)
+    """
+
+    def __init__(self, session, permission_service=None) -> None:
+        super().__init__(session)
+        self.perm = permission_service or PermissionService(session.sync_session)
+
+    def _sync(self, sync_session):
+        return self.sync_class(sync_session, self.perm)
+
+
+class AsyncUserService(AsyncServiceAdapter):
+    sync_class = UserService
+
+
+class AsyncCustomerService(AsyncServiceAdapter):
+    sync_class = CustomerService
+
+
+class AsyncContractService(AsyncServiceAdapter):
+    sync_class = ContractService
+
+
+class AsyncEventService(AsyncServiceAdapter):
+    sync_class = EventService
@@ -1,9 +1,61 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Optional
 from argon2 import PasswordHasher
 import jwt
 import datetime
-from app.db.config import JWT_SECRET, JWT_ALGORITHM, JWT_EXP_SECONDS
+from app.db.config import (
+    JWT_SECRET, JWT_ALGORITHM, JWT_EXP_SECONDS, ARGON2_PROFILE,
+    AUTH_VERIFY_WORKERS, AUTH_VERIFY_MAX_PENDING, JWT_REFRESH_MARGIN, JWT_CLAIMS_CACHE_TTL,
+)
+from sentry import traced_methods
 
 
+# Profils de coût Argon2 (memory_cost en KiB).
+# - "default" : paramètres recommandés par argon2-cffi (RFC 9106, profil mémoire réduite)
+# - "seed" : minimum OWASP, pour les comptes de démonstration (réhachés à la connexion)
+# - "test" : coût minimal, réservé aux tests et fixtures
+HASH_PROFILES = {
+    "default": {"time_cost": 3, "memory_cost": 65536, "parallelism": 4},
+    "seed": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+    "test": {"time_cost": 1, "memory_cost": 8, "parallelism": 1},
+}
+
+
+def check_jwt_config() -> None:
+    """Lève RuntimeError si JWT_SECRET ou JWT_ALGORITHM manque (variables d'environnement)."""
+    missing = [name for name, value in (("JWT_SECRET", JWT_SECRET), ("JWT_ALGORITHM", JWT_ALGORITHM)) if not value]
+    if missing:
+        raise RuntimeError(f"Configuration JWT incomplète : définir {', '.join(missing)} (voir .env)")
+
+
+# pool partagé par le processus pour les vérifications de mot de passe :
+# sa taille borne le nombre de cœurs qu'une rafale de connexions peut occuper
+_verify_executor = None
+_verify_slots = threading.BoundedSemaphore(AUTH_VERIFY_MAX_PENDING)
+_executor_lock = threading.Lock()
+
+
+def _get_verify_executor() -> ThreadPoolExecutor:
+    global _verify_executor
+    if _verify_executor is None:
+        with _executor_lock:
+            if _verify_executor is None:
+                _verify_executor = ThreadPoolExecutor(max_workers=AUTH_VERIFY_WORKERS, thread_name_prefix="argon2-verify")
+    return _verify_executor
+
+
+# claims des tokens déjà vérifiés : sha256(token) -> (claims, instant d'expiration du cache)
+_CLAIMS_CACHE_MAX_SIZE = 1024
+_claims_cache = {}
+_claims_lock = threading.Lock()
+
+
+@traced_methods("service")
 class AuthService:
     """Service d'authentification.
 
@@ -13,29 +65,76 @@ class AuthService:
     Méthodes principales :
     - `hash_password(password: str) -> str` : retourne une chaîne contenant
         le mot de passe haché (utilise Argon2).
+    - `hash_passwords(passwords, max_workers=None) -> list[str]` : hache un lot
+        de mots de passe en parallèle (pool de threads : argon2-cffi relâche le GIL),
+        dans l'ordre reçu.
     - `verify_password(hashed: str, password: str) -> bool` : vérifie qu'un
         mot de passe en clair correspond au hachage ; retourne `True`/`False`.
+    - `submit_verify_password(hashed, password) -> Future[bool]` : même vérification,
+        exécutée sur le pool partagé (`AUTH_VERIFY_WORKERS` threads) ; lève
+        `RuntimeError` si plus de `AUTH_VERIFY_MAX_PENDING` vérifications sont en cours.
+    - `verify_password_async(hashed, password)` : variante `await`-able de la précédente.
+    - `needs_rehash(hashed) -> bool` : indique si le hachage a été produit avec
+        d'autres paramètres que ceux du profil courant.
     - `create_token(user_id: int) -> str` : génère et retourne un token JWT
         encodant l'`user_id` (champ `sub`) et les claims `iat`/`exp`.
     - `decode_token(token: str)` : décode et retourne le payload du token JWT.
+    - `decode_token_cached(token: str)` : idem, en réutilisant pendant
+        `JWT_CLAIMS_CACHE_TTL` secondes (sans dépasser `exp`) les claims d'un
+        token déjà vérifié, indexés par l'empreinte SHA-256 du token.
+    - `token_needs_refresh(claims) -> bool` : indique si le token expire dans
+        moins de `JWT_REFRESH_MARGIN` secondes et doit être ré-émis.
 
     Remarques :
     - Les durées et la clé du JWT sont lues depuis la configuration (`app.config`).
+    - Le coût Argon2 dépend du profil choisi (`HASH_PROFILES`, par défaut `ARGON2_PROFILE`).
     - `verify_password` capture les exceptions et renvoie `False` en cas d'erreur.
     """
 
-    def __init__(self):
-        self._ph = PasswordHasher()
+    def __init__(self, profile: Optional[str] = None):
+        profile = profile or ARGON2_PROFILE
+        if profile not in HASH_PROFILES:
+            raise ValueError(f"Profil Argon2 inconnu : {profile}")
+        self.profile = profile
+        self._ph = PasswordHasher(**HASH_PROFILES[profile])
 
     def hash_password(self, password: str) -> str:
         return self._ph.hash(password)
 
+    def hash_passwords(self, passwords: Iterable[str], max_workers: Optional[int] = None) -> list[str]:
+        passwords = list(passwords)
+        if len(passwords) <= 1:
+            return [self.hash_password(p) for p in passwords]
+        workers = min(max_workers or os.cpu_count() or 1, len(passwords))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.hash_password, passwords))
+
     def verify_password(self, hashed: str, password: str) -> bool:
         try:
             return self._ph.verify(hashed, password)
         except Exception:
             return False
 
+    def submit_verify_password(self, hashed: str, password: str) -> Future:
+        if not _verify_slots.acquire(blocking=False):
+            raise RuntimeError("Trop de connexions simultanées, réessayez dans un instant")
+        try:
+            future = _get_verify_executor().submit(self.verify_password, hashed, password)
+        except Exception:
+            _verify_slots.release()
+            raise
+        future.add_done_callback(lambda _: _verify_slots.release())
+        return future
+
+    async def verify_password_async(self, hashed: str, password: str) -> bool:
+        return await asyncio.wrap_future(self.submit_verify_password(hashed, password))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        try:
+            return self._ph.check_needs_rehash(hashed)
+        except Exception:
+            return False
+
     def create_token(self, user_id: int) -> str:
         now = datetime.datetime.now(datetime.timezone.utc)
         payload = {"sub": str(user_id), "iat": now, "exp": now + datetime.timedelta(seconds=JWT_EXP_SECONDS)}
@@ -44,3 +143,27 @@ class AuthService:
 
     def decode_token(self, token: str) -> dict:
         return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+
+    def decode_token_cached(self, token: str) -> dict:
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with _claims_lock:
+            cached = _claims_cache.get(digest)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        claims = self.decode_token(token)
+        expires_at = now + JWT_CLAIMS_CACHE_TTL
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        with _claims_lock:
+            if len(_claims_cache) >= _CLAIMS_CACHE_MAX_SIZE:
+                # éviction de l'entrée la plus ancienne (ordre d'insertion)
+                _claims_cache.pop(next(iter(_claims_cache)))
+            _claims_cache[digest] = (claims, expires_at)
+        return claims
+
+    def token_needs_refresh(self, claims: dict) -> bool:
+        exp = claims.get("exp")
+        if exp is None:
+            return True
+        return float(exp) - time.time() < JWT_REFRESH_MARGIN
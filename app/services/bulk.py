@@ -0,0 +1,107 @@
+import bisect
+from dataclasses import dataclass, field
+from typing import Callable
+
+from pydantic import ValidationError
+
+from app.repositories.batching import in_chunks
+
+
+@dataclass
+class RowError:
+    """Ligne refusée : position dans la liste reçue et message destiné à l'utilisateur."""
+    index: int
+    message: str
+
+
+@dataclass
+class BulkReport:
+    """
+    Compte rendu d'une création / mise à jour en masse.
+    Les lignes invalides sont listées dans `errors` sans interrompre le lot ;
+    la transaction reste à valider (commit) par l'appelant.
+    """
+    total: int
+    created: int = 0
+    updated: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def fail(self, index: int, message: str) -> None:
+        # erreurs gardées dans l'ordre des lignes reçues, quelle que soit l'étape qui les détecte
+        bisect.insort(self.errors, RowError(index, message), key=lambda error: error.index)
+
+
+def as_record(row) -> dict:
+    """
+    Retourne `row` s'il s'agit d'un enregistrement (dictionnaire de colonnes), sinon
+    lève ValueError pour que la ligne seule soit refusée : valeur JSON qui n'est pas
+    un objet, ligne CSV avec des cellules en trop (rangées par `DictReader` sous la clé None).
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"Enregistrement invalide : objet attendu, reçu {type(row).__name__}")
+    if None in row:
+        raise ValueError(f"Enregistrement invalide : {len(row[None])} valeur(s) sans colonne")
+    return row
+
+
+def validate(schema, data: dict, exclude_none: bool = False) -> dict:
+    """
+    Valide `data` avec le schéma Pydantic et retourne les champs validés.
+    Seul point de conversion des erreurs Pydantic : écritures unitaires et en masse
+    lèvent la même ValueError (« Données invalides : ... »).
+    """
+    try:
+        return schema(**as_record(data)).model_dump(exclude_none=exclude_none)
+    except ValidationError as exc:
+        errors = exc.errors()
+        messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
+        raise ValueError(f"Données invalides : {messages}") from exc
+
+
+def keep_valid(report: BulkReport, items: list[tuple[int, dict]], check: Callable[[dict], dict]) -> list[tuple[int, dict]]:
+    """
+    Applique `check` à chaque ligne `(index, données)` et retourne les lignes retenues
+    (avec les données retournées par `check`). Une ValueError ou PermissionError
+    est consignée dans le rapport pour cette ligne seulement.
+    """
+    kept = []
+    for index, data in items:
+        try:
+            kept.append((index, check(data)))
+        except (ValueError, PermissionError) as exc:
+            report.fail(index, str(exc))
+    return kept
+
+
+def record_failures(report: BulkReport, items: list[tuple[int, dict]], result, translate: Callable) -> None:
+    """Reporte les lignes refusées par la base (`BulkResult.failures`) sur leur position d'origine."""
+    for position, exc in result.failures:
+        report.fail(items[position][0], str(translate(exc)))
+
+
+def existing_ids(session, column, ids) -> set:
+    """Valeurs de `column` présentes en base parmi `ids` (une requête IN par lot)."""
+    found = set()
+    for chunk in in_chunks([i for i in ids if i is not None]):
+        found.update(value for (value,) in session.query(column).filter(column.in_(chunk)))
+    return found
+
+
+def target_rows(report: BulkReport, rows: list[dict]) -> list[tuple[int, dict]]:
+    """Lignes de mise à jour `(index, données)` ; une ligne sans `id` est refusée."""
+    items = []
+    for index, row in enumerate(rows):
+        try:
+            row = as_record(row)
+        except ValueError as exc:
+            report.fail(index, str(exc))
+            continue
+        if not row.get("id"):
+            report.fail(index, "id est requis")
+            continue
+        items.append((index, dict(row)))
+    return items
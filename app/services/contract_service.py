@@ -1,11 +1,19 @@
 from app.repositories.contract_repository import ContractRepository
-from pydantic import ValidationError
+from app.repositories.user_repository import UserRepository
 from app.schemas.contract import ContractCreate, ContractUpdate
 from sqlalchemy.exc import IntegrityError
+from app.db.errors import constraint_error
 from typing import Optional
 from app.models.contract import Contract
+from app.models.event import Event
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page
+from app.repositories.projection import ColumnSpec
+from app.repositories.references import ensure_unreferenced
+from app.services.bulk import BulkReport, as_record, existing_ids, keep_valid, record_failures, target_rows, validate
+from sentry import traced_methods
 
 
+@traced_methods("service")
 class ContractService:
     """
     Service de gestion des contrats.
@@ -15,8 +23,24 @@ class ContractService:
     - vérification des permissions via `permission_service`,
     - normalisation légère des données,
     - gestion des erreurs de contrainte en base (rollback et message utilisateur).
+
+    `bulk_create(user, rows)` / `bulk_update(user, rows)` retournent un `BulkReport` :
+    permission, gestionnaires et clients sont vérifiés une fois pour tout le lot et
+    les lignes invalides sont signalées sans interrompre les autres.
+
+    Les méthodes de liste transmettent leurs critères (`signed`, `unpaid`,
+    `min_balance`, `max_balance`) au repository, qui filtre en SQL. Avec `columns`
+    (par ex. `LIST_COLUMNS`), elles retournent des lignes nommées au lieu d'objets `Contract`.
     """
 
+    # relations affichées par les vues : libellés des listes et écran de détail
+    LIST_LOAD = {"customer": "joined"}
+    DETAIL_LOAD = {"customer": "joined", "manager": "joined"}
+    # colonnes lues pour les libellés des menus de liste (lignes nommées, sans entité)
+    LIST_COLUMNS = ("id", "customer.company_name")
+    # lignes qui empêchent la suppression d'un contrat (cf. `ensure_unreferenced`)
+    DELETE_REFERENCES = (("évènement(s)", Event.contract_id),)
+
     def __init__(self, session, permission_service) -> None:
         self.session = session
         self.repo = ContractRepository(session)
@@ -30,12 +54,7 @@ class ContractService:
             if getattr(getattr(user, 'role', None), 'name', None) == 'management':
                 fields['user_management_id'] = getattr(user, 'id', None)
         # valide les champs fournis via Pydantic
-        try:
-            validated = ContractCreate(**fields).model_dump()
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides : {messages}") from exc
+        validated = validate(ContractCreate, fields)
 
         validated = self._normalize(validated)
         self._ensure_management_user_exists(validated.get('user_management_id'))
@@ -46,7 +65,7 @@ class ContractService:
             return self.repo.create(**validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (doublon ou référence invalide possible)') from exc
+            raise self._constraint_error(exc) from exc
 
     def update(self, user, contract_id: int, **fields) -> Contract:
         contract = self.repo.get_by_id(contract_id)
@@ -63,12 +82,7 @@ class ContractService:
         if 'balance_due' in fields and 'total_amount' not in fields:
             fields_for_validation['total_amount'] = contract.total_amount
 
-        try:
-            validated = ContractUpdate(**fields_for_validation).model_dump(exclude_none=True)
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides : {messages}") from exc
+        validated = validate(ContractUpdate, fields_for_validation, exclude_none=True)
 
         validated = self._normalize(validated)
         if 'user_management_id' in validated:
@@ -80,7 +94,59 @@ class ContractService:
             return self.repo.update(contract, **validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (doublon ou référence invalide possible)') from exc
+            raise self._constraint_error(exc) from exc
+
+    def bulk_create(self, user, rows: list[dict], chunk_size: Optional[int] = None) -> BulkReport:
+        if not self.perm.user_has_permission(user, 'contract:create'):
+            raise PermissionError("Permission refusée")
+        report = BulkReport(total=len(rows))
+        is_management = getattr(getattr(user, 'role', None), 'name', None) == 'management'
+
+        def prepare(row: dict) -> dict:
+            row = as_record(row)
+            if not row.get('user_management_id') and is_management:
+                row = {**row, 'user_management_id': getattr(user, 'id', None)}
+            return self._normalize(validate(ContractCreate, row))
+
+        items = keep_valid(report, list(enumerate(rows)), prepare)
+        items = self._check_batch_references(report, items)
+        result = self.repo.bulk_create([data for _, data in items], chunk_size)
+        record_failures(report, items, result, self._constraint_error)
+        report.created = result.affected
+        return report
+
+    def bulk_update(self, user, rows: list[dict], chunk_size: Optional[int] = None) -> BulkReport:
+        if not self.perm.user_has_permission(user, 'contract:update'):
+            raise PermissionError("Permission refusée")
+        report = BulkReport(total=len(rows))
+        items = target_rows(report, rows)
+        contracts = {c.id: c for c in self.repo.list_by_ids([data['id'] for _, data in items])}
+
+        def prepare(row: dict) -> dict:
+            contract = contracts.get(row['id'])
+            if not contract:
+                raise ValueError("Contrat non trouvé")
+            self._ensure_sales_contract_owner(contract, user)
+            fields = {k: v for k, v in row.items() if k != 'id'}
+            # montant et solde sont validés ensemble, comme dans `update`
+            fields_for_validation = dict(fields)
+            if 'total_amount' in fields and 'balance_due' not in fields:
+                fields_for_validation['balance_due'] = contract.balance_due
+            if 'balance_due' in fields and 'total_amount' not in fields:
+                fields_for_validation['total_amount'] = contract.total_amount
+            validated = self._normalize(validate(ContractUpdate, fields_for_validation, exclude_none=True))
+            # seuls les champs fournis sont écrits (`signed` vaut False par défaut dans le schéma)
+            validated = {k: v for k, v in validated.items() if k in fields_for_validation}
+            if not validated:
+                raise ValueError("Aucun champ à modifier")
+            return {'id': contract.id, **validated}
+
+        items = keep_valid(report, items, prepare)
+        items = self._check_batch_references(report, items)
+        result = self.repo.bulk_update([data for _, data in items], chunk_size)
+        record_failures(report, items, result, self._constraint_error)
+        report.updated = result.affected
+        return report
 
     def delete(self, user, contract_id: int) -> None:
         contract = self.repo.get_by_id(contract_id)
@@ -92,10 +158,8 @@ class ContractService:
 
 
         # vérifie que le contrat n'est pas référencé par des évènements
-        from app.models.event import Event
-        events_count = self.session.query(Event).filter(Event.contract_id == contract_id).count()
-        if events_count > 0:
-            raise ValueError(f"Impossible de supprimer le contrat : référencé par {events_count} évènement(s).")
+        ensure_unreferenced(self.session, self.DELETE_REFERENCES, contract_id,
+                            "Impossible de supprimer le contrat : référencé par")
 
         try:
             self.repo.delete(contract)
@@ -103,21 +167,26 @@ class ContractService:
             self.session.rollback()
             raise
 
-    def list_all(self, user) -> list[Contract]:
+    def list_all(self, user, **criteria) -> list[Contract]:
         if not self.perm.user_has_permission(user, 'contract:read'):
             raise PermissionError("Utilisateur non autorisé à lire les contrats")
-        return self.repo.list_all()
+        return self.repo.list_all(load=self.LIST_LOAD, **criteria)
 
+    def list_page(self, user, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+                  columns: Optional[ColumnSpec] = None) -> Page[Contract]:
+        if not self.perm.user_has_permission(user, 'contract:read'):
+            raise PermissionError("Utilisateur non autorisé à lire les contrats")
+        return self.repo.list_page(after_id, limit, load=self.LIST_LOAD, columns=columns)
 
-    def list_by_management_user(self, user, user_id: int) -> list[Contract]:
+    def list_by_management_user(self, user, user_id: int, **criteria) -> list[Contract]:
         if not self.perm.user_has_permission(user, 'contract:read'):
             raise PermissionError("Utilisateur non autorisé à lire les contrats")
-        return self.repo.list_by_management_user(user_id)
+        return self.repo.list_by_management_user(user_id, load=self.LIST_LOAD, **criteria)
 
-    def list_by_customer_ids(self, user, customer_ids: list) -> list[Contract]:
+    def list_by_customer_ids(self, user, customer_ids: list, **criteria) -> list[Contract]:
         if not self.perm.user_has_permission(user, 'contract:read'):
             raise PermissionError("Utilisateur non autorisé à lire les contrats")
-        return self.repo.list_by_customer_ids(customer_ids)
+        return self.repo.list_by_customer_ids(customer_ids, load=self.LIST_LOAD, **criteria)
 
     # ---- helpers ----
     def _normalize(self, validated: dict) -> dict:
@@ -129,13 +198,32 @@ class ContractService:
             if contract.customer_id not in customer_ids:
                 raise PermissionError("Action réservée au commercial propriétaire")
 
+    def _check_batch_references(self, report: BulkReport, items: list) -> list:
+        # gestionnaires et clients référencés par le lot : une requête IN par table
+        from app.models.customer import Customer as CustomerModel
+        from app.models.user import User as UserModel
+
+        manager_ids = existing_ids(self.session, UserModel.id, {d['user_management_id'] for _, d in items if 'user_management_id' in d})
+        customer_ids = existing_ids(self.session, CustomerModel.id, {d['customer_id'] for _, d in items if 'customer_id' in d})
+
+        def check(data: dict) -> dict:
+            if 'user_management_id' in data and data['user_management_id'] not in manager_ids:
+                raise ValueError('Utilisateur gestionnaire introuvable')
+            if 'customer_id' in data and data['customer_id'] not in customer_ids:
+                raise ValueError('Client introuvable')
+            return data
+
+        return keep_valid(report, items, check)
+
+    def _constraint_error(self, exc: IntegrityError) -> ValueError:
+        # aucun champ unique propre aux contrats : message générique
+        return constraint_error(exc, {}, 'Violation de contrainte en base (doublon ou référence invalide possible)')
+
     def _ensure_management_user_exists(self, user_id: Optional[int]) -> None:
         if not user_id:
             raise ValueError('user_management_id est requis')
-        from app.models.user import User as UserModel
-
-        u = self.session.query(UserModel).filter(UserModel.id == user_id).one_or_none()
-        if not u:
+        # résumé de l'utilisateur servi par le cache `users` du repository
+        if UserRepository(self.session).get_summary(user_id) is None:
             raise ValueError('Utilisateur gestionnaire introuvable')
     
     def _ensure_customer_exists(self, customer_id: Optional[int]) -> None:
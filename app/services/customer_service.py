@@ -1,13 +1,23 @@
 from app.repositories.customer_repository import CustomerRepository
-from pydantic import ValidationError
+from app.repositories.user_repository import UserRepository
 from app.schemas.customer import CustomerCreate, CustomerUpdate
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
+from app.models.contract import Contract
 from app.models.customer import Customer
+from app.models.event import Event
+from app.db.errors import check_unique, constraint_error
+from app.repositories.batching import in_chunks
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page
+from app.repositories.projection import ColumnSpec
+from app.repositories.references import ensure_unreferenced
+from app.services.bulk import BulkReport, as_record, existing_ids, keep_valid, record_failures, target_rows, validate
+from sentry import traced_methods
 
 
 
 
+@traced_methods("service")
 class CustomerService:
     """Service de gestion des clients.
 
@@ -18,9 +28,17 @@ class CustomerService:
     Ce que la classe renvoie :
     - `create(user, **fields)` : retourne l'objet `Customer` nouvellement créé.
     - `update(user, customer_id, **fields)` : retourne l'objet `Customer` mis à jour.
-    - `delete(user, customer_id)` : ne retourne rien (supprime le client).
+    - `delete(user, customer_id)` : ne retourne rien (supprime le client) ; refusé tant que
+        des contrats ou évènements le référencent (`DELETE_REFERENCES`, une requête EXISTS).
     - `list_all(user)` : retourne une liste d'objets `Customer` (tous les clients accessibles).
+    - `list_page(user, after_id, limit)` : retourne une `Page` de clients triés par `id`
+        (pagination par curseur : `page.next_cursor` sert d'`after_id` pour la page suivante).
     - `list_mine(user)` : retourne la liste des clients assignés au commercial (`user.id`).
+    - `bulk_create(user, rows)` / `bulk_update(user, rows)` : retournent un `BulkReport`
+        (lignes écrites et erreurs par ligne) ; permission, commerciaux et unicité
+        sont vérifiés une fois pour tout le lot.
+    Les méthodes de liste acceptent `columns` (par ex. `LIST_COLUMNS`) pour ne lire que
+    ces colonnes : elles retournent alors des lignes nommées au lieu d'objets `Customer`.
 
     Remarques :
     - Cette classe vérifie les permissions générales (CRUD) et applique
@@ -31,6 +49,20 @@ class CustomerService:
         opérations sensibles.
     """
 
+    # relation affichée par l'écran de détail (nom du commercial)
+    DETAIL_LOAD = {"sales_user": "joined"}
+    # colonnes lues pour les libellés des menus de liste (lignes nommées, sans entité)
+    LIST_COLUMNS = ("id", "customer_first_name", "customer_last_name", "company_name", "user_sales_id")
+
+    # champs soumis à une contrainte d'unicité et message associé
+    UNIQUE_FIELDS = {
+        'email': 'Email déjà utilisé',
+        'phone_number': 'Numéro de téléphone déjà utilisé',
+        'company_name': 'Nom de société déjà utilisé',
+    }
+    # lignes qui empêchent la suppression d'un client (cf. `ensure_unreferenced`)
+    DELETE_REFERENCES = (("contrat(s)", Contract.customer_id), ("évènement(s)", Event.customer_id))
+
     def __init__(self, session, permission_service) -> None:
         self.session = session
         self.repo = CustomerRepository(session)
@@ -40,25 +72,21 @@ class CustomerService:
         if not self.perm.user_has_permission(user, 'customer:create'):
             raise PermissionError("Permission refuseée")
 
-        try:
-            validated = CustomerCreate(**fields).model_dump()
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides: {messages}") from exc
+        validated = validate(CustomerCreate, fields)
         # normalize and pre-checks
         validated = self._normalize(validated)
         # assign ownership by default when the caller is a sales user and no owner provided
         if not validated.get('user_sales_id') and getattr(user, 'role', None) and getattr(user.role, 'name', None) == 'sales':
             validated['user_sales_id'] = user.id
+        self._ensure_own_assignment(validated, user)
         self._ensure_sales_user_exists(validated.get('user_sales_id'))
-        self._check_uniqueness(validated)
+        check_unique(self.session, Customer, self.UNIQUE_FIELDS, validated)
 
         try:
             return self.repo.create(**validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (doublon possible)') from exc
+            raise self._constraint_error(exc) from exc
 
     def update(self, user, customer_id: int, **fields) -> Customer:
         # récupère le client à modifier
@@ -70,23 +98,66 @@ class CustomerService:
         if not self.perm.user_has_permission(user, 'customer:update'):
             raise PermissionError("Permission refusée")
         self._ensure_customer_owner(customer, user)
-        try:
-            validated = CustomerUpdate(**fields).model_dump(exclude_none=True)
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides: {messages}") from exc
+        validated = validate(CustomerUpdate, fields, exclude_none=True)
         # normalize and pre-checks
         validated = self._normalize(validated)
+        self._ensure_own_assignment(validated, user)
         if 'user_sales_id' in validated:
             self._ensure_sales_user_exists(validated.get('user_sales_id'))
-        self._check_uniqueness(validated, exclude_customer_id=customer.id)
+        check_unique(self.session, Customer, self.UNIQUE_FIELDS, validated, exclude_id=customer.id)
 
         try:
             return self.repo.update(customer, **validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (doublon possible)') from exc
+            raise self._constraint_error(exc) from exc
+
+    def bulk_create(self, user, rows: list[dict], chunk_size: Optional[int] = None) -> BulkReport:
+        if not self.perm.user_has_permission(user, 'customer:create'):
+            raise PermissionError("Permission refuseée")
+        report = BulkReport(total=len(rows))
+        is_sales = getattr(getattr(user, 'role', None), 'name', None) == 'sales'
+
+        def prepare(row: dict) -> dict:
+            row = as_record(row)
+            if not row.get('user_sales_id') and is_sales:
+                row = {**row, 'user_sales_id': user.id}
+            validated = self._normalize(validate(CustomerCreate, row))
+            self._ensure_own_assignment(validated, user)
+            return validated
+
+        items = keep_valid(report, list(enumerate(rows)), prepare)
+        items = self._check_batch_references(report, items)
+        result = self.repo.bulk_create([data for _, data in items], chunk_size)
+        record_failures(report, items, result, self._constraint_error)
+        report.created = result.affected
+        return report
+
+    def bulk_update(self, user, rows: list[dict], chunk_size: Optional[int] = None) -> BulkReport:
+        if not self.perm.user_has_permission(user, 'customer:update'):
+            raise PermissionError("Permission refusée")
+        report = BulkReport(total=len(rows))
+        items = target_rows(report, rows)
+        customers = {c.id: c for c in self.repo.list_by_ids([data['id'] for _, data in items])}
+
+        def prepare(row: dict) -> dict:
+            customer = customers.get(row['id'])
+            if not customer:
+                raise ValueError("Client non trouvé")
+            self._ensure_customer_owner(customer, user)
+            fields = {k: v for k, v in row.items() if k != 'id'}
+            validated = self._normalize(validate(CustomerUpdate, fields, exclude_none=True))
+            if not validated:
+                raise ValueError("Aucun champ à modifier")
+            self._ensure_own_assignment(validated, user)
+            return {'id': customer.id, **validated}
+
+        items = keep_valid(report, items, prepare)
+        items = self._check_batch_references(report, items)
+        result = self.repo.bulk_update([data for _, data in items], chunk_size)
+        record_failures(report, items, result, self._constraint_error)
+        report.updated = result.affected
+        return report
 
     def delete(self, user, customer_id: int) -> None:
         customer = self.repo.get_by_id(customer_id)
@@ -98,19 +169,8 @@ class CustomerService:
         self._ensure_customer_owner(customer, user)
 
         # refuse deletion if customer has contracts or events
-        from app.models.contract import Contract
-        from app.models.event import Event
-
-        contracts_count = self.session.query(Contract).filter(Contract.customer_id == customer_id).count()
-        events_count = self.session.query(Event).filter(Event.customer_id == customer_id).count()
-        total_refs = contracts_count + events_count
-        if total_refs > 0:
-            parts = []
-            if contracts_count:
-                parts.append(f"{contracts_count} contrat(s)")
-            if events_count:
-                parts.append(f"{events_count} évènement(s)")
-            raise ValueError("Impossible de supprimer le client : il est référencé par " + ", ".join(parts) + ".")
+        ensure_unreferenced(self.session, self.DELETE_REFERENCES, customer_id,
+                            "Impossible de supprimer le client : il est référencé par")
 
         # essayez de supprimer et gérez les erreurs potentielles
         try:
@@ -119,16 +179,22 @@ class CustomerService:
             self.session.rollback()
             raise
 
-    def list_all(self, user) -> list[Customer]:
+    def list_all(self, user, columns: Optional[ColumnSpec] = None) -> list[Customer]:
         # visibility handled at CLI/service level; here return all if allowed
         if not self.perm.user_has_permission(user, 'customer:read'):
             raise PermissionError("Permission refuseée")
-        return self.repo.list_all()
+        return self.repo.list_all(columns=columns)
 
-    def list_mine(self, user) -> list[Customer]:
+    def list_page(self, user, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+                  columns: Optional[ColumnSpec] = None) -> Page[Customer]:
         if not self.perm.user_has_permission(user, 'customer:read'):
             raise PermissionError("Permission refuseée")
-        return self.repo.list_by_sales_user(user.id)
+        return self.repo.list_page(after_id, limit, columns=columns)
+
+    def list_mine(self, user, columns: Optional[ColumnSpec] = None) -> list[Customer]:
+        if not self.perm.user_has_permission(user, 'customer:read'):
+            raise PermissionError("Permission refuseée")
+        return self.repo.list_by_sales_user(user.id, columns=columns)
 
     # ---- helpers ----
     def _normalize(self, validated: dict) -> dict:
@@ -143,26 +209,47 @@ class CustomerService:
         if getattr(customer, 'user_sales_id', None) != getattr(user, 'id', None):
             raise PermissionError("Action réservée au commercial propriétaire")
 
+    def _ensure_own_assignment(self, validated: dict, user) -> None:
+        # un commercial n'attribue un client qu'à lui-même, en création comme en modification
+        is_sales = getattr(getattr(user, 'role', None), 'name', None) == 'sales'
+        if is_sales and validated.get('user_sales_id') not in (None, getattr(user, 'id', None)):
+            raise PermissionError("Un commercial ne peut attribuer un client qu'à lui-même")
+
     def _ensure_sales_user_exists(self, user_id: Optional[int]) -> None:
         if not user_id:
             raise ValueError('user_sales_id est requis')
-        from app.models.user import User as UserModel
-
-        u = self.session.query(UserModel).filter(UserModel.id == user_id).one_or_none()
-        if not u:
+        # résumé de l'utilisateur servi par le cache `users` du repository
+        if UserRepository(self.session).get_summary(user_id) is None:
             raise ValueError('Utilisateur commercial (sales) introuvable')
 
-    def _check_uniqueness(self, validated: dict, exclude_customer_id: Optional[int] = None) -> None:
-        from app.models.customer import Customer as CustomerModel
-        if 'email' in validated and validated.get('email'):
-            other = self.session.query(CustomerModel).filter(CustomerModel.email == validated.get('email')).one_or_none()
-            if other and (exclude_customer_id is None or other.id != exclude_customer_id):
-                raise ValueError('Email déjà utilisé')
-        if 'phone_number' in validated and validated.get('phone_number'):
-            other = self.session.query(CustomerModel).filter(CustomerModel.phone_number == validated.get('phone_number')).one_or_none()
-            if other and (exclude_customer_id is None or other.id != exclude_customer_id):
-                raise ValueError('Numéro de téléphone déjà utilisé')
-        if 'company_name' in validated and validated.get('company_name'):
-            other = self.session.query(CustomerModel).filter(CustomerModel.company_name == validated.get('company_name')).one_or_none()
-            if other and (exclude_customer_id is None or other.id != exclude_customer_id):
-                raise ValueError('Nom de société déjà utilisé')
+    def _check_batch_references(self, report: BulkReport, items: list) -> list:
+        # contrôles groupés : commerciaux existants puis unicité (base et doublons du lot), une requête IN par champ
+        from app.models.user import User as UserModel
+
+        sales_ids = existing_ids(self.session, UserModel.id, {data['user_sales_id'] for _, data in items if 'user_sales_id' in data})
+        taken = {}
+        for field in self.UNIQUE_FIELDS:
+            values = {data[field] for _, data in items if data.get(field)}
+            taken[field] = {}
+            for chunk in in_chunks(list(values)):
+                column = getattr(Customer, field)
+                for customer_id, value in self.session.query(Customer.id, column).filter(column.in_(chunk)):
+                    taken[field][str(value).casefold()] = customer_id
+
+        def check(data: dict) -> dict:
+            if 'user_sales_id' in data and data['user_sales_id'] not in sales_ids:
+                raise ValueError('Utilisateur commercial (sales) introuvable')
+            keys = [(field, str(data[field]).casefold()) for field in self.UNIQUE_FIELDS if data.get(field)]
+            for field, key in keys:
+                if taken[field].get(key, data.get('id')) != data.get('id'):
+                    raise ValueError(self.UNIQUE_FIELDS[field])
+            # la valeur est désormais prise par cette ligne (doublons à l'intérieur du lot)
+            for field, key in keys:
+                taken[field][key] = data.get('id', object())
+            return data
+
+        return keep_valid(report, items, check)
+
+    def _constraint_error(self, exc: IntegrityError) -> ValueError:
+        # traduit la violation d'unicité levée par la base en message par champ
+        return constraint_error(exc, self.UNIQUE_FIELDS)
@@ -1,12 +1,18 @@
 from app.repositories.event_repository import EventRepository
-from app.repositories.contract_repository import ContractRepository
-from pydantic import ValidationError
+from app.repositories.user_repository import UserRepository
 from app.schemas.event import EventCreate, EventUpdate
 from sqlalchemy.exc import IntegrityError
+from app.db.errors import constraint_error
 from typing import Optional
 from app.models.event import Event
+from app.repositories.batching import in_chunks
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page
+from app.repositories.projection import ColumnSpec
+from app.services.bulk import BulkReport, keep_valid, record_failures, target_rows, validate
+from sentry import traced_methods
 
 
+@traced_methods("service")
 class EventService:
     """Service de gestion des événements.
 
@@ -14,26 +20,43 @@ class EventService:
     à des contrats/clients) en utilisant `EventRepository` pour les opérations
     de persistance et `permission_service` pour vérifier les permissions
     générales. Cette couche prépare et valide les données (par ex. vérifie
-    l'existence du contrat lors de la création) mais ne réalise pas les
-    vérifications fines d'appartenance qui sont gérées par la couche CLI/views.
+    l'existence du contrat lors de la création) et applique les règles métier
+    d'appartenance, quel que soit l'appelant (vues CLI, import, API HTTP).
 
     Ce que la classe renvoie :
     - `create(user, **fields)` : retourne l'objet `Event` nouvellement créé (doit
-            contenir `contract_id` dans `fields`).
-    - `update(user, event_id, **fields)` : retourne l'objet `Event` mis à jour.
+            contenir `contract_id` dans `fields`) ; contrat (signé), client et commercial
+            du client sont vérifiés en une requête (`_contract_owners`).
+    - `update(user, event_id, **fields)` : retourne l'objet `Event` mis à jour ; la
+            cohérence contrat/client n'est relue que si l'un des deux change.
     - `delete(user, event_id)` : ne retourne rien (supprime l'événement).
     - `list_all(user)` : retourne une liste d'objets `Event` (tous les événements accessibles).
+    - `list_page(user, after_id, limit)` : retourne une `Page` d'événements triés par `id`.
     - `list_by_support_user(user_id)` : retourne la liste des événements assignés
             à un utilisateur support.
     - `list_by_customer(customer_id)` : retourne la liste des événements d'un client.
+    - `list_by_customer_ids(customer_ids)` : retourne les événements de plusieurs
+            clients (requêtes IN par lots).
+    - `list_by_sales_user(user_id)` : retourne les événements des clients d'un
+            commercial, en une requête.
+    - `list_without_support(user)` : retourne les événements sans support assigné.
+    - `bulk_create(user, rows)` / `bulk_update(user, rows)` : retournent un `BulkReport` ;
+            contrats et clients du lot sont vérifiés en une requête.
+    Les méthodes de liste acceptent des critères (`unassigned`, `start_after`,
+    `start_before`) transmis au repository, qui filtre en SQL, ainsi que `columns`
+    (par ex. `LIST_COLUMNS`) pour obtenir des lignes nommées au lieu d'objets `Event`.
 
     Remarques :
-    - Les contrôles d'appartenance (par ex. ``sales`` ne pouvant modifier que
-        ses propres clients) doivent être effectués par les vues avant d'appeler
-        ces méthodes.
+    - Un commercial ne crée, modifie ou supprime que les événements des contrats
+        de ses clients ; le contrat doit être signé. La modification exige
+        `event:update` pour tous les rôles (support : événements assignés,
+        management : `user_support_id` seulement).
     - Les méthodes lèvent `PermissionError` ou `ValueError` selon les cas.
     """
 
+    # colonnes lues pour les libellés des menus de liste (lignes nommées, sans entité)
+    LIST_COLUMNS = ("id", "event_name")
+
     def __init__(self, session, permission_service) -> None:
         # initialisation du service avec la session DB et le service de permissions
         self.session = session
@@ -45,32 +68,17 @@ class EventService:
         if not self.perm.user_has_permission(user, "event:create"):
             raise PermissionError("Permission refusée")
         # valide les champs fournis via Pydantic
-        try:
-            validated = EventCreate(**fields).model_dump()
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides : {messages}") from exc
-
-        # utiliser ContractRepository pour vérifier l'existence du contrat et les droits
-        contract_repo = ContractRepository(self.session)
-        contract = contract_repo.get_by_id(validated["contract_id"])
-        if not contract:
-            raise ValueError("Contrat non trouvé")
-
-        # vérifier que le client existe et qu'il appartient au contrat
-        self._ensure_customer_exists(validated.get("customer_id"))
-        if contract.customer_id != validated.get("customer_id"):
-            raise ValueError("Le contrat n'est pas lié au client spécifié")
+        validated = validate(EventCreate, fields)
 
-        # les commerciaux ne peuvent créer des événements que pour leurs propres clients
-        self._ensure_customer_belongs_to_sales_user(validated.get("customer_id"), user)
+        # contrat, client et commercial du client lus en une requête
+        contracts = self._contract_owners({validated["contract_id"]})
+        self._check_create_references(validated, contracts, user, self._resolve_role_name(user) == 'sales')
 
         try:
             return self.repo.create(**validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (référence invalide possible)') from exc
+            raise self._constraint_error(exc) from exc
 
     def update(self, user, event_id: int, **fields) -> Event:
         event = self.repo.get_by_id(event_id)
@@ -80,12 +88,10 @@ class EventService:
         self._check_role_update_permissions(role_name, event, fields, user)
 
         # valider les champs fournis via Pydantic
-        try:
-            validated = EventUpdate(**fields).model_dump(exclude_none=True)
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides : {messages}") from exc
+        validated = validate(EventUpdate, fields, exclude_none=True)
+        if role_name == 'sales':
+            contracts = self._contract_owners({event.contract_id, validated.get('contract_id', event.contract_id)})
+            self._ensure_sales_event_owner(event, validated, contracts, user)
 
         self._validate_contract_customer_consistency(event, validated)
 
@@ -93,7 +99,54 @@ class EventService:
             return self.repo.update(event, **validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (référence invalide possible)') from exc
+            raise self._constraint_error(exc) from exc
+
+    def bulk_create(self, user, rows: list[dict], chunk_size: Optional[int] = None) -> BulkReport:
+        if not self.perm.user_has_permission(user, "event:create"):
+            raise PermissionError("Permission refusée")
+        report = BulkReport(total=len(rows))
+        items = keep_valid(report, list(enumerate(rows)), lambda row: validate(EventCreate, row))
+        contracts = self._contract_owners({data["contract_id"] for _, data in items})
+        is_sales = self._resolve_role_name(user) == 'sales'
+        items = keep_valid(report, items, lambda data: self._check_create_references(data, contracts, user, is_sales))
+        result = self.repo.bulk_create([data for _, data in items], chunk_size)
+        record_failures(report, items, result, self._constraint_error)
+        report.created = result.affected
+        return report
+
+    def bulk_update(self, user, rows: list[dict], chunk_size: Optional[int] = None) -> BulkReport:
+        report = BulkReport(total=len(rows))
+        items = target_rows(report, rows)
+        events = {e.id: e for e in self.repo.list_by_ids([data["id"] for _, data in items])}
+        role_name = self._resolve_role_name(user)
+
+        def prepare(row: dict) -> dict:
+            event = events.get(row["id"])
+            if not event:
+                raise ValueError("Événement non trouvé")
+            fields = {k: v for k, v in row.items() if k != "id"}
+            self._check_role_update_permissions(role_name, event, fields, user)
+            validated = validate(EventUpdate, fields, exclude_none=True)
+            if not validated:
+                raise ValueError("Aucun champ à modifier")
+            return {"id": event.id, **validated}
+
+        items = keep_valid(report, items, prepare)
+        # contrat (nouveau ou actuel) de chaque ligne : une requête pour tout le lot
+        contract_ids = {events[data["id"]].contract_id for _, data in items}
+        contracts = self._contract_owners(contract_ids | {data.get("contract_id", events[data["id"]].contract_id) for _, data in items})
+
+        def check(data: dict) -> dict:
+            event = events[data["id"]]
+            if role_name == 'sales':
+                self._ensure_sales_event_owner(event, data, contracts, user)
+            return self._check_update_references(event, data, contracts)
+
+        items = keep_valid(report, items, check)
+        result = self.repo.bulk_update([data for _, data in items], chunk_size)
+        record_failures(report, items, result, self._constraint_error)
+        report.updated = result.affected
+        return report
 
     def delete(self, user, event_id: int) -> None:
         event = self.repo.get_by_id(event_id)
@@ -101,20 +154,39 @@ class EventService:
             raise ValueError("Event not found")
         if not self.perm.user_has_permission(user, "event:delete"):
             raise PermissionError("User not allowed to delete events")
+        if self._resolve_role_name(user) == 'sales':
+            self._ensure_sales_event_owner(event, {}, self._contract_owners({event.contract_id}), user)
         self.repo.delete(event)
 
-    def list_by_support_user(self, user_id: int):
-        return self.repo.list_by_support_user(user_id)
+    def list_by_support_user(self, user_id: int, **criteria):
+        return self.repo.list_by_support_user(user_id, **criteria)
+
+    def list_by_customer(self, customer_id: int, **criteria):
+        return self.repo.list_by_customer(customer_id, **criteria)
+
+    def list_by_customer_ids(self, customer_ids: list, **criteria):
+        return self.repo.list_by_customer_ids(customer_ids, **criteria)
 
-    def list_by_customer(self, customer_id: int):
-        return self.repo.list_by_customer(customer_id)
+    def list_by_sales_user(self, user_id: int, **criteria):
+        return self.repo.list_by_sales_user(user_id, **criteria)
 
 
 
-    def list_all(self, user) -> list[Event]:
+    def list_all(self, user, **criteria) -> list[Event]:
+        if not self.perm.user_has_permission(user, "event:read"):
+            raise PermissionError("User not allowed to read events")
+        return self.repo.list_all(**criteria)
+
+    def list_without_support(self, user, **criteria) -> list[Event]:
+        if not self.perm.user_has_permission(user, "event:read"):
+            raise PermissionError("User not allowed to read events")
+        return self.repo.list_without_support(**criteria)
+
+    def list_page(self, user, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+                  columns: Optional[ColumnSpec] = None) -> Page[Event]:
         if not self.perm.user_has_permission(user, "event:read"):
             raise PermissionError("User not allowed to read events")
-        return self.repo.list_all()
+        return self.repo.list_page(after_id, limit, columns=columns)
 
     def list_mine(self, user) -> list[Event]:
         # conservé pour compatibilité ; les vues doivent gérer rôle/appartenance et appeler des wrappers appropriés
@@ -126,16 +198,16 @@ class EventService:
             return getattr(user, 'role').name
         except Exception:
             try:
-                from app.models.user import User as UserModel
-
                 if getattr(user, 'id', None) is not None:
-                    u = self.session.query(UserModel).filter(UserModel.id == user.id).one_or_none()
-                    return getattr(u.role, 'name', None) if u else None
+                    summary = UserRepository(self.session).get_summary(user.id)
+                    return summary.role_name if summary else None
             except Exception:
                 return None
         return None
 
     def _check_role_update_permissions(self, role_name: Optional[str], event: Event, fields: dict, user) -> None:
+        if not self.perm.user_has_permission(user, "event:update"):
+            raise PermissionError("User not allowed to update this event")
         keys = list(fields.keys())
         if role_name == 'support':
             if getattr(event, 'user_support_id', None) != getattr(user, 'id', None):
@@ -148,60 +220,69 @@ class EventService:
             allowed = {'user_support_id'}
             if any(k not in allowed for k in keys):
                 raise PermissionError('Management ne peut mettre à jour que le champ user_support_id')
-            return
-
-        if role_name != 'sales' and not self.perm.user_has_permission(user, "event:update"):
-            raise PermissionError("User not allowed to update this event")
 
     def _validate_contract_customer_consistency(self, event: Event, validated: dict) -> None:
-        if 'contract_id' in validated:
-            from app.repositories.contract_repository import ContractRepository as CR
-
-            c = CR(self.session).get_by_id(validated.get('contract_id'))
-            if not c:
-                raise ValueError('Contract not found')
-
-        if 'customer_id' in validated:
-            self._ensure_customer_exists(validated.get('customer_id'))
-
-        new_contract_id = validated.get('contract_id', getattr(event, 'contract_id', None))
-        new_customer_id = validated.get('customer_id', getattr(event, 'customer_id', None))
-        if new_contract_id is not None and new_customer_id is not None:
-            cr = ContractRepository(self.session).get_by_id(new_contract_id)
-            if not cr or cr.customer_id != new_customer_id:
-                raise ValueError('contract_id does not belong to the given customer_id')
-
-    def _ensure_customer_exists(self, customer_id: Optional[int]) -> None:
-        if not customer_id:
-            raise ValueError('customer_id est requis')
-        from app.models.customer import Customer as CustomerModel
-
-        c = self.session.query(CustomerModel).filter(CustomerModel.id == customer_id).one_or_none()
-        if not c:
-            raise ValueError('Client introuvable')
-
-    def _ensure_customer_belongs_to_sales_user(self, customer_id: Optional[int], user) -> None:
-        # si l'appelant est un commercial, vérifier que le client lui appartient ; autres rôles ignorés
-        role_name = None
-        try:
-            role_name = getattr(user, 'role').name
-        except Exception:
-            try:
-                from app.models.user import User as UserModel
-
-                if getattr(user, 'id', None) is not None:
-                    u = self.session.query(UserModel).filter(UserModel.id == user.id).one_or_none()
-                    role_name = getattr(u.role, 'name', None) if u else None
-            except Exception:
-                role_name = None
-
-        if role_name != 'sales':
+        # une requête seulement si le contrat ou le client de l'événement change
+        if 'contract_id' not in validated and 'customer_id' not in validated:
             return
+        contracts = self._contract_owners({validated.get('contract_id', event.contract_id)})
+        self._check_update_references(event, validated, contracts)
 
+    def _check_create_references(self, data: dict, contracts: dict, user, is_sales: bool) -> dict:
+        # invariants d'une création, vérifiés sur le résultat de `_contract_owners`
+        if not data.get("customer_id"):
+            raise ValueError('customer_id est requis')
+        if data["contract_id"] not in contracts:
+            raise ValueError("Contrat non trouvé")
+        customer_id, sales_id, signed = contracts[data["contract_id"]]
+        if customer_id != data["customer_id"]:
+            raise ValueError("Le contrat n'est pas lié au client spécifié")
+        if not signed:
+            raise ValueError("Le contrat doit être signé")
+        # les commerciaux ne peuvent créer des événements que pour leurs propres clients
+        if is_sales and sales_id != getattr(user, 'id', None):
+            raise PermissionError('Le commercial ne peut créer/modifier que ses clients')
+        return data
+
+    def _ensure_sales_event_owner(self, event: Event, data: dict, contracts: dict, user) -> None:
+        # contrat actuel et, le cas échéant, nouveau contrat doivent appartenir à un client du commercial ;
+        # un contrat absent de `contracts` est signalé ensuite par `_check_update_references`
+        for contract_id in {event.contract_id, data.get("contract_id", event.contract_id)}:
+            owner = contracts.get(contract_id)
+            if owner is not None and owner[1] != getattr(user, 'id', None):
+                raise PermissionError('Le commercial ne peut créer/modifier que ses clients')
+
+    def _check_update_references(self, event: Event, data: dict, contracts: dict) -> dict:
+        # le couple (contrat, client) résultant de la mise à jour doit rester cohérent
+        if "contract_id" not in data and "customer_id" not in data:
+            return data
+        contract = contracts.get(data.get("contract_id", event.contract_id))
+        if not contract:
+            raise ValueError('Contract not found')
+        if contract[0] != data.get("customer_id", event.customer_id):
+            raise ValueError('contract_id does not belong to the given customer_id')
+        # rattacher l'événement à un autre contrat exige, comme à la création, un contrat signé
+        if "contract_id" in data and not contract[2]:
+            raise ValueError("Le contrat doit être signé")
+        return data
+
+    def _contract_owners(self, contract_ids) -> dict:
+        # contrat -> (client, commercial du client, signé), par requêtes IN groupées
+        from app.models.contract import Contract as ContractModel
         from app.models.customer import Customer as CustomerModel
 
-        c = self.session.query(CustomerModel).filter(CustomerModel.id == customer_id).one_or_none()
-        if not c:
-            raise ValueError('Client introuvable')
-        if getattr(c, 'user_sales_id', None) != getattr(user, 'id', None):
-            raise PermissionError('Le commercial ne peut créer/modifier que ses clients')
+        owners = {}
+        for chunk in in_chunks(list(contract_ids)):
+            query = (
+                self.session.query(ContractModel.id, ContractModel.customer_id, CustomerModel.user_sales_id,
+                                   ContractModel.signed)
+                .join(CustomerModel, ContractModel.customer_id == CustomerModel.id)
+                .filter(ContractModel.id.in_(chunk))
+            )
+            owners.update({contract_id: (customer_id, sales_id, signed)
+                           for contract_id, customer_id, sales_id, signed in query})
+        return owners
+
+    def _constraint_error(self, exc: IntegrityError) -> ValueError:
+        # aucun champ unique propre aux événements : message générique
+        return constraint_error(exc, {}, 'Violation de contrainte en base (référence invalide possible)')
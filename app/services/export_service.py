@@ -0,0 +1,103 @@
+import csv
+import json
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, TextIO
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.event_repository import EventRepository
+from app.repositories.streaming import column_names
+from app.services.serialization import json_default
+from sentry import traced_methods
+
+FORMATS = ("csv", "jsonl")
+
+# entité exportable -> (permission de lecture, modèle, repository)
+EXPORT_ENTITIES = {
+    "customers": ("customer:read", Customer, CustomerRepository),
+    "contracts": ("contract:read", Contract, ContractRepository),
+    "events": ("event:read", Event, EventRepository),
+}
+
+
+@dataclass
+class ExportResult:
+    rows: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Lignes écrites par seconde."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def write_rows(fh: TextIO, fmt: str, columns: list[str], rows: Iterable) -> int:
+    """
+    Écrit les lignes au fil de l'eau (aucune accumulation) et retourne leur nombre.
+    CSV : ligne d'en-tête puis une ligne par enregistrement ; JSONL : un objet par ligne.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            fh.write(json.dumps(dict(zip(columns, row)), default=json_default, ensure_ascii=False))
+            fh.write("\n")
+            count += 1
+    else:
+        raise ValueError(f"Format inconnu : {fmt}")
+    return count
+
+
+@traced_methods("service")
+class ExportService:
+    """
+    Export en flux des clients, contrats ou évènements.
+
+    Seules les colonnes demandées sont lues, via un curseur côté serveur
+    (`stream_columns` des repositories) : aucun objet ORM n'est construit et la
+    mémoire reste constante quelle que soit la taille de la table.
+    L'export exige la permission de lecture de l'entité ; un commercial
+    n'exporte que ses clients (et les contrats / évènements de ses clients).
+    """
+
+    def __init__(self, session, permission_service) -> None:
+        self.session = session
+        self.perm = permission_service
+
+    def columns(self, entity: str) -> list[str]:
+        if entity not in EXPORT_ENTITIES:
+            raise ValueError(f"Entité inconnue : {entity}")
+        return column_names(EXPORT_ENTITIES[entity][1])
+
+    def stream(self, user, entity: str, columns: Optional[list[str]] = None, batch_size: Optional[int] = None,
+               **criteria):
+        """
+        Retourne `(colonnes, itérateur de tuples)` pour l'entité, restreint au périmètre de l'utilisateur
+        et aux `criteria` du repository (ex. `signed=False` pour les contrats).
+        Entité, permission et colonnes sont vérifiées dès l'appel, avant toute lecture.
+        """
+        if entity not in EXPORT_ENTITIES:
+            raise ValueError(f"Entité inconnue : {entity}")
+        permission, model, repository = EXPORT_ENTITIES[entity]
+        if not self.perm.user_has_permission(user, permission):
+            raise PermissionError("Permission refusée")
+        columns = list(columns or column_names(model))
+        sales_user_id = user.id if getattr(getattr(user, 'role', None), 'name', None) == 'sales' else None
+        rows = repository(self.session).stream_columns(columns, sales_user_id, batch_size, **criteria)
+        return columns, rows
+
+    def export(self, user, entity: str, fh: TextIO, fmt: str = "csv",
+               columns: Optional[list[str]] = None, batch_size: Optional[int] = None, **criteria) -> ExportResult:
+        start = time.perf_counter()
+        columns, rows = self.stream(user, entity, columns, batch_size, **criteria)
+        count = write_rows(fh, fmt, columns, rows)
+        return ExportResult(count, time.perf_counter() - start)
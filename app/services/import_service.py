@@ -0,0 +1,138 @@
+import csv
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from app.db.transaction import transactional
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+from sentry import traced_methods
+
+
+# enregistrements lus, validés et écrits (puis validés en base) par lot
+IMPORT_CHUNK_SIZE = 1000
+
+FORMATS = ("csv", "jsonl")
+_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# entité importable -> service exposant `bulk_create`
+IMPORT_SERVICES = {
+    "customers": CustomerService,
+    "contracts": ContractService,
+    "events": EventService,
+}
+
+
+@dataclass
+class ImportProgress:
+    """
+    Avancement d'un import. `offset` est le nombre d'enregistrements du fichier
+    déjà traités et validés en base : c'est la valeur à passer pour reprendre.
+    """
+    offset: int
+    read: int = 0
+    created: int = 0
+    rejected: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Enregistrements traités par seconde."""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def detect_format(path) -> str:
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Format non reconnu pour {path} (attendu : {', '.join(FORMATS)})")
+    return fmt
+
+
+def read_records(path, fmt: Optional[str] = None) -> Iterator[dict]:
+    """
+    Lit le fichier enregistrement par enregistrement (jamais en entier en mémoire).
+    CSV : la première ligne donne les noms de colonnes, une cellule vide vaut None.
+    JSONL : un objet JSON par ligne, les lignes vides sont ignorées.
+    Un enregistrement mal formé (valeur JSON qui n'est pas un objet, cellules CSV en trop
+    sous la clé None) est transmis tel quel : `bulk_create` le refuse seul (`as_record`).
+    """
+    fmt = fmt or detect_format(path)
+    with open(path, newline="", encoding="utf-8") as fh:
+        if fmt == "csv":
+            for row in csv.DictReader(fh):
+                yield {key: (value if value != "" else None) for key, value in row.items()}
+        elif fmt == "jsonl":
+            for number, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Ligne {number} : JSON invalide ({exc.msg})") from exc
+        else:
+            raise ValueError(f"Format inconnu : {fmt}")
+
+
+def batches(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+@traced_methods("service")
+class ImportService:
+    """
+    Import en flux de clients, contrats ou évènements.
+
+    Pipeline : lecture (`read_records`) -> lots de `chunk_size` enregistrements ->
+    `bulk_create` du service de l'entité (validation Pydantic, permissions et
+    références vérifiées par lot, INSERT multi-lignes) -> commit du lot.
+    Seul le lot courant est en mémoire. Chaque lot est validé en base avant de
+    lire le suivant : après une interruption, `offset` permet de reprendre
+    sans réimporter les lots déjà écrits.
+    """
+
+    def __init__(self, session, permission_service) -> None:
+        self.session = session
+        self.perm = permission_service
+
+    def import_records(
+        self,
+        user,
+        entity: str,
+        records: Iterable[dict],
+        offset: int = 0,
+        chunk_size: Optional[int] = None,
+        on_chunk: Optional[Callable[[ImportProgress], None]] = None,
+        on_error: Optional[Callable[[int, str], None]] = None,
+    ) -> ImportProgress:
+        """
+        Importe `records` (tous les enregistrements du fichier) à partir de l'enregistrement `offset`.
+        `on_error(position, message)` reçoit chaque enregistrement refusé (position depuis le début
+        du fichier, à partir de 0) ; `on_chunk(progress)` est appelé après chaque lot validé.
+        """
+        if entity not in IMPORT_SERVICES:
+            raise ValueError(f"Entité inconnue : {entity}")
+        service = IMPORT_SERVICES[entity](self.session, self.perm)
+        size = chunk_size or IMPORT_CHUNK_SIZE
+        progress = ImportProgress(offset=offset)
+        start = time.perf_counter()
+        for chunk in batches(itertools.islice(records, offset, None), size):
+            with transactional(self.session):
+                report = service.bulk_create(user, chunk, size)
+            for error in report.errors:
+                if on_error is not None:
+                    on_error(progress.offset + error.index, error.message)
+            progress.offset += len(chunk)
+            progress.read += len(chunk)
+            progress.created += report.created
+            progress.rejected += len(report.errors)
+            progress.elapsed = time.perf_counter() - start
+            if on_chunk is not None:
+                on_chunk(progress)
+        progress.elapsed = time.perf_counter() - start
+        return progress
@@ -1,12 +1,40 @@
-from typing import List
+from itertools import chain
+from typing import FrozenSet, List
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from app.models.permission import Permission
+from app.models.role import Role, role_permission
 
 
+# génération des permissions : incrémentée dès qu'un rôle ou une permission
+# est créé, modifié ou supprimé, ce qui invalide les caches des services
+_cache_state = {"generation": 0}
+
+
+def invalidate_permission_cache() -> None:
+    """Invalide les permissions mises en cache par toutes les instances de PermissionService."""
+    _cache_state["generation"] += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_role_changes(session, flush_context) -> None:
+    # dans after_flush, new/dirty/deleted reflètent encore l'état avant le flush
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Role, Permission)):
+            invalidate_permission_cache()
+            return
+
+
+# volontairement non tracé (comme dans `run --profile`) : plusieurs vérifications,
+# en cache, par appel de service ; un span chacune noierait les traces
 class PermissionService(Permission):
     """Service de gestion des permissions.
 
     Rôle : centraliser les vérifications de permissions basées sur le rôle
-    d'un utilisateur. Les permissions sont lues via `user.role.permissions`.
+    d'un utilisateur. Les permissions de chaque rôle sont lues une seule fois
+    (une requête pour tous les rôles) puis conservées sous forme de `frozenset`
+    de noms : chaque vérification est ensuite un test d'appartenance en O(1).
+    Le cache est invalidé dès qu'un rôle ou une permission change en base.
 
     Ce que la classe renvoie / fournit :
     - `user_has_permission(user, permission_name) -> bool` : indique si l'utilisateur
@@ -20,6 +48,9 @@ class PermissionService(Permission):
     def __init__(self, session):
         # initialisation du service avec la session DB
         self.session = session
+        # cache des permissions par rôle : role_id -> frozenset des noms de permission
+        self._role_permissions = {}
+        self._generation = _cache_state["generation"]
 
     def user_has_permission(self, user, permission_name: str) -> bool:
         """
@@ -30,12 +61,39 @@ class PermissionService(Permission):
         # vérifie que l'utilisateur est authentifié
         if not self._is_authenticated(user):
             return False
-        # parcourt les permissions associées au rôle de l'utilisateur
-        for permission in user.role.permissions:
-            # vérifie si le nom de la permission correspond à celui recherché
-            if permission.name == permission_name:
-                return True
-        return False
+        return permission_name in self.permissions_for(user)
+
+    def permissions_for(self, user) -> FrozenSet[str]:
+        """
+        Retourne l'ensemble des noms de permissions du rôle de l'utilisateur.
+        """
+        if self._generation != _cache_state["generation"]:
+            self._role_permissions = {}
+            self._generation = _cache_state["generation"]
+        role_id = getattr(user, 'role_id', None)
+        if role_id is not None:
+            if not self._role_permissions and self.session is not None:
+                self._role_permissions = self._load_role_permissions()
+            cached = self._role_permissions.get(role_id)
+            if cached is not None:
+                return cached
+        # rôle absent du cache (ou utilisateur sans role_id) : lecture via la relation
+        names = frozenset(permission.name for permission in user.role.permissions)
+        if role_id is not None:
+            self._role_permissions[role_id] = names
+        return names
+
+    def _load_role_permissions(self) -> dict:
+        # une seule requête pour précalculer les permissions de tous les rôles
+        rows = (
+            self.session.query(role_permission.c.role_id, Permission.name)
+            .join(Permission, Permission.id == role_permission.c.permission_id)
+            .all()
+        )
+        grouped = {}
+        for role_id, name in rows:
+            grouped.setdefault(role_id, set()).add(name)
+        return {role_id: frozenset(names) for role_id, names in grouped.items()}
 
     def _is_authenticated(self, user) -> bool:
         # vérifie que l'utilisateur n'est pas None et a un ID valide
@@ -0,0 +1,14 @@
+import datetime
+from decimal import Decimal
+
+
+def json_default(value):
+    """
+    `default` de `json.dumps` partagé par l'export JSONL et l'API :
+    Decimal -> chaîne (montants sans perte), date/datetime -> ISO 8601.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
@@ -1,13 +1,21 @@
 from app.repositories.user_repository import UserRepository
 from app.models.user import User
 from app.models.role import Role
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
 from app.services.auth_service import AuthService
-from pydantic import ValidationError
 from app.schemas.user import UserCreate, UserUpdate
+from app.db.errors import check_unique, constraint_error
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page
+from app.repositories.references import ensure_unreferenced
+from app.services.bulk import validate
+from sentry import traced_methods
 
 
+@traced_methods("service")
 class UserService:
     """Service de gestion des utilisateurs.
 
@@ -17,6 +25,23 @@ class UserService:
     hachage du mot de passe.
     """
 
+    # le rôle est affiché dans la liste comme dans l'écran de détail
+    LIST_LOAD = {"role": "joined"}
+    DETAIL_LOAD = {"role": "joined"}
+
+    # champs soumis à une contrainte d'unicité et message associé
+    UNIQUE_FIELDS = {
+        'username': 'Nom d\'utilisateur déjà utilisé',
+        'email': 'Email déjà utilisé',
+        'phone_number': 'Numéro de téléphone déjà utilisé',
+    }
+    # lignes qui empêchent la suppression d'un utilisateur (cf. `ensure_unreferenced`)
+    DELETE_REFERENCES = (
+        ("contrat(s)", Contract.user_management_id),
+        ("évènement(s)", Event.user_support_id),
+        ("client(s)", Customer.user_sales_id),
+    )
+
     def __init__(self, session, permission_service) -> None:
         # initialisation du service avec la session DB et le service de permissions
         self.session = session
@@ -29,15 +54,10 @@ class UserService:
         if not self.perm.user_has_permission(current_user, 'user:create'):
             raise PermissionError('Permission refusée')
         # valide les champs fournis via la couche Pydantic
-        try:
-            validated = UserCreate(**fields).model_dump()
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides: {messages}") from exc
+        validated = validate(UserCreate, fields)
         validated = self._normalize(validated)
         self._ensure_role_exists(validated.get('role_id'))
-        self._check_uniqueness(validated)
+        check_unique(self.session, User, self.UNIQUE_FIELDS, validated)
         self._hash_password_if_present(validated)
 
         # appel à la couche repository afin de créer l'utilisateur en base
@@ -47,7 +67,7 @@ class UserService:
             # si un élément en base viole une contrainte (doublon, FK invalide),
             # rollback de la session càd annulation de la transaction en cours
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (doublon possible)') from exc
+            raise self._constraint_error(exc) from exc
 
     def update(self, current_user, user_id: int, **fields) -> User:
         if not self.perm.user_has_permission(current_user, 'user:update'):
@@ -58,16 +78,11 @@ class UserService:
             raise ValueError('Utilisateur introuvable')
         
         # valide les champs fournis via Pydantic
-        try:
-            validated = UserUpdate(**fields).model_dump(exclude_none=True)
-        except ValidationError as exc:
-            errors = exc.errors()
-            messages = "; ".join(f"{'.'.join(map(str, e.get('loc', [])))}: {e.get('msg')}" for e in errors)
-            raise ValueError(f"Données invalides: {messages}") from exc
+        validated = validate(UserUpdate, fields, exclude_none=True)
         validated = self._normalize(validated)
         if 'role_id' in validated:
             self._ensure_role_exists(validated.get('role_id'))
-        self._check_uniqueness(validated, exclude_user_id=u.id)
+        check_unique(self.session, User, self.UNIQUE_FIELDS, validated, exclude_id=u.id)
         self._hash_password_if_present(validated)
 
         # appelle la couche repository pour mettre à jour l'utilisateur en base
@@ -75,7 +90,7 @@ class UserService:
             return self.repo.update(u, **validated)
         except IntegrityError as exc:
             self.session.rollback()
-            raise ValueError('Violation de contrainte en base (doublon possible)') from exc
+            raise self._constraint_error(exc) from exc
 
     # ----- helpers -----
     def _normalize(self, validated: dict) -> dict:
@@ -93,21 +108,10 @@ class UserService:
         if not role:
             raise ValueError('Role introuvable')
 
-    def _check_uniqueness(self, validated: dict, exclude_user_id: Optional[int] = None) -> None:
-        from app.models.user import User as UserModel
-        if 'username' in validated:
-            other = self.repo.get_by_username(validated['username'])
-            if other and (exclude_user_id is None or other.id != exclude_user_id):
-                raise ValueError('Nom d\'utilisateur déjà utilisé')
-        if 'email' in validated and validated.get('email'):
-            other = self.session.query(UserModel).filter(UserModel.email == validated.get('email')).one_or_none()
-            if other and (exclude_user_id is None or other.id != exclude_user_id):
-                raise ValueError('Email déjà utilisé')
-        if 'phone_number' in validated and validated.get('phone_number'):
-            other = self.session.query(UserModel).filter(UserModel.phone_number == validated.get('phone_number')).one_or_none()
-            if other and (exclude_user_id is None or other.id != exclude_user_id):
-                raise ValueError('Numéro de téléphone déjà utilisé')
-            
+    def _constraint_error(self, exc: IntegrityError) -> ValueError:
+        # traduit la violation d'unicité levée par la base en message par champ
+        return constraint_error(exc, self.UNIQUE_FIELDS)
+
     def _hash_password_if_present(self, validated: dict) -> None:
         if 'password' in validated:
             validated['password_hash'] = self.auth.hash_password(validated.pop('password'))
@@ -121,26 +125,8 @@ class UserService:
         if not u:
             raise ValueError('Utilisateur introuvable')
         # vérifie que l'utilisateur n'est pas référencé sur des contrats, évènements ou clients
-        from app.models.contract import Contract
-        from app.models.event import Event
-        from app.models.customer import Customer
-
-        contracts_count = self.session.query(Contract).filter(Contract.user_management_id == user_id).count()
-        events_count = self.session.query(Event).filter(Event.user_support_id == user_id).count()
-        customers_count = self.session.query(Customer).filter(Customer.user_sales_id == user_id).count()
-
-        total_refs = contracts_count + events_count + customers_count
-        if total_refs > 0:
-            parts = []
-            if contracts_count:
-                parts.append(f"{contracts_count} contrat(s)")
-            if events_count:
-                parts.append(f"{events_count} évènement(s)")
-            if customers_count:
-                parts.append(f"{customers_count} client(s)")
-            raise ValueError(
-                "Impossible de supprimer l'utilisateur : il est référencé par " + ", ".join(parts) + "."
-            )
+        ensure_unreferenced(self.session, self.DELETE_REFERENCES, user_id,
+                            "Impossible de supprimer l'utilisateur : il est référencé par")
 
         try:
             self.repo.delete(u)
@@ -152,7 +138,12 @@ class UserService:
     def list_all(self, user) -> list[User]:
         if not self.perm.user_has_permission(user, 'user:read'):
             raise PermissionError('Permission refusée')
-        return self.repo.list_all()
+        return self.repo.list_all(load=self.LIST_LOAD)
+
+    def list_page(self, user, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page[User]:
+        if not self.perm.user_has_permission(user, 'user:read'):
+            raise PermissionError('Permission refusée')
+        return self.repo.list_page(after_id, limit, load=self.LIST_LOAD)
 
     def get_by_id(self, user, user_id: int) -> User:
         if not self.perm.user_has_permission(user, 'user:read'):
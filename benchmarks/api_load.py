@@ -0,0 +1,146 @@
+"""
+Test de charge de l'API HTTP/JSON (`api.wsgi`) sur une base SQLite locale.
+
+Le serveur (`ThreadingWSGIServer`, un fil par requête) est lancé dans le
+processus sur un port libre, au-dessus de la base de benchmark remplie par
+`benchmarks.datagen`. `concurrency` clients HTTP (un fil chacun) envoient
+`requests` requêtes `GET` authentifiées (token JWT par utilisateur) en
+alternant listes paginées et détails. Deux modes sont mesurés :
+- `full` : chaque réponse est recalculée et renvoyée entièrement ;
+- `conditional` : le client renvoie l'`ETag` déjà reçu (`If-None-Match`) et
+    obtient `304 Not Modified` sans corps tant que les données n'ont pas changé.
+
+Usage :
+    python -m benchmarks.api_load --requests 1000 --concurrency 16
+    python -m benchmarks.api_load --backend sqlite --output api.json
+"""
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from api.wsgi import ApiApplication, make_api_server
+from app.db.session import create_engine_and_session, drop_memory_database
+from app.models.base import Base
+from app.services.auth_service import AuthService, check_jwt_config
+from benchmarks.datagen import Scale, generate
+from benchmarks.stats import summarize
+
+BENCH_DB_NAME = "epic_benchmarks"
+MODES = ("full", "conditional")
+
+# chemins parcourus par les clients, comme des écrans de liste puis de détail
+PATHS = ("/customers?limit=50", "/contracts?limit=50", "/events?limit=50", "/customers/1", "/contracts/1")
+
+
+def run_clients(port: int, tokens: list[str], requests: int, concurrency: int, conditional: bool) -> dict:
+    """Envoie `requests` requêtes depuis `concurrency` fils ; débit, latences et statuts."""
+    # ETag mémorisé par couple token/chemin, partagé par les fils : un cache par utilisateur
+    etags = {}
+    statuses = {}
+    lock = threading.Lock()
+
+    def request(n: int) -> float:
+        token = tokens[n % len(tokens)]
+        path = PATHS[n % len(PATHS)]
+        headers = {"Authorization": f"Bearer {token}"}
+        with lock:
+            etag = etags.get((token, path)) if conditional else None
+        if etag:
+            headers["If-None-Match"] = etag
+        start = time.perf_counter()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        elapsed = time.perf_counter() - start
+        with lock:
+            if response.getheader("ETag"):
+                etags[(token, path)] = response.getheader("ETag")
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+        return elapsed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        latencies = list(clients.map(request, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "conditional" if conditional else "full",
+        "concurrency": concurrency,
+        "requests": requests,
+        "requests_per_s": requests / elapsed if elapsed else 0.0,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "latency": summarize(latencies),
+    }
+
+
+def run_load(scale: Scale, backend: str = "sqlite", requests: int = 500, concurrency: int = 16,
+             modes=MODES, seed: int = 0) -> dict:
+    """
+    Crée et remplit la base de benchmark, démarre l'API sur un port libre puis
+    mesure chaque mode ; retourne débit (requêtes/s), statuts HTTP et latences.
+    Lève RuntimeError si la configuration JWT (JWT_SECRET, JWT_ALGORITHM) manque.
+    """
+    check_jwt_config()
+    engine, SessionLocal = create_engine_and_session(BENCH_DB_NAME, backend)
+    server = None
+    try:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with SessionLocal() as session:
+            dataset = generate(session, scale, seed)
+        auth = AuthService()
+        # tokens émis directement : la connexion (Argon2) a son propre benchmark
+        tokens = [auth.create_token(user_id) for ids in dataset.users.values() for user_id in ids]
+
+        server = make_api_server("127.0.0.1", 0, ApiApplication(SessionLocal, auth), quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        results = [run_clients(server.server_port, tokens, requests, concurrency, mode == "conditional")
+                   for mode in modes]
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if backend == "sqlite-memory":
+            drop_memory_database(BENCH_DB_NAME)
+    return {"backend": backend, "dataset": dataset.summary(), "results": results}
+
+
+@click.command()
+@click.option('--backend', type=click.Choice(["sqlite", "sqlite-memory", "mysql"]), default="sqlite",
+              show_default=True, help=f'Moteur de la base de benchmark ({BENCH_DB_NAME}).')
+@click.option('--modes', default=','.join(MODES), show_default=True, help='Modes à comparer.')
+@click.option('--requests', default=500, show_default=True, help='Requêtes HTTP envoyées par mode.')
+@click.option('--concurrency', default=16, show_default=True, help='Clients HTTP simultanés.')
+@click.option('--customers-per-sales', default=Scale.customers_per_sales, show_default=True)
+@click.option('--seed', 'seed_value', default=0, show_default=True, help='Graine du générateur de données.')
+@click.option('--output', type=click.Path(dir_okay=False), default=None, help='Fichier JSON de résultats.')
+def main(backend, modes, requests, concurrency, customers_per_sales, seed_value, output):
+    """Mesurer le débit et la latence de l'API HTTP sous charge concurrente"""
+    selected = [m.strip() for m in modes.split(',') if m.strip()]
+    unknown = [m for m in selected if m not in MODES]
+    if unknown:
+        raise click.BadParameter(f"mode(s) inconnu(s) : {', '.join(unknown)}", param_hint="--modes")
+    report = run_load(Scale(customers_per_sales=customers_per_sales), backend, requests, concurrency,
+                      selected, seed_value)
+    click.echo(f"Données : {report['dataset']}")
+    for r in report["results"]:
+        latency = r["latency"]
+        statuses = ", ".join(f"{code}: {count}" for code, count in r["statuses"].items())
+        click.echo(
+            f"{r['mode']:>12} x{r['concurrency']:<3} : {r['requests_per_s']:8.1f} requêtes/s  "
+            f"p50={latency['p50_ms']:.1f} ms  p99={latency['p99_ms']:.1f} ms  ({statuses})"
+        )
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark du débit de requêtes concurrentes : chemin synchrone (pymysql / sqlite3)
+contre couche asyncio (`AsyncSession`, aiomysql / aiosqlite).
+
+Une « requête » ouvre une session, charge l'utilisateur (rôle préchargé) puis
+appelle `EventService.list_page` et `ContractService.list_page`, comme un écran
+de liste. Trois modes sont mesurés :
+- `sync` : requêtes traitées l'une après l'autre (un seul fil, comme la CLI) ;
+- `sync-threads` : `concurrency` fils, une session synchrone par fil ;
+- `async` : `concurrency` tâches asyncio sur une seule boucle, une `AsyncSession` par tâche.
+
+Usage :
+    python -m benchmarks.async_throughput --backend mysql --requests 500 --concurrency 32
+    python -m benchmarks.async_throughput --modes sync,async --output async.json
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from app.db.async_session import dispose_async_engines, get_async_session
+from app.db.session import create_engine_and_session, drop_memory_database
+from app.models.base import Base
+from app.models.user import User
+from app.repositories.async_repositories import AsyncUserRepository
+from app.repositories.loading import load_options
+from app.services.async_services import AsyncContractService, AsyncEventService
+from app.services.contract_service import ContractService
+from app.services.event_service import EventService
+from app.services.permission_service import PermissionService
+from benchmarks.datagen import Scale, generate
+from benchmarks.stats import summarize
+
+BENCH_DB_NAME = "epic_benchmarks"
+MODES = ("sync", "sync-threads", "async")
+
+# utilisateur chargé au début de chaque requête, comme une session restaurée
+_USER_LOAD = {"role": "joined"}
+
+
+def sync_request(SessionLocal, user_id: int) -> int:
+    with SessionLocal() as session:
+        user = session.get(User, user_id, options=load_options(User, _USER_LOAD))
+        perm = PermissionService(session)
+        events = EventService(session, perm).list_page(user)
+        contracts = ContractService(session, perm).list_page(user)
+        return len(events.items) + len(contracts.items)
+
+
+async def async_request(db_name: str, backend: str, user_id: int) -> int:
+    async with get_async_session(db_name, backend) as session:
+        user = await AsyncUserRepository(session).get_by_id(user_id, load=_USER_LOAD)
+        events = await AsyncEventService(session).list_page(user)
+        contracts = await AsyncContractService(session).list_page(user)
+        return len(events.items) + len(contracts.items)
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_sync(SessionLocal, user_ids: list[int], concurrency: int) -> tuple[list[float], float]:
+    start = time.perf_counter()
+    if concurrency <= 1:
+        latencies = [_timed(sync_request, SessionLocal, user_id) for user_id in user_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            latencies = list(clients.map(lambda user_id: _timed(sync_request, SessionLocal, user_id), user_ids))
+    return latencies, time.perf_counter() - start
+
+
+async def run_async(db_name: str, backend: str, user_ids: list[int], concurrency: int) -> tuple[list[float], float]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def timed(user_id: int) -> float:
+        async with slots:
+            start = time.perf_counter()
+            await async_request(db_name, backend, user_id)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(timed(user_id) for user_id in user_ids))
+    elapsed = time.perf_counter() - start
+    await dispose_async_engines()
+    return list(latencies), elapsed
+
+
+def run_throughput(scale: Scale, backend: str = "sqlite-memory", requests: int = 200, concurrency: int = 16,
+                   modes=MODES, seed: int = 0) -> dict:
+    """
+    Crée et remplit la base de benchmark, puis traite `requests` requêtes dans
+    chaque mode ; retourne débit (requêtes/s) et latences par mode.
+    """
+    engine, SessionLocal = create_engine_and_session(BENCH_DB_NAME, backend)
+    try:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with SessionLocal() as session:
+            dataset = generate(session, scale, seed)
+        # les requêtes alternent entre gestionnaires, commerciaux et supports
+        users = [user_id for ids in dataset.users.values() for user_id in ids]
+        user_ids = [users[n % len(users)] for n in range(requests)]
+
+        results = []
+        for mode in modes:
+            if mode == "async":
+                latencies, elapsed = asyncio.run(run_async(BENCH_DB_NAME, backend, user_ids, concurrency))
+            else:
+                latencies, elapsed = run_sync(SessionLocal, user_ids, concurrency if mode == "sync-threads" else 1)
+            results.append({
+                "mode": mode,
+                "concurrency": 1 if mode == "sync" else concurrency,
+                "requests": requests,
+                "requests_per_s": requests / elapsed if elapsed else 0.0,
+                "latency": summarize(latencies),
+            })
+    finally:
+        if backend == "sqlite-memory":
+            drop_memory_database(BENCH_DB_NAME)
+    return {"backend": backend, "dataset": dataset.summary(), "results": results}
+
+
+@click.command()
+@click.option('--backend', type=click.Choice(["sqlite-memory", "sqlite", "mysql"]), default="sqlite-memory",
+              show_default=True, help=f'Moteur de la base de benchmark ({BENCH_DB_NAME}).')
+@click.option('--modes', default=','.join(MODES), show_default=True, help='Modes à comparer.')
+@click.option('--requests', default=200, show_default=True, help='Requêtes traitées par mode.')
+@click.option('--concurrency', default=16, show_default=True, help='Requêtes simultanées (fils ou tâches).')
+@click.option('--customers-per-sales', default=Scale.customers_per_sales, show_default=True)
+@click.option('--seed', 'seed_value', default=0, show_default=True, help='Graine du générateur de données.')
+@click.option('--output', type=click.Path(dir_okay=False), default=None, help='Fichier JSON de résultats.')
+def main(backend, modes, requests, concurrency, customers_per_sales, seed_value, output):
+    """Comparer le débit de requêtes concurrentes des chemins synchrone et asyncio"""
+    selected = [m.strip() for m in modes.split(',') if m.strip()]
+    unknown = [m for m in selected if m not in MODES]
+    if unknown:
+        raise click.BadParameter(f"mode(s) inconnu(s) : {', '.join(unknown)}", param_hint="--modes")
+    report = run_throughput(Scale(customers_per_sales=customers_per_sales), backend, requests, concurrency,
+                            selected, seed_value)
+    click.echo(f"Données : {report['dataset']}")
+    for r in report["results"]:
+        latency = r["latency"]
+        click.echo(
+            f"{r['mode']:>12} x{r['concurrency']:<3} : {r['requests_per_s']:8.1f} requêtes/s  "
+            f"p50={latency['p50_ms']:.1f} ms  p99={latency['p99_ms']:.1f} ms"
+        )
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
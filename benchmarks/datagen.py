@@ -0,0 +1,205 @@
+"""
+Générateur de données synthétiques pour les benchmarks.
+
+Le volume est décrit par une `Scale` : nombre d'utilisateurs par rôle, de clients
+par commercial, de contrats par client et d'évènements par contrat. Les lignes
+sont insérées par lots (`INSERT ... VALUES` multiples) et le tirage est
+déterministe pour une graine donnée, afin que deux exécutions soient comparables.
+
+Usage :
+    python -m benchmarks.datagen --customers-per-sales 200
+"""
+import datetime
+import random
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+
+import click
+from sqlalchemy import func, insert
+
+from app.db.init_db import init_schema
+from app.db.session import create_engine_and_session
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.permission import Permission
+from app.models.role import Role, role_permission
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+# mot de passe commun à tous les comptes générés
+PASSWORD = "password"
+
+_CITIES = ("Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Nice", "Toulouse")
+
+_PERMISSIONS = [f"{entity}:{action}" for entity in ("user", "customer", "contract", "event")
+                for action in ("create", "read", "update", "delete")]
+# permissions accordées par rôle, comme dans `app.db.init_db.seed`
+_ROLE_PERMISSIONS = {
+    "management": ["user:create", "user:read", "user:update", "user:delete",
+                   "contract:create", "contract:read", "contract:update", "contract:delete",
+                   "customer:read", "event:read", "event:update"],
+    "sales": ["customer:create", "customer:read", "customer:update", "customer:delete",
+              "contract:read", "contract:update", "event:create", "event:read", "event:delete"],
+    "support": ["customer:read", "contract:read", "event:read", "event:update"],
+}
+
+
+@dataclass
+class Scale:
+    """Volume de données à générer."""
+    managers: int = 2
+    sales: int = 5
+    support: int = 3
+    customers_per_sales: int = 20
+    contracts_per_customer: int = 3
+    events_per_contract: int = 2
+    # part des évènements sans support assigné
+    unassigned_ratio: float = 0.3
+
+    @property
+    def total_rows(self) -> int:
+        customers = self.sales * self.customers_per_sales
+        contracts = customers * self.contracts_per_customer
+        return self.managers + self.sales + self.support + customers + contracts + contracts * self.events_per_contract
+
+
+@dataclass
+class Dataset:
+    """Identifiants générés, par rôle et par entité, pour construire les cas de benchmark."""
+    scale: Scale
+    users: dict = field(default_factory=dict)
+    customer_ids: list = field(default_factory=list)
+    contract_ids: list = field(default_factory=list)
+    event_ids: list = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "scale": asdict(self.scale),
+            "users": sum(len(ids) for ids in self.users.values()),
+            "customers": len(self.customer_ids),
+            "contracts": len(self.contract_ids),
+            "events": len(self.event_ids),
+        }
+
+
+def _insert(session, model, rows: list[dict], batch_size: int = 1000) -> list[int]:
+    """Insère `rows` par lots et retourne les identifiants créés (dans l'ordre)."""
+    if not rows:
+        return []
+    if session.get_bind().dialect.insert_executemany_returning:
+        ids = []
+        for start in range(0, len(rows), batch_size):
+            result = session.execute(insert(model).returning(model.id), rows[start:start + batch_size])
+            ids.extend(result.scalars().all())
+        return ids
+    # MySQL : pas de RETURNING, on relit les identifiants attribués (base dédiée, un seul écrivain)
+    before = session.query(func.max(model.id)).scalar() or 0
+    for start in range(0, len(rows), batch_size):
+        session.execute(insert(model), rows[start:start + batch_size])
+    return [row_id for (row_id,) in session.query(model.id).filter(model.id > before).order_by(model.id)]
+
+
+def generate(session, scale: Scale, seed: int = 0) -> Dataset:
+    """
+    Remplit une base vide (schéma déjà créé) selon `scale` et valide la transaction.
+    Le mot de passe de tous les comptes est `PASSWORD`, haché avec le profil Argon2 `test`.
+    """
+    rng = random.Random(seed)
+    dataset = Dataset(scale=scale)
+    now = datetime.datetime(2026, 1, 1, 9, 0)
+
+    roles = {name: Role(name=name) for name in _ROLE_PERMISSIONS}
+    permissions = {name: Permission(name=name) for name in _PERMISSIONS}
+    session.add_all([*roles.values(), *permissions.values()])
+    session.flush()
+    session.execute(insert(role_permission), [
+        {"role_id": roles[role].id, "permission_id": permissions[name].id}
+        for role, names in _ROLE_PERMISSIONS.items() for name in names
+    ])
+
+    password_hash = AuthService(profile="test").hash_password(PASSWORD)
+    counts = {"management": scale.managers, "sales": scale.sales, "support": scale.support}
+    for role, count in counts.items():
+        rows = [{
+            "role_id": roles[role].id,
+            "user_first_name": role.capitalize(),
+            "user_last_name": str(i),
+            "email": f"{role}{i}@bench.local",
+            "phone_number": f"0{len(role)}{i:08d}",
+            "username": f"{role}{i}",
+            "password_hash": password_hash,
+        } for i in range(count)]
+        dataset.users[role] = _insert(session, User, rows)
+
+    customer_rows = []
+    for sales_id in dataset.users["sales"]:
+        for i in range(scale.customers_per_sales):
+            n = len(customer_rows)
+            customer_rows.append({
+                "user_sales_id": sales_id,
+                "customer_first_name": "Client",
+                "customer_last_name": str(n),
+                "email": f"client{n}@bench.local",
+                "phone_number": f"09{n:08d}",
+                "company_name": f"Société {n}",
+            })
+    dataset.customer_ids = _insert(session, Customer, customer_rows)
+
+    contract_rows = []
+    for customer_id in dataset.customer_ids:
+        for rank in range(scale.contracts_per_customer):
+            total = Decimal(rng.randrange(500, 20000))
+            contract_rows.append({
+                "customer_id": customer_id,
+                "user_management_id": rng.choice(dataset.users["management"]),
+                "total_amount": total,
+                "balance_due": rng.choice((Decimal(0), total, total / 2)),
+                # premier contrat de chaque client signé : les évènements y sont rattachables
+                "signed": rng.random() < 0.7 or rank == 0,
+            })
+    dataset.contract_ids = _insert(session, Contract, contract_rows)
+
+    event_rows = []
+    for contract_id, contract in zip(dataset.contract_ids, contract_rows):
+        for _ in range(scale.events_per_contract):
+            start = now + datetime.timedelta(days=rng.randrange(0, 365), hours=rng.randrange(0, 12))
+            support = None
+            if dataset.users["support"] and rng.random() >= scale.unassigned_ratio:
+                support = rng.choice(dataset.users["support"])
+            event_rows.append({
+                "contract_id": contract_id,
+                "customer_id": contract["customer_id"],
+                "user_support_id": support,
+                "event_name": f"Évènement {len(event_rows)}",
+                "start_datetime": start,
+                "end_datetime": start + datetime.timedelta(hours=rng.randrange(1, 8)),
+                "location": rng.choice(_CITIES),
+                "attendees": rng.randrange(10, 500),
+            })
+    dataset.event_ids = _insert(session, Event, event_rows)
+
+    session.commit()
+    return dataset
+
+
+@click.command()
+@click.option('--managers', default=Scale.managers, show_default=True)
+@click.option('--sales', default=Scale.sales, show_default=True)
+@click.option('--support', default=Scale.support, show_default=True)
+@click.option('--customers-per-sales', default=Scale.customers_per_sales, show_default=True)
+@click.option('--contracts-per-customer', default=Scale.contracts_per_customer, show_default=True)
+@click.option('--events-per-contract', default=Scale.events_per_contract, show_default=True)
+@click.option('--seed', 'seed_value', default=0, show_default=True, help='Graine du tirage aléatoire.')
+def main(managers, sales, support, customers_per_sales, contracts_per_customer, events_per_contract, seed_value):
+    """Réinitialiser la base configurée et la remplir de données synthétiques"""
+    scale = Scale(managers, sales, support, customers_per_sales, contracts_per_customer, events_per_contract)
+    init_schema()
+    _, SessionLocal = create_engine_and_session()
+    with SessionLocal() as session:
+        dataset = generate(session, scale, seed_value)
+    click.echo(dataset.summary())
+
+
+if __name__ == "__main__":
+    main()
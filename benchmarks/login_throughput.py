@@ -0,0 +1,71 @@
+"""
+Benchmark du débit de connexion : vérifications Argon2 concurrentes via
+`AuthService.submit_verify_password`, pour chaque profil de coût.
+
+Usage :
+    python -m benchmarks.login_throughput --logins 200 --concurrency 16
+    python -m benchmarks.login_throughput --profiles seed,default --workers 4
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from app.services import auth_service as auth_module
+from app.services.auth_service import AuthService, HASH_PROFILES
+from benchmarks.stats import summarize
+
+
+def run_profile(profile: str, logins: int, concurrency: int) -> dict:
+    """
+    Simule `logins` connexions émises par `concurrency` clients et mesure
+    le débit (connexions/s) et la latence de bout en bout de chaque vérification.
+    """
+    auth = AuthService(profile=profile)
+    hashed = auth.hash_password("password")
+
+    def login(_):
+        start = time.perf_counter()
+        ok = auth.submit_verify_password(hashed, "password").result()
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        results = list(clients.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    latencies = [duration for _, duration in results]
+    return {
+        "profile": profile,
+        "params": HASH_PROFILES[profile],
+        "logins": logins,
+        "concurrency": concurrency,
+        "verify_workers": auth_module.AUTH_VERIFY_WORKERS,
+        "failures": sum(1 for ok, _ in results if not ok),
+        "logins_per_s": logins / elapsed if elapsed else 0.0,
+        "latency": summarize(latencies),
+    }
+
+
+@click.command()
+@click.option('--profiles', default=','.join(HASH_PROFILES), show_default=True, help='Profils Argon2 à comparer.')
+@click.option('--logins', default=100, show_default=True, help='Nombre de connexions simulées par profil.')
+@click.option('--concurrency', default=8, show_default=True, help='Nombre de clients simultanés.')
+@click.option('--output', type=click.Path(dir_okay=False), default=None, help='Fichier JSON de résultats.')
+def main(profiles, logins, concurrency, output):
+    """Mesurer le débit de connexion et la latence p99 par profil Argon2"""
+    # les clients simultanés ne doivent pas dépasser la file d'attente autorisée
+    concurrency = min(concurrency, auth_module.AUTH_VERIFY_MAX_PENDING)
+    results = [run_profile(p.strip(), logins, concurrency) for p in profiles.split(',') if p.strip()]
+    for r in results:
+        click.echo(
+            f"{r['profile']:>8} : {r['logins_per_s']:8.1f} connexions/s  "
+            f"p50={r['latency']['p50_ms']:.1f} ms  p99={r['latency']['p99_ms']:.1f} ms"
+        )
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""
+Benchmark des repositories et des services sur des données synthétiques.
+
+Chaque cas appelle une méthode d'un `*Repository` ou d'un `*Service` dans une
+session neuve (annulée en fin d'itération : les écritures ne s'accumulent pas)
+et mesure la latence (p50/p95/p99), le nombre de requêtes SQL émises
+(`count_queries`), le nombre de lignes retournées et le pic mémoire Python
+(tracemalloc, itération dédiée).
+
+Chaque méthode publique des classes de `BENCHMARKED_CLASSES` a au moins un cas
+(lectures, écritures, suppressions, `AuthService`) ; `uncovered_methods` signale
+celles qui n'en ont pas. Exclusions (`EXCLUDED`) :
+- `AuthService.verify_password_async` : simple attente de `submit_verify_password` ;
+- `EventService.list_mine` : conservée pour compatibilité, retourne une liste vide ;
+- `ImportService.import_records` : valide une transaction par lot, ce qui modifierait
+    la base de benchmark ; son coût est celui de `CustomerService.bulk_create`.
+
+Usage :
+    python -m benchmarks.repositories --customers-per-sales 200 --output bench.json
+    python -m benchmarks.repositories --backend sqlite --filter EventRepository
+"""
+import datetime
+import inspect
+import io
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable, Optional
+
+import click
+
+from app.db.instrumentation import count_queries
+from app.db.session import create_engine_and_session, drop_memory_database
+from app.models.base import Base
+from app.models.user import User
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.event_repository import EventRepository
+from app.repositories.pagination import Page
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+from app.services.permission_service import PermissionService
+from app.services.user_service import UserService
+from benchmarks.datagen import Dataset, Scale, generate
+from benchmarks.stats import summarize
+
+BENCH_DB_NAME = "epic_benchmarks"
+
+
+@dataclass
+class Context:
+    """Session de l'itération en cours, données générées et utilisateurs par rôle."""
+    session: object
+    dataset: Dataset
+    perm: PermissionService
+    users: dict
+    # résultat de `Case.setup` pour l'itération en cours
+    prepared: object = None
+
+    def first(self, role: str) -> int:
+        return self.dataset.users[role][0]
+
+
+@dataclass
+class Case:
+    """
+    Cas mesuré : `run(ctx)` est chronométré ; `setup(ctx)`, s'il est fourni,
+    s'exécute avant la mesure (hors durée et hors requêtes comptées) et son
+    résultat est disponible dans `ctx.prepared` (par ex. la ligne à supprimer).
+    """
+    name: str
+    run: Callable[[Context], object]
+    setup: Optional[Callable[[Context], object]] = None
+
+    @property
+    def method(self) -> str:
+        # "Classe.méthode[variante]" -> "Classe.méthode"
+        return self.name.split("[", 1)[0]
+
+
+# classes dont chaque méthode publique doit avoir au moins un cas (cf. `uncovered_methods`)
+BENCHMARKED_CLASSES = (
+    UserRepository, CustomerRepository, ContractRepository, EventRepository,
+    UserService, CustomerService, ContractService, EventService,
+    PermissionService, AuthService, ExportService, ImportService,
+)
+
+# méthodes volontairement non mesurées, avec la raison
+EXCLUDED = {
+    "AuthService.verify_password_async": "attend `submit_verify_password`, mesurée directement",
+    "EventService.list_mine": "conservée pour compatibilité, retourne toujours une liste vide",
+    "ImportService.import_records": "valide une transaction par lot (la base de benchmark serait modifiée) ; "
+                                    "son coût est celui de `CustomerService.bulk_create`",
+}
+
+_PASSWORD = "password-bench"
+
+
+def _sales_customer_ids(ctx: Context) -> list[int]:
+    per_sales = ctx.dataset.scale.customers_per_sales
+    return ctx.dataset.customer_ids[:per_sales]
+
+
+def _customer_fields(ctx: Context, n: int = 0) -> dict:
+    return {"user_sales_id": ctx.first("sales"), "customer_first_name": "Bench", "customer_last_name": "Bench",
+            "email": f"bench{n}@example.com", "phone_number": f"00{n:08d}", "company_name": f"Bench {n}"}
+
+
+def _contract_fields(ctx: Context) -> dict:
+    return {"customer_id": ctx.dataset.customer_ids[0], "user_management_id": ctx.first("management"),
+            "total_amount": Decimal("1000"), "balance_due": Decimal("500"), "signed": True}
+
+
+def _event_fields(ctx: Context, n: int = 0) -> dict:
+    # premier contrat (signé) du premier client, dates dans le futur (validées par `EventCreate`)
+    start = datetime.datetime.now() + datetime.timedelta(days=30)
+    return {"contract_id": ctx.dataset.contract_ids[0], "customer_id": ctx.dataset.customer_ids[0],
+            "event_name": f"Bench {n}", "start_datetime": start, "end_datetime": start + datetime.timedelta(hours=2),
+            "location": "Paris", "attendees": 10}
+
+
+def _user_fields(ctx: Context, n: int = 0) -> dict:
+    return {"role_id": ctx.users["support"].role_id, "user_first_name": "Bench", "user_last_name": "Bench",
+            "email": f"benchuser{n}@example.com", "phone_number": f"01{n:08d}", "username": f"benchuser{n}"}
+
+
+def _new(repo_class, fields: Callable[[Context], dict]) -> Callable[[Context], object]:
+    # crée (flush) une ligne sans dépendance, supprimée ensuite par le cas mesuré
+    return lambda c: repo_class(c.session).create(**fields(c))
+
+
+def _bulk(fields: Callable[[Context, int], dict], size: int = 20) -> Callable[[Context], list]:
+    return lambda c: [fields(c, n) for n in range(size)]
+
+
+def build_cases() -> list[Case]:
+    """Cas mesurés : au moins un par méthode publique de `BENCHMARKED_CLASSES` (hors `EXCLUDED`)."""
+    repo_cases = [
+        Case("UserRepository.get_by_id", lambda c: UserRepository(c.session).get_by_id(c.first("sales"))),
+        Case("UserRepository.get_by_username", lambda c: UserRepository(c.session).get_by_username("sales0")),
+        Case("UserRepository.get_summary", lambda c: UserRepository(c.session).get_summary(c.first("sales"))),
+        Case("UserRepository.list_all", lambda c: UserRepository(c.session).list_all()),
+        Case("UserRepository.list_page", lambda c: UserRepository(c.session).list_page()),
+        Case("UserRepository.create", lambda c: UserRepository(c.session).create(
+            **_user_fields(c), password_hash="hash")),
+        Case("UserRepository.update", lambda c: UserRepository(c.session).update(
+            UserRepository(c.session).get_by_id(c.first("support")), user_first_name="Bench")),
+        Case("UserRepository.delete", lambda c: UserRepository(c.session).delete(c.prepared),
+             setup=_new(UserRepository, lambda c: dict(_user_fields(c), password_hash="hash"))),
+        Case("CustomerRepository.get_by_id", lambda c: CustomerRepository(c.session).get_by_id(c.dataset.customer_ids[0])),
+        Case("CustomerRepository.list_by_ids",
+             lambda c: CustomerRepository(c.session).list_by_ids(_sales_customer_ids(c))),
+        Case("CustomerRepository.list_all", lambda c: CustomerRepository(c.session).list_all()),
+        Case("CustomerRepository.list_page", lambda c: CustomerRepository(c.session).list_page()),
+        Case("CustomerRepository.list_by_sales_user",
+             lambda c: CustomerRepository(c.session).list_by_sales_user(c.first("sales"))),
+        Case("CustomerRepository.stream_columns", lambda c: list(CustomerRepository(c.session).stream_columns())),
+        Case("CustomerRepository.create", lambda c: CustomerRepository(c.session).create(**_customer_fields(c))),
+        Case("CustomerRepository.update", lambda c: CustomerRepository(c.session).update(
+            CustomerRepository(c.session).get_by_id(c.dataset.customer_ids[0]), customer_first_name="Bench")),
+        Case("CustomerRepository.delete", lambda c: CustomerRepository(c.session).delete(c.prepared),
+             setup=_new(CustomerRepository, _customer_fields)),
+        Case("CustomerRepository.bulk_create",
+             lambda c: CustomerRepository(c.session).bulk_create(c.prepared), setup=_bulk(_customer_fields)),
+        Case("CustomerRepository.bulk_update", lambda c: CustomerRepository(c.session).bulk_update(
+            [{"id": customer_id, "company_name": f"Bench {customer_id}"} for customer_id in _sales_customer_ids(c)])),
+        Case("ContractRepository.get_by_id", lambda c: ContractRepository(c.session).get_by_id(c.dataset.contract_ids[0])),
+        Case("ContractRepository.list_by_ids",
+             lambda c: ContractRepository(c.session).list_by_ids(c.dataset.contract_ids[:50])),
+        Case("ContractRepository.list_all", lambda c: ContractRepository(c.session).list_all()),
+        Case("ContractRepository.list_page", lambda c: ContractRepository(c.session).list_page()),
+        Case("ContractRepository.list_by_management_user",
+             lambda c: ContractRepository(c.session).list_by_management_user(c.first("management"))),
+        Case("ContractRepository.list_by_customer_ids",
+             lambda c: ContractRepository(c.session).list_by_customer_ids(_sales_customer_ids(c))),
+        Case("ContractRepository.list_by_customer_ids[unpaid]",
+             lambda c: ContractRepository(c.session).list_by_customer_ids(_sales_customer_ids(c), unpaid=True)),
+        Case("ContractRepository.stream_columns", lambda c: list(ContractRepository(c.session).stream_columns())),
+        Case("ContractRepository.create", lambda c: ContractRepository(c.session).create(**_contract_fields(c))),
+        Case("ContractRepository.update", lambda c: ContractRepository(c.session).update(
+            ContractRepository(c.session).get_by_id(c.dataset.contract_ids[0]), balance_due=Decimal("0"))),
+        Case("ContractRepository.delete", lambda c: ContractRepository(c.session).delete(c.prepared),
+             setup=_new(ContractRepository, _contract_fields)),
+        Case("ContractRepository.bulk_create", lambda c: ContractRepository(c.session).bulk_create(c.prepared),
+             setup=_bulk(lambda c, n: _contract_fields(c))),
+        Case("ContractRepository.bulk_update", lambda c: ContractRepository(c.session).bulk_update(
+            [{"id": contract_id, "signed": True} for contract_id in c.dataset.contract_ids[:50]])),
+        Case("EventRepository.get_by_id", lambda c: EventRepository(c.session).get_by_id(c.dataset.event_ids[0])),
+        Case("EventRepository.list_by_ids", lambda c: EventRepository(c.session).list_by_ids(c.dataset.event_ids[:50])),
+        Case("EventRepository.list_all", lambda c: EventRepository(c.session).list_all()),
+        Case("EventRepository.list_page", lambda c: EventRepository(c.session).list_page()),
+        Case("EventRepository.list_by_support_user",
+             lambda c: EventRepository(c.session).list_by_support_user(c.first("support"))),
+        Case("EventRepository.list_by_customer",
+             lambda c: EventRepository(c.session).list_by_customer(c.dataset.customer_ids[0])),
+        Case("EventRepository.list_by_customer_ids",
+             lambda c: EventRepository(c.session).list_by_customer_ids(_sales_customer_ids(c))),
+        Case("EventRepository.list_by_sales_user",
+             lambda c: EventRepository(c.session).list_by_sales_user(c.first("sales"))),
+        Case("EventRepository.list_without_support", lambda c: EventRepository(c.session).list_without_support()),
+        Case("EventRepository.stream_columns", lambda c: list(EventRepository(c.session).stream_columns())),
+        Case("EventRepository.create", lambda c: EventRepository(c.session).create(**_event_fields(c))),
+        Case("EventRepository.update", lambda c: EventRepository(c.session).update(
+            EventRepository(c.session).get_by_id(c.dataset.event_ids[0]), attendees=42)),
+        Case("EventRepository.delete", lambda c: EventRepository(c.session).delete(
+            EventRepository(c.session).get_by_id(c.dataset.event_ids[0]))),
+        Case("EventRepository.bulk_create",
+             lambda c: EventRepository(c.session).bulk_create(c.prepared), setup=_bulk(_event_fields)),
+        Case("EventRepository.bulk_update", lambda c: EventRepository(c.session).bulk_update(
+            [{"id": event_id, "attendees": 42} for event_id in c.dataset.event_ids[:50]])),
+    ]
+    service_cases = [
+        Case("PermissionService.user_has_permission",
+             lambda c: c.perm.user_has_permission(c.users["sales"], "customer:read")),
+        Case("PermissionService.permissions_for", lambda c: c.perm.permissions_for(c.users["sales"])),
+        Case("PermissionService.available_menus_for_user",
+             lambda c: c.perm.available_menus_for_user(c.users["management"])),
+        Case("UserService.list_all", lambda c: UserService(c.session, c.perm).list_all(c.users["management"])),
+        Case("UserService.list_page", lambda c: UserService(c.session, c.perm).list_page(c.users["management"])),
+        Case("UserService.get_by_id",
+             lambda c: UserService(c.session, c.perm).get_by_id(c.users["management"], c.first("sales"))),
+        # hachage Argon2 du profil courant inclus, comme lors d'une création réelle
+        Case("UserService.create", lambda c: UserService(c.session, c.perm).create(
+            c.users["management"], **_user_fields(c), password=_PASSWORD)),
+        Case("UserService.update", lambda c: UserService(c.session, c.perm).update(
+            c.users["management"], c.first("support"), user_first_name="Bench")),
+        Case("UserService.delete", lambda c: UserService(c.session, c.perm).delete(c.users["management"], c.prepared.id),
+             setup=_new(UserRepository, lambda c: dict(_user_fields(c), password_hash="hash"))),
+        Case("CustomerService.list_all", lambda c: CustomerService(c.session, c.perm).list_all(c.users["sales"])),
+        Case("CustomerService.list_page", lambda c: CustomerService(c.session, c.perm).list_page(c.users["sales"])),
+        Case("CustomerService.list_mine", lambda c: CustomerService(c.session, c.perm).list_mine(c.users["sales"])),
+        Case("CustomerService.list_all[columns]", lambda c: CustomerService(c.session, c.perm)
+             .list_all(c.users["sales"], columns=CustomerService.LIST_COLUMNS)),
+        Case("CustomerService.create", lambda c: CustomerService(c.session, c.perm).create(
+            c.users["sales"], **_customer_fields(c))),
+        Case("CustomerService.update", lambda c: CustomerService(c.session, c.perm).update(
+            c.users["sales"], c.dataset.customer_ids[0], customer_first_name="Bench")),
+        Case("CustomerService.delete", lambda c: CustomerService(c.session, c.perm).delete(
+            c.users["sales"], c.prepared.id), setup=_new(CustomerRepository, _customer_fields)),
+        Case("CustomerService.bulk_create", lambda c: CustomerService(c.session, c.perm).bulk_create(
+            c.users["sales"], c.prepared), setup=_bulk(_customer_fields)),
+        Case("CustomerService.bulk_update", lambda c: CustomerService(c.session, c.perm).bulk_update(
+            c.users["sales"], [{"id": customer_id, "company_name": f"Bench {customer_id}"} for customer_id in _sales_customer_ids(c)])),
+        Case("ContractService.list_all", lambda c: ContractService(c.session, c.perm).list_all(c.users["management"])),
+        Case("ContractService.list_page", lambda c: ContractService(c.session, c.perm).list_page(c.users["management"])),
+        Case("ContractService.list_all[columns]", lambda c: ContractService(c.session, c.perm)
+             .list_all(c.users["management"], columns=ContractService.LIST_COLUMNS)),
+        Case("ContractService.list_by_management_user[unpaid]", lambda c: ContractService(c.session, c.perm)
+             .list_by_management_user(c.users["management"], c.first("management"), unpaid=True)),
+        Case("ContractService.list_by_customer_ids", lambda c: ContractService(c.session, c.perm)
+             .list_by_customer_ids(c.users["sales"], _sales_customer_ids(c))),
+        Case("ContractService.create", lambda c: ContractService(c.session, c.perm).create(
+            c.users["management"], **_contract_fields(c))),
+        Case("ContractService.update", lambda c: ContractService(c.session, c.perm).update(
+            c.users["management"], c.dataset.contract_ids[0], balance_due=Decimal("0"))),
+        Case("ContractService.delete", lambda c: ContractService(c.session, c.perm).delete(
+            c.users["management"], c.prepared.id), setup=_new(ContractRepository, _contract_fields)),
+        Case("ContractService.bulk_create", lambda c: ContractService(c.session, c.perm).bulk_create(
+            c.users["management"], c.prepared), setup=_bulk(lambda c, n: _contract_fields(c))),
+        Case("ContractService.bulk_update", lambda c: ContractService(c.session, c.perm).bulk_update(
+            c.users["management"], [{"id": contract_id, "signed": True} for contract_id in c.dataset.contract_ids[:50]])),
+        Case("EventService.list_all", lambda c: EventService(c.session, c.perm).list_all(c.users["support"])),
+        Case("EventService.list_page", lambda c: EventService(c.session, c.perm).list_page(c.users["support"])),
+        Case("EventService.list_all[columns]", lambda c: EventService(c.session, c.perm)
+             .list_all(c.users["support"], columns=EventService.LIST_COLUMNS)),
+        Case("EventService.list_by_sales_user",
+             lambda c: EventService(c.session, c.perm).list_by_sales_user(c.first("sales"))),
+        Case("EventService.list_by_support_user",
+             lambda c: EventService(c.session, c.perm).list_by_support_user(c.first("support"))),
+        Case("EventService.list_by_customer",
+             lambda c: EventService(c.session, c.perm).list_by_customer(c.dataset.customer_ids[0])),
+        Case("EventService.list_by_customer_ids",
+             lambda c: EventService(c.session, c.perm).list_by_customer_ids(_sales_customer_ids(c))),
+        Case("EventService.list_without_support[window]", lambda c: EventService(c.session, c.perm).list_without_support(
+            c.users["management"], start_after=datetime.datetime(2026, 3, 1), start_before=datetime.datetime(2026, 4, 1))),
+        Case("EventService.create", lambda c: EventService(c.session, c.perm).create(
+            c.users["sales"], **_event_fields(c))),
+        Case("EventService.update", lambda c: EventService(c.session, c.perm).update(
+            c.users["management"], c.dataset.event_ids[0], user_support_id=c.first("support"))),
+        Case("EventService.delete", lambda c: EventService(c.session, c.perm).delete(
+            c.users["sales"], c.dataset.event_ids[0])),
+        Case("EventService.bulk_create", lambda c: EventService(c.session, c.perm).bulk_create(
+            c.users["sales"], c.prepared), setup=_bulk(_event_fields)),
+        Case("EventService.bulk_update", lambda c: EventService(c.session, c.perm).bulk_update(
+            c.users["management"], [{"id": event_id, "user_support_id": c.first("support")}
+                                    for event_id in c.dataset.event_ids[:50]])),
+        Case("ExportService.columns", lambda c: ExportService(c.session, c.perm).columns("events")),
+        Case("ExportService.stream",
+             lambda c: list(ExportService(c.session, c.perm).stream(c.users["management"], "contracts"))),
+        Case("ExportService.export", lambda c: ExportService(c.session, c.perm).export(
+            c.users["sales"], "customers", io.StringIO(), "jsonl")),
+    ]
+    # AuthService : mêmes réglages que l'application (profil Argon2 courant, JWT configuré)
+    auth = AuthService()
+    auth_cases = [
+        Case("AuthService.hash_password", lambda c: auth.hash_password(_PASSWORD)),
+        Case("AuthService.hash_passwords", lambda c: auth.hash_passwords([_PASSWORD] * 4)),
+        Case("AuthService.verify_password", lambda c: auth.verify_password(c.prepared, _PASSWORD),
+             setup=lambda c: auth.hash_password(_PASSWORD)),
+        Case("AuthService.submit_verify_password",
+             lambda c: auth.submit_verify_password(c.prepared, _PASSWORD).result(),
+             setup=lambda c: auth.hash_password(_PASSWORD)),
+        Case("AuthService.needs_rehash", lambda c: auth.needs_rehash(c.users["sales"].password_hash)),
+        Case("AuthService.create_token", lambda c: auth.create_token(c.first("sales"))),
+        Case("AuthService.decode_token", lambda c: auth.decode_token(c.prepared),
+             setup=lambda c: auth.create_token(c.first("sales"))),
+        Case("AuthService.decode_token_cached", lambda c: auth.decode_token_cached(c.prepared),
+             setup=lambda c: auth.create_token(c.first("sales"))),
+        Case("AuthService.token_needs_refresh", lambda c: auth.token_needs_refresh(c.prepared),
+             setup=lambda c: auth.decode_token(auth.create_token(c.first("sales")))),
+    ]
+    return repo_cases + service_cases + auth_cases
+
+
+def uncovered_methods(cases: list[Case]) -> list[str]:
+    """Méthodes publiques de `BENCHMARKED_CLASSES` sans cas ni exclusion motivée."""
+    covered = {case.method for case in cases} | set(EXCLUDED)
+    return [
+        f"{cls.__name__}.{name}"
+        for cls in BENCHMARKED_CLASSES
+        for name, member in vars(cls).items()
+        if not name.startswith("_") and inspect.isfunction(member) and f"{cls.__name__}.{name}" not in covered
+    ]
+
+
+def _row_count(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, Page):
+        return len(result.items)
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def _context(session, dataset: Dataset) -> Context:
+    users = {role: session.get(User, ids[0]) for role, ids in dataset.users.items() if ids}
+    perm = PermissionService(session)
+    for user in users.values():
+        # rôle et permissions chargés avant la mesure : ils le sont déjà lors d'une session CLI
+        perm.permissions_for(user)
+    return Context(session, dataset, perm, users)
+
+
+def measure(case: Case, engine, SessionLocal, dataset: Dataset, iterations: int, warmup: int) -> dict:
+    """Mesure `case` sur `iterations` sessions neuves, après `warmup` exécutions non comptées."""
+    durations, queries, rows = [], [], []
+    for i in range(warmup + iterations):
+        with SessionLocal() as session:
+            ctx = _context(session, dataset)
+            if case.setup is not None:
+                ctx.prepared = case.setup(ctx)
+            with count_queries(engine) as stats:
+                start = time.perf_counter()
+                result = case.run(ctx)
+                elapsed = time.perf_counter() - start
+            if i >= warmup:
+                durations.append(elapsed)
+                queries.append(stats.count)
+                rows.append(_row_count(result))
+            session.rollback()
+
+    # pic mémoire sur une itération dédiée : tracemalloc fausserait les durées
+    with SessionLocal() as session:
+        ctx = _context(session, dataset)
+        if case.setup is not None:
+            ctx.prepared = case.setup(ctx)
+        tracemalloc.start()
+        try:
+            case.run(ctx)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            session.rollback()
+
+    return {
+        "name": case.name,
+        "latency": summarize(durations),
+        "queries": max(queries) if queries else 0,
+        "rows": max(rows) if rows else 0,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def run_benchmarks(scale: Scale, backend: str = "sqlite-memory", iterations: int = 50, warmup: int = 5,
+                   name_filter: str | None = None, seed: int = 0) -> dict:
+    """
+    Crée le schéma sur une base dédiée (`BENCH_DB_NAME`), la remplit selon `scale`
+    puis mesure chaque cas retenu par `name_filter` (sous-chaîne du nom).
+    """
+    engine, SessionLocal = create_engine_and_session(BENCH_DB_NAME, backend)
+    try:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        with SessionLocal() as session:
+            dataset = generate(session, scale, seed)
+        generation_s = time.perf_counter() - start
+
+        cases = [c for c in build_cases() if not name_filter or name_filter in c.name]
+        results = [measure(case, engine, SessionLocal, dataset, iterations, warmup) for case in cases]
+    finally:
+        if backend == "sqlite-memory":
+            drop_memory_database(BENCH_DB_NAME)
+    return {
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "backend": backend,
+        "dataset": dataset.summary(),
+        "generation_s": generation_s,
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} non sérialisable")
+
+
+@click.command()
+@click.option('--backend', type=click.Choice(["sqlite-memory", "sqlite", "mysql"]), default="sqlite-memory",
+              show_default=True, help=f'Moteur de la base de benchmark ({BENCH_DB_NAME}).')
+@click.option('--managers', default=Scale.managers, show_default=True)
+@click.option('--sales', default=Scale.sales, show_default=True)
+@click.option('--support', default=Scale.support, show_default=True)
+@click.option('--customers-per-sales', default=Scale.customers_per_sales, show_default=True)
+@click.option('--contracts-per-customer', default=Scale.contracts_per_customer, show_default=True)
+@click.option('--events-per-contract', default=Scale.events_per_contract, show_default=True)
+@click.option('--iterations', default=50, show_default=True, help='Mesures par cas.')
+@click.option('--warmup', default=5, show_default=True, help='Exécutions préalables non mesurées.')
+@click.option('--filter', 'name_filter', default=None, help='Ne garder que les cas dont le nom contient ce texte.')
+@click.option('--seed', 'seed_value', default=0, show_default=True, help='Graine du générateur de données.')
+@click.option('--output', type=click.Path(dir_okay=False), default=None, help='Fichier JSON de résultats.')
+def main(backend, managers, sales, support, customers_per_sales, contracts_per_customer, events_per_contract,
+         iterations, warmup, name_filter, seed_value, output):
+    """Mesurer latence, requêtes, lignes et mémoire de chaque méthode des repositories et services"""
+    scale = Scale(managers, sales, support, customers_per_sales, contracts_per_customer, events_per_contract)
+    report = run_benchmarks(scale, backend, iterations, warmup, name_filter, seed_value)
+    click.echo(f"Données : {report['dataset']} (générées en {report['generation_s']:.2f} s)")
+    for r in report["results"]:
+        latency = r["latency"]
+        click.echo(
+            f"{r['name']:<52} p50={latency['p50_ms']:7.2f} ms  p95={latency['p95_ms']:7.2f} ms  "
+            f"p99={latency['p99_ms']:7.2f} ms  requêtes={r['queries']:<3} lignes={r['rows']:<6} "
+            f"mémoire={r['peak_memory_kib']:.0f} KiB"
+        )
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, default=_default)
+
+
+if __name__ == "__main__":
+    main()
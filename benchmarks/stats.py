@@ -0,0 +1,31 @@
+import math
+from typing import Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """
+    Percentile par la méthode du rang le plus proche (`pct` entre 0 et 100).
+    Retourne 0.0 pour une série vide.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(durations: Sequence[float]) -> dict:
+    """
+    Résume une série de durées (en secondes) en millisecondes : p50/p95/p99, min, max, moyenne.
+    """
+    if not durations:
+        return {"count": 0}
+    return {
+        "count": len(durations),
+        "min_ms": min(durations) * 1000,
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "p50_ms": percentile(durations, 50) * 1000,
+        "p95_ms": percentile(durations, 95) * 1000,
+        "p99_ms": percentile(durations, 99) * 1000,
+        "max_ms": max(durations) * 1000,
+    }
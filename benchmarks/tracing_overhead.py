@@ -0,0 +1,84 @@
+"""
+Coût du tracing Sentry sur un appel de service : désactivé, activé sans
+échantillonnage, activé avec toutes les traces (transport local, rien n'est envoyé).
+
+Usage :
+    python -m benchmarks.tracing_overhead --calls 2000
+"""
+import json
+import time
+
+import click
+import sentry_sdk
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import sentry
+from app.models.base import Base
+from app.models.user import User
+from app.services.event_service import EventService
+from app.services.permission_service import PermissionService
+from benchmarks.datagen import Scale, generate
+from benchmarks.stats import summarize
+
+MODES = {
+    # mode -> taux d'échantillonnage (None : Sentry non initialisé)
+    "disabled": None,
+    "unsampled": 0.0,
+    "sampled": 1.0,
+}
+
+
+def run_mode(session, user, rate, calls: int) -> dict:
+    transport = None
+    if rate is not None:
+        transport = sentry.RecordingTransport()
+        sentry._TRACES_RATE = rate
+        sentry.init_sentry(transport=transport)
+    try:
+        service = EventService(session, PermissionService(session))
+        durations = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            with sentry.trace(sentry.CLI_INTERACTION_OP, "benchmark"):
+                service.list_page(user)
+            durations.append(time.perf_counter() - start)
+        sentry_sdk.flush()
+    finally:
+        sentry_sdk.get_global_scope().set_client(None)
+    return {
+        "latency": summarize(durations),
+        "transactions": len(transport.transactions()) if transport else 0,
+    }
+
+
+@click.command()
+@click.option('--calls', default=1000, show_default=True, help='Appels mesurés par mode.')
+@click.option('--output', type=click.Path(dir_okay=False), default=None, help='Fichier JSON de résultats.')
+def main(calls, output):
+    """Mesurer le surcoût du tracing (spans service/repository/SQL) par appel"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    rate_before = sentry._TRACES_RATE
+    results = {}
+    with Session(engine) as session:
+        dataset = generate(session, Scale())
+        user = session.get(User, dataset.users["management"][0])
+        try:
+            for mode, rate in MODES.items():
+                results[mode] = run_mode(session, user, rate, calls)
+        finally:
+            sentry._TRACES_RATE = rate_before
+    engine.dispose()
+    base = results["disabled"]["latency"]["p50_ms"]
+    for mode, r in results.items():
+        p50 = r["latency"]["p50_ms"]
+        click.echo(f"{mode:>10} : p50={p50:.3f} ms  p99={r['latency']['p99_ms']:.3f} ms  "
+                   f"surcoût={(p50 - base) * 1000:+.0f} µs  transactions={r['transactions']}")
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
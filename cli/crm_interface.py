@@ -1,6 +1,7 @@
 import click
 from pathlib import Path
 from app.db.session import get_session
+from app.repositories.loading import load_options
 from app.repositories.user_repository import UserRepository
 from app.services.auth_service import AuthService
 from app.services.permission_service import PermissionService
@@ -10,6 +11,13 @@ from cli.views.customers import CustomersView
 from cli.views.contracts import ContractsView
 from cli.views.events import EventsView
 from cli.helpers import prompt_menu
+from app.db.instrumentation import QueryProfiler, format_stats
+from app.db.transaction import transactional
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+from app.services.user_service import UserService
+from sentry import report_exception
 
 
 _TOKEN_FILE = Path(__file__).resolve().parent.parent / ".epic_events_token"
@@ -51,30 +59,59 @@ def _clear_token() -> None:
         pass
 
 
-def _user_from_token(session, auth_service: AuthService):
+# relations utilisées par l'interface (nom du rôle, permissions) chargées avec l'utilisateur
+_SESSION_USER_LOAD = {"role": "joined", "role.permissions": "joined"}
+
+
+def _restore_session(session, auth_service: AuthService):
     """
-    Tente de récupérer l'utilisateur correspondant au token d'authentification
+    Tente de restaurer la session à partir du token d'authentification.
+    Retourne le couple (utilisateur, claims du token) ou (None, None).
     """
 
     token = _read_token()
     if not token:
-        return None
+        return None, None
     try:
-        payload = auth_service.decode_token(token)
+        # claims mis en cache : pas de nouvelle vérification de signature à chaque cycle
+        payload = auth_service.decode_token_cached(token)
         user_id = int(payload.get("sub", ""))
     except Exception:
         _clear_token()
-        return None
+        return None, None
     if not user_id:
         _clear_token()
-        return None
-    user = session.get(User, user_id)
+        return None, None
+    # une seule requête pour l'utilisateur, son rôle et ses permissions
+    user = session.get(User, user_id, options=load_options(User, _SESSION_USER_LOAD))
     if not user:
         _clear_token()
-        return None
+        return None, None
+    return user, payload
+
+
+def _user_from_token(session, auth_service: AuthService):
+    """
+    Tente de récupérer l'utilisateur correspondant au token d'authentification
+    """
+    user, _ = _restore_session(session, auth_service)
     return user
 
 
+def _rehash_if_needed(session, user_repo: UserRepository, auth_service: AuthService, user, password: str) -> None:
+    """
+    Rehache le mot de passe si les paramètres Argon2 ont changé depuis son
+    enregistrement (profil différent, coût relevé). Un échec n'empêche pas la connexion.
+    """
+    if not auth_service.needs_rehash(user.password_hash):
+        return
+    try:
+        with transactional(session):
+            user_repo.update(user, password_hash=auth_service.hash_password(password))
+    except Exception as e:
+        report_exception(e)
+
+
 def prompt_login(session, auth_service: AuthService):
     """
     Invite l'utilisateur à se connecter en demandant son nom d'utilisateur et son mot de passe.
@@ -85,35 +122,79 @@ def prompt_login(session, auth_service: AuthService):
     password = click.prompt("Mot de passe", hide_input=True)
     user_repo = UserRepository(session)
     user = user_repo.get_by_username(username)
-    if not user or not auth_service.verify_password(user.password_hash, password):
+    # la vérification Argon2 s'exécute sur le pool dédié (nombre de cœurs borné)
+    if not user or not auth_service.submit_verify_password(user.password_hash, password).result():
         click.echo("Authentification échouée")
         return None
-    
+    _rehash_if_needed(session, user_repo, auth_service, user, password)
+
     click.echo(f"\nConnecté en tant que {user.username} ({user.role.name})")
     return user
 
 
-def run_interface():
+def authenticate(session, auth_service: AuthService):
+    """
+    Utilisateur de la session enregistrée (token local) ou, à défaut, connexion
+    interactive. Utilisé par les commandes non interactives (import, export).
+    Retourne None si l'authentification échoue.
+    """
+    user, _ = _restore_session(session, auth_service)
+    if user:
+        return user
+    return prompt_login(session, auth_service)
+
+
+# méthodes des vues qui ne sont pas des actions (boucles de menu, construction des options)
+_VIEW_NON_ACTIONS = {
+    "main_user_menu", "main_customer_menu", "main_contract_menu", "main_event_menu",
+    "get_user_menu_options", "get_customer_menu_options", "get_contracts_menu_options", "get_event_menu_options",
+}
+
+
+def _print_profile(label, stats, children) -> None:
+    for line in format_stats(label, stats, children):
+        click.echo(line)
+
+
+def _enable_profiling(engine) -> QueryProfiler:
+    """
+    Instrumente les actions des vues et les méthodes des services : un résumé
+    SQL (requêtes, temps en base, plus lentes) est affiché après chaque action.
+    """
+    profiler = QueryProfiler(on_action_end=_print_profile)
+    profiler.attach(engine)
+    for view in (UsersView, CustomersView, ContractsView, EventsView):
+        profiler.profile_class(view, exclude=_VIEW_NON_ACTIONS)
+    # PermissionService est laissé de côté : ses vérifications (en cache) jalonnent aussi les menus
+    for service in (UserService, CustomerService, ContractService, EventService):
+        profiler.profile_class(service)
+    return profiler
+
+
+def run_interface(profile: bool = False):
     """
     Lance l'interface CLI principale, gérant l'authentification et la navigation
     entre les différents menus en fonction des permissions de l'utilisateur.
+    Avec `profile`, affiche après chaque action le résumé des requêtes SQL émises.
     """
     # initialise la session DB et le service d'authentification
     session = get_session()
+    profiler = _enable_profiling(session.get_bind()) if profile else None
     # initialise le service d'authentification
     auth = AuthService()
     # boucle principale de l'interface CLI
     try:
         while True:
-            user = _user_from_token(session, auth)
+            user, claims = _restore_session(session, auth)
             if user:
                 click.echo(f"\nSession restaurée pour {user.username} ({user.role.name})")
             else:
                 user = prompt_login(session, auth)
             if not user:
                 continue
-            token = auth.create_token(user.id)
-            _write_token(token)
+            # le token n'est ré-émis (signature + écriture disque) que s'il approche de l'expiration
+            if claims is None or auth.token_needs_refresh(claims):
+                _write_token(auth.create_token(user.id))
 
             # initialise le service de permissions
             perm_service = PermissionService(session)
@@ -149,4 +230,6 @@ def run_interface():
                     break
                 handler(user, session, perm_service)
     finally:
+        if profiler is not None:
+            profiler.detach()
         session.close()
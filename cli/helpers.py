@@ -1,5 +1,5 @@
 import click
-from typing import List, Tuple, Any, Optional
+from typing import Callable, List, Tuple, Any, Optional
 
 
 def prompt_menu(
@@ -38,3 +38,39 @@ def prompt_menu(
         if 1 <= choice <= len(items):
             return items[choice - 1][1]
         click.echo("Choix invalide")
+
+
+_NEXT_PAGE = object()
+_PREVIOUS_PAGE = object()
+
+
+def prompt_paginated_menu(
+    fetch_page: Callable[[Optional[int]], Any],
+    to_option: Callable[[Any], Tuple[str, Any]],
+    prompt: str = 'Choix',
+    empty_message: Optional[str] = None,
+) -> Optional[Any]:
+    """Affiche un menu page par page à partir d'une source paginée.
+
+    `fetch_page(after_id)` doit retourner une `Page` (items + next_cursor) et
+    `to_option(item)` le couple (libellé, valeur) affiché pour chaque élément.
+    Seule la page courante est chargée ; des entrées « Page suivante » et
+    « Page précédente » permettent de naviguer.
+    """
+    cursors: List[Optional[int]] = []
+    cursor: Optional[int] = None
+    while True:
+        page = fetch_page(cursor)
+        options = [to_option(item) for item in page.items]
+        if options and page.next_cursor is not None:
+            options.append(('Page suivante', _NEXT_PAGE))
+        if options and cursors:
+            options.append(('Page précédente', _PREVIOUS_PAGE))
+        choice = prompt_menu(options, prompt=prompt, empty_message=empty_message)
+        if choice is _NEXT_PAGE:
+            cursors.append(cursor)
+            cursor = page.next_cursor
+        elif choice is _PREVIOUS_PAGE:
+            cursor = cursors.pop()
+        else:
+            return choice
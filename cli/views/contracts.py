@@ -1,10 +1,12 @@
 from app.services.contract_service import ContractService
 import click
-from cli.helpers import prompt_menu
+from cli.helpers import prompt_menu, prompt_paginated_menu
 from app.db.transaction import transactional
-from sentry import report_exception
+from app.repositories.loading import load_options
+from sentry import CLI_INTERACTION_OP, report_exception, traced_methods
 
 
+@traced_methods(CLI_INTERACTION_OP, exclude=("main_contract_menu", "get_contracts_menu_options"))
 class ContractsView:
     """
     Vue CLI pour la gestion des contrats.
@@ -15,6 +17,7 @@ class ContractsView:
         self.session = session
         self.perm_service = perm_service
         self.prompt_menu = prompt_menu
+        self.prompt_paginated_menu = prompt_paginated_menu
 
     def main_contract_menu(self, user):
         while True:
@@ -126,10 +129,13 @@ class ContractsView:
     def list_all_contracts(self, user):
         contract_service = ContractService(self.session, self.perm_service)
         try:
-            contracts = contract_service.list_all(user)
             click.echo('\n=== Liste des contrats ===\n-> Choisir un contrat pour afficher les détails\n')
-            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer.company_name}", c.id) for c in contracts]
-            choice = self.prompt_menu(contract_options, prompt='Choisir contrat', empty_message='Aucun contrat')
+            choice = self.prompt_paginated_menu(
+                lambda after_id: contract_service.list_page(user, after_id=after_id, columns=contract_service.LIST_COLUMNS),
+                lambda c: (f"ID: {c.id}: contrat lié au client {c.customer_company_name}", c.id),
+                prompt='Choisir contrat',
+                empty_message='Aucun contrat',
+            )
             if choice is None:
                 return
             self.display_detail_contracts(user, choice)
@@ -141,14 +147,14 @@ class ContractsView:
         contract_service = ContractService(self.session, self.perm_service)
         try:
             if user.role.name == 'management':
-                contracts = contract_service.list_by_management_user(user, user.id)
+                contracts = contract_service.list_by_management_user(user, user.id, columns=contract_service.LIST_COLUMNS)
             elif user.role.name == 'sales':
                 customer_ids = [c.id for c in user.customers]
-                contracts = contract_service.list_by_customer_ids(user, customer_ids)
+                contracts = contract_service.list_by_customer_ids(user, customer_ids, columns=contract_service.LIST_COLUMNS)
             else:
                 contracts = []
             click.echo('\n=== Liste de mes contrats ===\n-> Choisir un contrat pour afficher les détails\n')
-            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer.company_name}", c.id) for c in contracts]
+            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer_company_name}", c.id) for c in contracts]
             choice = self.prompt_menu(contract_options, prompt='Choisir contrat', empty_message="Vous n'avez pas encore de contrat")
             if choice is None:
                 return
@@ -161,14 +167,14 @@ class ContractsView:
         contract_service = ContractService(self.session, self.perm_service)
         try:
             if user.role.name == 'management':
-                contracts = [c for c in contract_service.list_by_management_user(user, user.id) if not c.signed]
+                contracts = contract_service.list_by_management_user(user, user.id, signed=False, columns=contract_service.LIST_COLUMNS)
             elif user.role.name == 'sales':
                 customer_ids = [c.id for c in user.customers]
-                contracts = [c for c in contract_service.list_by_customer_ids(user, customer_ids) if not c.signed]
+                contracts = contract_service.list_by_customer_ids(user, customer_ids, signed=False, columns=contract_service.LIST_COLUMNS)
             else:
                 contracts = []
             click.echo('\n=== Liste de mes contrats non signés ===\n-> Choisir un contrat pour afficher les détails\n')
-            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer.company_name}", c.id) for c in contracts]
+            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer_company_name}", c.id) for c in contracts]
             choice = self.prompt_menu(contract_options, prompt='Choisir contrat', empty_message="Vous n'avez pas de contrat non signé")
             if choice is None:
                 return
@@ -181,14 +187,14 @@ class ContractsView:
         contract_service = ContractService(self.session, self.perm_service)
         try:
             if user.role.name == 'management':
-                contracts = [c for c in contract_service.list_by_management_user(user, user.id) if c.balance_due > 0]
+                contracts = contract_service.list_by_management_user(user, user.id, unpaid=True, columns=contract_service.LIST_COLUMNS)
             elif user.role.name == 'sales':
                 customer_ids = [c.id for c in user.customers]
-                contracts = [c for c in contract_service.list_by_customer_ids(user, customer_ids) if c.balance_due > 0]
+                contracts = contract_service.list_by_customer_ids(user, customer_ids, unpaid=True, columns=contract_service.LIST_COLUMNS)
             else:
                 contracts = []
             click.echo('\n=== Liste de mes contrats impayés ===\n-> Choisir un contrat pour afficher les détails\n')
-            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer.company_name}", c.id) for c in contracts]
+            contract_options = [(f"ID: {c.id}: contrat lié au client {c.customer_company_name}", c.id) for c in contracts]
             choice = self.prompt_menu(contract_options, prompt='Choisir contrat', empty_message="Vous n'avez pas de contrat impayé")
             if choice is None:
                 return
@@ -198,7 +204,7 @@ class ContractsView:
 
     def display_detail_contracts(self, user, contract_id):
         from app.models.contract import Contract
-        contract = self.session.get(Contract, contract_id)
+        contract = self.session.get(Contract, contract_id, options=load_options(Contract, ContractService.DETAIL_LOAD))
         if not contract:
             click.echo('Contrat introuvable')
             return
@@ -1,9 +1,11 @@
 from app.services.customer_service import CustomerService
 import click
-from cli.helpers import prompt_menu
+from cli.helpers import prompt_menu, prompt_paginated_menu
 from app.db.transaction import transactional
-from sentry import report_exception
+from app.repositories.loading import load_options
+from sentry import CLI_INTERACTION_OP, report_exception, traced_methods
 
+@traced_methods(CLI_INTERACTION_OP, exclude=("main_customer_menu", "get_customer_menu_options"))
 class CustomersView:
     """
     Vue CLI pour la gestion des clients.
@@ -15,6 +17,7 @@ class CustomersView:
         self.session = session
         self.perm_service = perm_service
         self.prompt_menu = prompt_menu
+        self.prompt_paginated_menu = prompt_paginated_menu
         self.click = click
 
     def main_customer_menu(self, user) -> None:
@@ -117,10 +120,13 @@ class CustomersView:
     def list_all_customers(self, user):
         cust_service = CustomerService(self.session, self.perm_service)
         try:
-            customers = cust_service.list_all(user)
             self.click.echo('\n=== Liste des clients ===\n-> Choisir un client pour afficher les détails\n')
-            customer_options = [(f"ID {c.id}: {c.customer_first_name} {c.customer_last_name} - Entreprise: {c.company_name} - Commercial ID: {c.user_sales_id}" , c.id) for c in customers]
-            choice = self.prompt_menu(customer_options, prompt='Choisir client', empty_message="Aucun client")
+            choice = self.prompt_paginated_menu(
+                lambda after_id: cust_service.list_page(user, after_id=after_id, columns=cust_service.LIST_COLUMNS),
+                lambda c: (f"ID {c.id}: {c.customer_first_name} {c.customer_last_name} - Entreprise: {c.company_name} - Commercial ID: {c.user_sales_id}", c.id),
+                prompt='Choisir client',
+                empty_message="Aucun client",
+            )
             if choice is None:
                 return
             self.display_detail_customers(user, choice)
@@ -131,7 +137,7 @@ class CustomersView:
     def my_customers(self, user):
         cust_service = CustomerService(self.session, self.perm_service)
         try:
-            customers = cust_service.list_mine(user)
+            customers = cust_service.list_mine(user, columns=cust_service.LIST_COLUMNS)
             self.click.echo('\n=== Liste des clients ===\n-> Choisir un client pour afficher les détails\n')
             customer_options = [(f"ID {c.id}: {c.customer_first_name} {c.customer_last_name} - Entreprise: {c.company_name} - Commercial ID: {c.user_sales_id}" , c.id) for c in customers]
             choice = self.prompt_menu(customer_options, prompt='Choisir client', empty_message="Vous n'avez pas encore de client")
@@ -145,7 +151,7 @@ class CustomersView:
     def display_detail_customers(self, user, customer_id):
         from app.models.customer import Customer
         cust_service = CustomerService(self.session, self.perm_service)
-        customer = self.session.get(Customer, customer_id)
+        customer = self.session.get(Customer, customer_id, options=load_options(Customer, CustomerService.DETAIL_LOAD))
         if not customer:
             self.click.echo('Client introuvable')
             return
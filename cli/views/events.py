@@ -1,9 +1,10 @@
 from app.services.event_service import EventService
 import click
-from cli.helpers import prompt_menu
+from cli.helpers import prompt_menu, prompt_paginated_menu
 from app.db.transaction import transactional
-from sentry import report_exception
+from sentry import CLI_INTERACTION_OP, report_exception, traced_methods
 
+@traced_methods(CLI_INTERACTION_OP, exclude=("main_event_menu", "get_event_menu_options"))
 class EventsView:
     """
     Vue CLI pour la gestion des évènements.
@@ -15,6 +16,7 @@ class EventsView:
         self.session = session
         self.perm_service = perm_service
         self.prompt_menu = prompt_menu
+        self.prompt_paginated_menu = prompt_paginated_menu
         self.click = click
 
     def main_event_menu(self, user):
@@ -94,10 +96,13 @@ class EventsView:
     def list_all_events(self, user):
         event_service = EventService(self.session, self.perm_service)
         try:
-            events = event_service.list_all(user)
             self.click.echo('\n=== Liste des évènements ===\n-> Choisir un évènement pour afficher les détails\n')
-            opts = [(f"ID: {e.id}: {e.event_name}", e.id) for e in events]
-            choice = self.prompt_menu(opts, prompt='Choisir évènement', empty_message='Aucun évènement')
+            choice = self.prompt_paginated_menu(
+                lambda after_id: event_service.list_page(user, after_id=after_id, columns=event_service.LIST_COLUMNS),
+                lambda e: (f"ID: {e.id}: {e.event_name}", e.id),
+                prompt='Choisir évènement',
+                empty_message='Aucun évènement',
+            )
             if choice is None:
                 return
             self.display_detail_events(user, choice)
@@ -111,12 +116,9 @@ class EventsView:
         try:
             role_name = getattr(getattr(user, 'role', None), 'name', None)
             if role_name == 'support':
-                events = event_service.list_by_support_user(user.id)
+                events = event_service.list_by_support_user(user.id, columns=event_service.LIST_COLUMNS)
             elif role_name == 'sales':
-                customer_ids = [c.id for c in getattr(user, 'customers', [])]
-                events = []
-                for cid in customer_ids:
-                    events.extend(event_service.list_by_customer(cid))
+                events = event_service.list_by_sales_user(user.id, columns=event_service.LIST_COLUMNS)
             else:
                 events = []
             self.click.echo('\n=== Liste des évènements ===\n-> Choisir un évènement pour afficher les détails\n')
@@ -132,7 +134,7 @@ class EventsView:
     def events_without_support(self, user):
         event_service = EventService(self.session, self.perm_service)
         try:
-            events = [e for e in event_service.list_all(user) if getattr(e, 'user_support_id', None) is None]
+            events = event_service.list_without_support(user, columns=event_service.LIST_COLUMNS)
             self.click.echo('\n=== Liste des évènements ===\n-> Choisir un évènement pour afficher les détails\n')
             opts = [(f"ID: {e.id}: {e.event_name}", e.id) for e in events]
             choice = self.prompt_menu(opts, prompt='Choisir évènement', empty_message='Aucun évènement')
@@ -1,10 +1,12 @@
 from app.services.user_service import UserService
 import click
-from cli.helpers import prompt_menu
+from cli.helpers import prompt_menu, prompt_paginated_menu
 from app.db.transaction import transactional
-from sentry import report_exception
+from app.repositories.loading import load_options
+from sentry import CLI_INTERACTION_OP, report_exception, traced_methods
 
 
+@traced_methods(CLI_INTERACTION_OP, exclude=("main_user_menu", "get_user_menu_options"))
 class UsersView:
     """
     Vue CLI pour la gestion des utilisateurs.
@@ -16,6 +18,7 @@ class UsersView:
         self.session = session
         self.perm_service = perm_service
         self.prompt_menu = prompt_menu
+        self.prompt_paginated_menu = prompt_paginated_menu
         self.click = click
 
     def main_user_menu(self, user) -> None:
@@ -162,13 +165,15 @@ class UsersView:
     def list_all_users(self, user) -> None:
         user_service = UserService(self.session, self.perm_service)
         try:
-            users = user_service.list_all(user)
             self.click.echo('\n=== Liste des utilisateurs ===\n-> Choisir un utilisateur pour afficher les détails\n')
-            user_options = [(
-                f"ID {u.id}: {u.user_first_name} {u.user_last_name}, username: {u.username}, role: {getattr(u.role, 'name', u.role_id)}",
-                u.id,
-            ) for u in users]
-            choice = self.prompt_menu(user_options, empty_message='Aucun utilisateur')
+            choice = self.prompt_paginated_menu(
+                lambda after_id: user_service.list_page(user, after_id=after_id),
+                lambda u: (
+                    f"ID {u.id}: {u.user_first_name} {u.user_last_name}, username: {u.username}, role: {getattr(u.role, 'name', u.role_id)}",
+                    u.id,
+                ),
+                empty_message='Aucun utilisateur',
+            )
             if choice is None:
                 return
             self.display_detail_users(user, choice)
@@ -193,7 +198,7 @@ class UsersView:
 
     def display_detail_users(self, current_user, target_user_id) -> None:
         from app.models.user import User
-        target = self.session.get(User, target_user_id)
+        target = self.session.get(User, target_user_id, options=load_options(User, UserService.DETAIL_LOAD))
         if not target:
             self.click.echo('Utilisateur introuvable')
             return
@@ -1,6 +1,23 @@
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import click
-from cli.crm_interface import run_interface
+from sqlalchemy.exc import OperationalError
+from api.wsgi import make_api_server
+from cli.crm_interface import authenticate, run_interface
+from app.db.config import API_HOST, API_PORT
 from app.db import init_db as init_db_module
+from app.db.index_audit import audit_queries
+from app.db.schema import check_schema_version
+from app.db.session import get_engine, get_session
+from app.repositories.streaming import DEFAULT_STREAM_BATCH_SIZE
+from app.services.auth_service import AuthService, check_jwt_config
+from app.services.export_service import (
+    EXPORT_ENTITIES, ExportResult, ExportService, FORMATS as EXPORT_FORMATS, write_rows,
+)
+from app.services.import_service import FORMATS, IMPORT_CHUNK_SIZE, IMPORT_SERVICES, ImportService, read_records
+from app.services.permission_service import PermissionService
 import sentry as sentry_module
 
 @click.group()
@@ -8,16 +25,188 @@ def cli():
     pass
 
 
+@cli.command('init-db')
+@click.option('--seed', 'with_seed', is_flag=True, help='Insère aussi les données de démonstration.')
+@click.pass_context
+def init_db(ctx, with_seed):
+    """Réinitialiser la base de données (DROP + CREATE + tables)"""
+    click.echo('Réinitialisation de la base de données (DROP + CREATE)...')
+    init_db_module.init_schema()
+    click.echo('Schéma créé.')
+    if with_seed:
+        ctx.invoke(seed)
+
+
+@cli.command()
+def seed():
+    """Insérer les données de démonstration"""
+    click.echo('Insertion des données de démonstration...')
+    try:
+        seeded = init_db_module.seed_database()
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+    if seeded:
+        click.echo('Données insérées.')
+    else:
+        click.echo('La base contient déjà des données : seed ignoré.')
+
+
+@cli.command('index-audit')
+@click.option('--verbose', '-v', is_flag=True, help='Affiche le plan de chaque requête.')
+def index_audit(verbose):
+    """Lancer EXPLAIN sur les requêtes des repositories et signaler les parcours complets de table"""
+    try:
+        reports = audit_queries(get_engine())
+    except OperationalError as exc:
+        raise click.ClickException(f"Connexion à la base impossible : {exc.orig}") from exc
+    for report in reports:
+        status = 'OK ' if report.ok else 'SCAN'
+        suffix = '' if report.ok else f" (parcours complet : {', '.join(report.full_scans)})"
+        click.echo(f"[{status}] {report.name}{suffix}")
+        if verbose or not report.ok:
+            for line in report.plan:
+                click.echo(f"       {line}")
+    flagged = [r for r in reports if not r.ok]
+    if flagged:
+        raise click.ClickException(f"{len(flagged)} requête(s) sans index adapté")
+    click.echo(f"{len(reports)} requêtes auditées, aucun parcours complet.")
+
+
+def _check_database() -> None:
+    # connexion et version du schéma ; erreurs traduites en message CLI
+    try:
+        check_schema_version(get_engine())
+    except OperationalError as exc:
+        raise click.ClickException(f"Connexion à la base impossible : {exc.orig}") from exc
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+def _authenticated_session():
+    """Session et utilisateur connecté (session enregistrée ou connexion interactive)."""
+    _check_database()
+    session = get_session()
+    user = authenticate(session, AuthService())
+    if not user:
+        session.close()
+        raise click.ClickException("Authentification requise")
+    return session, user
+
+
+# nombre d'enregistrements refusés affichés en détail (les suivants sont seulement comptés)
+_IMPORT_ERRORS_SHOWN = 20
+
+
+@cli.command('import')
+@click.argument('entity', type=click.Choice(sorted(IMPORT_SERVICES)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default=None, help="Déduit de l'extension par défaut.")
+@click.option('--offset', default=0, show_default=True, type=click.IntRange(min=0),
+              help="Enregistrements à sauter (reprise après interruption).")
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Enregistrements validés et écrits par lot.')
+def import_file(entity, path, fmt, offset, chunk_size):
+    """Importer des clients, contrats ou évènements depuis un fichier CSV ou JSONL"""
+    session, user = _authenticated_session()
+    service = ImportService(session, PermissionService(session))
+    progress = None
+    shown = 0
+
+    def on_chunk(current):
+        nonlocal progress
+        progress = current
+        click.echo(f"  {current.offset} enregistrements traités ({current.created} créés, "
+                   f"{current.rejected} refusés) - {current.rate:.0f} enr./s")
+
+    def on_error(position, message):
+        nonlocal shown
+        shown += 1
+        if shown <= _IMPORT_ERRORS_SHOWN:
+            click.echo(f"  enregistrement {position + 1} refusé : {message}", err=True)
+
+    try:
+        result = service.import_records(user, entity, read_records(path, fmt), offset, chunk_size, on_chunk, on_error)
+    except PermissionError as exc:
+        raise click.ClickException(str(exc)) from exc
+    except Exception as exc:
+        # les lots déjà validés restent en base : on repart du premier enregistrement non validé
+        resume = progress.offset if progress else offset
+        raise click.ClickException(
+            f"Import interrompu ({exc}) : {resume} enregistrements validés en base, "
+            f"relancer avec --offset {resume}"
+        ) from exc
+    finally:
+        session.close()
+    click.echo(f"Import terminé : {result.created} créés, {result.rejected} refusés sur {result.read} "
+               f"en {result.elapsed:.1f} s ({result.rate:.0f} enr./s)")
+
+
+@cli.command('export')
+@click.argument('entity', type=click.Choice(sorted(EXPORT_ENTITIES)))
+@click.argument('output', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='csv', show_default=True)
+@click.option('--columns', default=None, help='Colonnes séparées par des virgules (toutes par défaut).')
+@click.option('--batch-size', default=DEFAULT_STREAM_BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Lignes lues par aller-retour avec la base.')
+def export_file(entity, output, fmt, columns, batch_size):
+    """Exporter clients, contrats ou évènements en CSV ou JSONL (OUTPUT : fichier, ou - pour la sortie standard)"""
+    session, user = _authenticated_session()
+    service = ExportService(session, PermissionService(session))
+    selected = [c.strip() for c in columns.split(',') if c.strip()] if columns else None
+    try:
+        start = time.perf_counter()
+        # entité, permission et colonnes vérifiées avant de créer le fichier : pas de fichier vide en cas d'erreur
+        names, rows = service.stream(user, entity, selected, batch_size)
+        if output == '-':
+            count = write_rows(click.get_text_stream('stdout'), fmt, names, rows)
+        else:
+            with open(output, 'w', newline='', encoding='utf-8') as fh:
+                count = write_rows(fh, fmt, names, rows)
+    except (PermissionError, ValueError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    finally:
+        session.close()
+    result = ExportResult(count, time.perf_counter() - start)
+    click.echo(f"Export terminé : {result.rows} lignes en {result.elapsed:.1f} s ({result.rate:.0f} lignes/s)", err=True)
+
+
 @cli.command()
-def run():
+@click.option('--profile', is_flag=True, help='Affiche les requêtes SQL (nombre, durée, plus lentes) après chaque action.')
+def run(profile):
     """Lancer l'interface CLI"""
-    # réinitialiser la base de données à chaque démarrage (DROP + CREATE + SEED)
-    click.echo('Réinitialisation de la base de données (DROP + CREATE + SEED)...')
-    init_db_module.main()
-    click.echo('Réinitialisation terminée. Démarrage de l\'interface...')
+    # aucune réinitialisation : on vérifie seulement la connexion et la version du schéma
+    start = time.perf_counter()
+    _check_database()
+    ready = time.perf_counter()
+    click.echo(
+        f"Démarrage en {(ready - _PROCESS_START) * 1000:.0f} ms "
+        f"(connexion et vérification du schéma : {(ready - start) * 1000:.0f} ms)"
+    )
     # delegate to crm_interface
     sentry_module.init_sentry()
-    run_interface()
+    run_interface(profile=profile)
+
+
+@cli.command()
+@click.option('--host', default=API_HOST, show_default=True, help="Adresse d'écoute.")
+@click.option('--port', default=API_PORT, show_default=True, type=click.IntRange(min=0, max=65535))
+@click.option('--quiet', is_flag=True, help="N'affiche pas le journal des requêtes.")
+def serve(host, port, quiet):
+    """Lancer l'API HTTP/JSON (un fil par requête, une session du pool par requête)"""
+    _check_database()
+    try:
+        check_jwt_config()
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+    sentry_module.init_sentry()
+    server = make_api_server(host, port, quiet=quiet)
+    click.echo(f"API à l'écoute sur http://{host}:{server.server_port} (Ctrl+C pour arrêter)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 
 
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
+import inspect
 import os
+from contextlib import nullcontext
+from typing import Callable, Iterable
 
 from dotenv import load_dotenv
 import sentry_sdk
-from sentry_sdk import Hub
+from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+from sentry_sdk.transport import Transport
 
 load_dotenv() 
 
@@ -14,24 +19,137 @@ _TRACES_RATE: float = float(
     os.getenv("SENTRY_TRACES", "0.0"))
 
 
-def init_sentry() -> None:
+def _parse_op_rates(raw: str) -> dict[str, float]:
+    """`"cli.interaction=1.0,service=0.2"` -> {"cli.interaction": 1.0, "service": 0.2}"""
+    rates = {}
+    for item in raw.split(","):
+        if "=" in item:
+            op, rate = item.split("=", 1)
+            rates[op.strip()] = float(rate)
+    return rates
 
-    if not _DSN:
+
+# op des transactions ouvertes par les actions des vues CLI : elles couvrent toute
+# l'interaction, saisies (`click.prompt`) comprises ; leur durée n'est donc pas une
+# latence de traitement, mesurée par les spans `service` / `db.repository` / `db`
+CLI_INTERACTION_OP = "cli.interaction"
+
+# taux d'échantillonnage par opération (op de la transaction racine), ex. :
+# SENTRY_TRACES_BY_OP="cli.interaction=1.0,service=0.1" ; à défaut, SENTRY_TRACES
+_OP_RATES: dict[str, float] = _parse_op_rates(os.getenv("SENTRY_TRACES_BY_OP", ""))
+
+
+def traces_sampler(sampling_context: dict) -> float:
+    # une trace déjà échantillonnée (ou écartée) en amont garde sa décision
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+    op = (sampling_context.get("transaction_context") or {}).get("op") or ""
+    if op in _OP_RATES:
+        return _OP_RATES[op]
+    # "db.repository" retombe sur le taux de "db" s'il est défini
+    return _OP_RATES.get(op.split(".")[0], _TRACES_RATE)
+
+
+class RecordingTransport(Transport):
+    """
+    Transport local : conserve les envelopes au lieu de les envoyer à Sentry.
+    Sert aux tests (vérifier les spans émis) et à la mesure du coût du tracing.
+    """
+
+    def __init__(self, options=None) -> None:
+        super().__init__(options)
+        self.envelopes = []
+
+    def capture_envelope(self, envelope) -> None:
+        self.envelopes.append(envelope)
+
+    def flush(self, timeout, callback=None) -> None:
+        pass
+
+    def kill(self) -> None:
+        pass
+
+    def transactions(self) -> list[dict]:
+        """Transactions reçues (payload JSON), dans l'ordre d'envoi."""
+        events = []
+        for envelope in self.envelopes:
+            for item in envelope.items:
+                payload = item.payload.json
+                if payload and payload.get("type") == "transaction":
+                    events.append(payload)
+        return events
+
+
+def init_sentry(transport: Transport | None = None) -> None:
+    """
+    Initialise Sentry si `SENTRY_DSN` est défini, ou si un `transport` local est
+    fourni (ex. `RecordingTransport` dans les tests). Les requêtes SQLAlchemy
+    deviennent des spans `db` (SqlalchemyIntegration) ; l'échantillonnage des
+    traces suit `traces_sampler`.
+    """
+    if not _DSN and transport is None:
         return
 
     sentry_sdk.init(
         dsn=_DSN,
+        transport=transport,
         environment=_ENV,
         send_default_pii=True,          # envoie IP, User‑Agent, etc.
-        traces_sample_rate=_TRACES_RATE,
-        enable_tracing=_TRACES_RATE > 0.0,
+        traces_sampler=traces_sampler,
+        integrations=[SqlalchemyIntegration()],
     )
 
 
 def _is_enabled() -> bool:
-    hub = Hub.current
-    client = getattr(hub, "client", None)
-    return bool(client)
+    return sentry_sdk.get_client().is_active()
+
+
+def trace(op: str, name: str):
+    """
+    Context manager de tracing : ouvre un span `op`/`name` sous le span courant,
+    ou une transaction s'il n'y en a pas. Sans client Sentry actif, ne fait rien.
+    """
+    if not _is_enabled():
+        return nullcontext()
+    current = sentry_sdk.get_current_span()
+    if current is None:
+        return sentry_sdk.start_transaction(op=op, name=name)
+    if current.sampled is False:
+        # trace écartée par l'échantillonnage : inutile de créer des spans enfants
+        return nullcontext()
+    return sentry_sdk.start_span(op=op, name=name)
+
+
+def traced(op: str, name: str | None = None) -> Callable:
+    """Décorateur : exécute la fonction dans `trace(op, name or qualname)`."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace(op, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_methods(op: str, exclude: Iterable[str] = ()) -> Callable:
+    """
+    Décorateur de classe : applique `traced(op)` à chaque méthode publique
+    définie par la classe (hors `exclude`). Span nommé `Classe.méthode`.
+    """
+    exclude = set(exclude)
+
+    def decorator(cls):
+        for attr, member in list(vars(cls).items()):
+            if attr.startswith("_") or attr in exclude or not inspect.isfunction(member):
+                continue
+            if inspect.iscoroutinefunction(member):
+                continue
+            setattr(cls, attr, traced(op)(member))
+        return cls
+    return decorator
 
 
 def report_exception(exc: Exception) -> None:
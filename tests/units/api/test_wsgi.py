@@ -0,0 +1,138 @@
+import io
+import json
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.wsgi import ApiApplication, etag_matches
+from app.models.base import Base
+from app.models.contract import Contract  # noqa: F401 - enregistre le mapper
+from app.models.customer import Customer
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """API sur une base SQLite : un commercial (lecture/écriture clients) et un support (lecture seule)."""
+    monkeypatch.setattr("app.services.auth_service.JWT_SECRET", "test-secret")
+    monkeypatch.setattr("app.services.auth_service.JWT_ALGORITHM", "HS256")
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.sqlite3'}")
+    Base.metadata.create_all(engine)
+    auth = AuthService(profile="test")
+    with Session(engine) as s:
+        read = Permission(name="customer:read")
+        sales = Role(name="sales", permissions=[read, Permission(name="customer:create"),
+                                                Permission(name="customer:update")])
+        support = Role(name="support", permissions=[read])
+        s.add_all([sales, support])
+        s.flush()
+        for n, role in ((1, sales), (2, support)):
+            s.add(User(role_id=role.id, user_first_name="U", user_last_name="U", email=f"u{n}@x.fr",
+                       phone_number=f"010{n}", username=f"user{n}", password_hash=auth.hash_password("secret")))
+        s.flush()
+        s.add_all([Customer(user_sales_id=1, customer_first_name="C", customer_last_name="C", email=f"c{n}@x.fr",
+                            phone_number=f"020{n}", company_name=f"Société {n}") for n in range(3)])
+        s.commit()
+    yield ApiApplication(sessionmaker(bind=engine), auth)
+    engine.dispose()
+
+
+def call(app, method, path, body=None, token=None, **headers):
+    path, _, query = path.partition("?")
+    raw = json.dumps(body).encode() if body is not None else b""
+    environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": query,
+               "CONTENT_LENGTH": str(len(raw)), "wsgi.input": io.BytesIO(raw)}
+    if token:
+        environ["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    environ.update({f"HTTP_{name.upper()}": value for name, value in headers.items()})
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, response_headers):
+        response["status"] = int(status.split()[0])
+        response["headers"] = dict(response_headers)
+
+    content = b"".join(app(environ, start_response))
+    return response["status"], response["headers"], json.loads(content) if content else None
+
+
+def login(app, username):
+    status, _, data = call(app, "POST", "/auth/token", {"username": username, "password": "secret"})
+    assert status == 200
+    return data["token"]
+
+
+def test_connexion_et_token_requis(app):
+    """Le token est émis après vérification du mot de passe et exigé sur les autres routes."""
+    assert call(app, "POST", "/auth/token", {"username": "user1", "password": "faux"})[0] == 401
+    status, headers, _ = call(app, "GET", "/customers")
+    assert status == 401 and headers["WWW-Authenticate"] == "Bearer"
+    assert call(app, "GET", "/customers", token="invalide")[0] == 401
+    assert call(app, "GET", "/customers", token=login(app, "user1"))[0] == 200
+
+
+def test_liste_paginee_par_curseur(app):
+    """Les pages suivent `next_cursor`, annoncé aussi par l'en-tête Link."""
+    token = login(app, "user2")
+    status, headers, page = call(app, "GET", "/customers?limit=2", token=token)
+    assert status == 200 and [c["id"] for c in page["items"]] == [1, 2]
+    assert headers["Link"] == '</customers?after=2&limit=2>; rel="next"'
+    _, headers, page = call(app, "GET", f"/customers?after={page['next_cursor']}&limit=2", token=token)
+    assert [c["id"] for c in page["items"]] == [3] and page["next_cursor"] is None
+    assert "Link" not in headers
+    assert call(app, "GET", "/customers?limit=x", token=token)[0] == 400
+
+
+def test_get_conditionnel_etag(app):
+    """If-None-Match avec l'ETag courant donne 304 sans corps ; une modification change l'ETag."""
+    token = login(app, "user1")
+    _, headers, _ = call(app, "GET", "/customers/1", token=token)
+    etag = headers["ETag"]
+    status, headers, body = call(app, "GET", "/customers/1", token=token, if_none_match=etag)
+    assert status == 304 and body is None and headers["ETag"] == etag
+    assert call(app, "PATCH", "/customers/1", {"company_name": "Renommée"}, token=token)[0] == 200
+    status, headers, body = call(app, "GET", "/customers/1", token=token, if_none_match=etag)
+    assert status == 200 and body["company_name"] == "Renommée" and headers["ETag"] != etag
+    assert etag_matches(f'W/{etag}, "autre"', etag) and etag_matches("*", etag)
+
+
+def test_detail_sans_hachage_de_mot_de_passe(app):
+    """Le détail inclut les relations de DETAIL_LOAD mais jamais `password_hash`."""
+    status, _, customer = call(app, "GET", "/customers/1", token=login(app, "user2"))
+    assert status == 200
+    assert customer["sales_user"]["username"] == "user1"
+    assert "password_hash" not in customer["sales_user"]
+
+
+def test_ecritures_et_erreurs(app):
+    """create -> 201 + Location ; entité absente -> 404 ; données invalides -> 400 ; permission -> 403."""
+    token = login(app, "user1")
+    fields = {"user_sales_id": 1, "customer_first_name": "Nouveau", "customer_last_name": "Client",
+              "email": "n@x.fr", "phone_number": "0300", "company_name": "Nouvelle"}
+    status, headers, created = call(app, "POST", "/customers", fields, token=token)
+    assert status == 201 and headers["Location"] == f"/customers/{created['id']}"
+    assert created["user_sales_id"] == 1
+    assert call(app, "PATCH", "/customers/99", {"company_name": "X"}, token=token)[0] == 404
+    assert call(app, "PATCH", "/customers/1", {"email": "pas-un-email"}, token=token)[0] == 400
+    assert call(app, "POST", "/customers", fields, token=login(app, "user2"))[0] == 403
+    assert call(app, "GET", "/users", token=token)[0] == 403
+    status, headers, _ = call(app, "PUT", "/customers/1", token=token)
+    assert status == 405 and headers["Allow"] == "GET, PATCH, DELETE"
+
+
+def test_champs_reserves_refuses(app):
+    """Un champ du corps qui porte le nom d'un paramètre du service donne 400, pas 500."""
+    token = login(app, "user1")
+    fields = {"user_sales_id": 1, "customer_first_name": "N", "customer_last_name": "C",
+              "email": "r@x.fr", "phone_number": "0400", "company_name": "Réservée"}
+    status, _, body = call(app, "POST", "/customers", {**fields, "user": 2}, token=token)
+    assert status == 400 and "user" in body["error"]
+    status, _, body = call(app, "PATCH", "/customers/1", {"customer_id": 2}, token=token)
+    assert status == 400 and "customer_id" in body["error"]
+    assert call(app, "POST", "/customers", {**fields, "user_sales_id": 2}, token=token)[0] == 403
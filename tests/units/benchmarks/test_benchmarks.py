@@ -0,0 +1,85 @@
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.event import Event
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from benchmarks.api_load import run_load
+from benchmarks.async_throughput import run_throughput
+from benchmarks.datagen import Scale, generate
+from benchmarks.repositories import build_cases, run_benchmarks, uncovered_methods
+
+TINY = Scale(managers=1, sales=2, support=1, customers_per_sales=3, contracts_per_customer=2, events_per_contract=2)
+
+
+def test_generate_respecte_lechelle():
+    """Le générateur crée exactement le volume demandé, de façon déterministe."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        dataset = generate(s, TINY, seed=1)
+        assert dataset.summary()["customers"] == 6
+        assert s.query(Contract).count() == 12
+        assert s.query(Event).count() == 24
+    engine.dispose()
+
+
+def test_run_benchmarks_rapport_complet():
+    """Chaque cas retenu produit latences, requêtes, lignes et pic mémoire."""
+    report = run_benchmarks(TINY, iterations=2, warmup=0, name_filter="EventRepository.list_by_sales_user")
+    [result] = report["results"]
+    assert result["name"] == "EventRepository.list_by_sales_user"
+    assert result["latency"]["count"] == 2
+    assert result["queries"] == 1
+    assert result["rows"] == 12
+    assert result["peak_memory_kib"] > 0
+    assert report["dataset"]["events"] == 24
+
+
+
+def test_chaque_methode_publique_a_un_cas():
+    """Toute méthode publique des repositories et services est mesurée ou explicitement exclue."""
+    assert uncovered_methods(build_cases()) == []
+
+
+def test_suppression_mesuree_sur_une_ligne_preparee():
+    """La ligne supprimée est créée hors mesure : seules les requêtes de `delete` sont comptées."""
+    report = run_benchmarks(TINY, iterations=2, warmup=0, name_filter="CustomerService.delete")
+    [result] = report["results"]
+    assert result["latency"]["count"] == 2
+    assert 0 < result["queries"] <= 5
+
+def test_debit_concurrent_par_mode():
+    """Chaque mode (synchrone, fils, asyncio) traite toutes les requêtes et rapporte son débit."""
+    pytest.importorskip("aiosqlite")
+    report = run_throughput(TINY, requests=6, concurrency=3)
+    assert [r["mode"] for r in report["results"]] == ["sync", "sync-threads", "async"]
+    for result in report["results"]:
+        assert result["latency"]["count"] == 6
+        assert result["requests_per_s"] > 0
+
+
+@pytest.fixture
+def jwt_config(monkeypatch):
+    """Configuration JWT propre au test, indépendante de l'environnement."""
+    monkeypatch.setattr("app.services.auth_service.JWT_SECRET", "test-secret")
+    monkeypatch.setattr("app.services.auth_service.JWT_ALGORITHM", "HS256")
+
+
+def test_charge_api_get_conditionnels(jwt_config):
+    """Le serveur HTTP répond à toutes les requêtes ; en mode conditionnel, les relectures sont des 304."""
+    report = run_load(TINY, backend="sqlite-memory", requests=30, concurrency=4)
+    full, conditional = report["results"]
+    assert full["statuses"] == {"200": 30}
+    assert conditional["statuses"].get("304", 0) > 0
+    assert sum(conditional["statuses"].values()) == 30
+
+
+def test_charge_api_sans_configuration_jwt(monkeypatch):
+    """Sans JWT_SECRET, le test de charge échoue tout de suite avec un message explicite."""
+    monkeypatch.setattr("app.services.auth_service.JWT_SECRET", None)
+    with pytest.raises(RuntimeError, match="JWT_SECRET"):
+        run_load(TINY, backend="sqlite-memory", requests=1, concurrency=1)
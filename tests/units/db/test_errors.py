@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.errors import check_unique, constraint_error, unique_violation_field
+from app.models.base import Base
+from app.models.contract import Contract  # noqa: F401 - enregistre le mapper
+from app.models.customer import Customer
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+
+
+def make_error(message):
+    return IntegrityError("INSERT", {}, Exception(message))
+
+
+def test_message_mysql_qualifie_ou_non():
+    """Reconnaît la clé MySQL, qualifiée par la table ou non."""
+    fields = ("username", "email", "phone_number")
+    assert unique_violation_field(make_error("(1062, \"Duplicate entry 'a@b.fr' for key 'users.email'\")"), fields) == "email"
+    assert unique_violation_field(make_error("(1062, \"Duplicate entry 'bob' for key 'username'\")"), fields) == "username"
+
+
+def test_message_sqlite():
+    """Reconnaît le format SQLite."""
+    assert unique_violation_field(make_error("UNIQUE constraint failed: customers.phone_number"), ("email", "phone_number")) == "phone_number"
+
+
+def test_autre_violation_non_reconnue():
+    """Une violation de clé étrangère ne correspond à aucun champ unique."""
+    assert unique_violation_field(make_error("FOREIGN KEY constraint failed"), ("email",)) is None
+
+
+def test_check_unique_en_une_requete():
+    """Conflit détecté en une requête ; la ligne modifiée est écartée, les autres tables ignorées."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    messages = {"email": "Email déjà utilisé", "phone_number": "Numéro déjà utilisé"}
+    with Session(engine) as session:
+        role = Role(name="sales")
+        session.add(role)
+        session.flush()
+        user = User(role_id=role.id, user_first_name="U", user_last_name="U", email="u@x.fr",
+                    phone_number="01", username="u", password_hash="h")
+        session.add(user)
+        session.flush()
+        with pytest.raises(ValueError, match="Email déjà utilisé"):
+            check_unique(session, User, messages, {"email": "u@x.fr", "phone_number": "02"})
+        check_unique(session, User, messages, {"email": "u@x.fr"}, exclude_id=user.id)
+        check_unique(session, Customer, messages, {"email": "u@x.fr"})
+    engine.dispose()
+
+
+def test_constraint_error_par_champ_ou_message_par_defaut():
+    """Message du champ unique violé, sinon le message par défaut."""
+    messages = {"email": "Email déjà utilisé"}
+    assert str(constraint_error(make_error("UNIQUE constraint failed: users.email"), messages)) == "Email déjà utilisé"
+    assert str(constraint_error(make_error("FOREIGN KEY constraint failed"), {}, "Référence invalide")) == "Référence invalide"
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import create_engine
+
+from app.db import index_audit
+from app.models.base import Base
+from app.models.contract import Contract  # noqa: F401 - enregistre le mapper
+from app.models.customer import Customer  # noqa: F401 - enregistre le mapper
+from app.models.event import Event
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role  # noqa: F401 - enregistre le mapper
+from app.models.user import User  # noqa: F401 - enregistre le mapper
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_requetes_des_repositories_indexees(engine):
+    """Toutes les requêtes auditées passent par un index (aucun SCAN de table)."""
+    reports = index_audit.audit_queries(engine)
+    assert {r.name for r in reports} == {name for name, _ in index_audit.AUDITED_QUERIES}
+    assert [r.name for r in reports if not r.ok] == []
+
+
+def test_parcours_complet_signale(engine):
+    """Un filtre sur une colonne non indexée est remonté comme parcours complet."""
+    queries = (("lieu", lambda s: s.query(Event).filter(Event.location == "Paris").all()),)
+    [report] = index_audit.audit_queries(engine, queries)
+    assert not report.ok
+    assert report.full_scans == ["events"]
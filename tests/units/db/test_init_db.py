@@ -0,0 +1,38 @@
+import pytest
+
+from app.db import init_db, session as session_module
+from app.db.schema import SCHEMA_VERSION, get_schema_version
+from app.models.user import User
+
+
+@pytest.fixture(params=["sqlite", "sqlite-memory"])
+def backend(request, monkeypatch, tmp_path):
+    """Base SQLite (fichier ou mémoire) isolée, à la place du serveur MySQL."""
+    monkeypatch.setattr(session_module, "DB_BACKEND", request.param)
+    monkeypatch.setattr(session_module, "DB_SQLITE_DIR", str(tmp_path))
+    monkeypatch.setattr(session_module, "_ENGINES", {})
+    monkeypatch.setattr(session_module, "_SESSION_FACTORIES", {})
+    monkeypatch.setattr(session_module, "_MEMORY_KEEPERS", {})
+    yield request.param
+    session_module.dispose_engines()
+    session_module.drop_memory_database()
+
+
+def test_init_schema_puis_seed(backend):
+    """`init-db` puis `seed` fonctionnent sans MySQL ; un second seed est ignoré."""
+    init_db.init_schema()
+    engine = session_module.get_engine()
+    assert get_schema_version(engine) == SCHEMA_VERSION
+    assert init_db.seed_database() is True
+    assert init_db.seed_database() is False
+    with session_module.get_session() as s:
+        assert s.query(User).count() == 7
+
+
+def test_init_schema_repart_de_zero(backend):
+    """Une seconde initialisation efface les données existantes."""
+    init_db.init_schema()
+    init_db.seed_database()
+    init_db.init_schema()
+    with session_module.get_session() as s:
+        assert s.query(User).count() == 0
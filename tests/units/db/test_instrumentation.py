@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db import instrumentation
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _select(engine, n=1):
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text(f"SELECT {i}"))
+
+
+def test_perimetres_emboites(engine):
+    """Une action cumule les requêtes de ses méthodes ; le résumé est émis à sa fermeture."""
+    ended = []
+    profiler = instrumentation.QueryProfiler(on_action_end=lambda *args: ended.append(args))
+    profiler.attach(engine)
+    try:
+        with profiler.scope("Vue.action"):
+            _select(engine)
+            with profiler.scope("Service.methode"):
+                _select(engine, 2)
+        _select(engine)  # hors périmètre : ignorée
+    finally:
+        profiler.detach()
+    [(label, stats, children)] = ended
+    assert label == "Vue.action"
+    assert stats.count == 3
+    assert children["Service.methode"].count == 2
+    assert profiler.totals["Service.methode"].calls == 1
+    assert stats.db_time > 0 and len(stats.slowest) == 3
+    assert instrumentation.format_stats(label, stats, children)[0].startswith("[profil] Vue.action : 3 requête(s)")
+
+
+def test_profile_class_puis_detach(engine):
+    """Les méthodes publiques sont instrumentées puis restaurées par `detach()`."""
+    class Service:
+        def lire(self):
+            _select(engine)
+            return "ok"
+
+    original = Service.lire
+    profiler = instrumentation.QueryProfiler()
+    profiler.attach(engine)
+    profiler.profile_class(Service)
+    assert Service().lire() == "ok"
+    assert profiler.totals["Service.lire"].count == 1
+    profiler.detach()
+    assert Service.lire is original
+
+
+def test_assert_max_queries(engine):
+    """Le garde-fou échoue en listant les requêtes au-delà du maximum attendu."""
+    with instrumentation.assert_max_queries(engine, 2):
+        _select(engine, 2)
+    with pytest.raises(AssertionError, match="3 requêtes SQL émises"):
+        with instrumentation.assert_max_queries(engine, 2):
+            _select(engine, 3)
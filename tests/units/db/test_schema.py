@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import create_engine
+
+from app.db import schema
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_base_non_initialisee(engine):
+    """Sans table de version, `run` doit refuser de démarrer."""
+    assert schema.get_schema_version(engine) is None
+    with pytest.raises(RuntimeError, match="init-db"):
+        schema.check_schema_version(engine)
+
+
+def test_version_enregistree_puis_verifiee(engine):
+    """`init-db` enregistre la version attendue, que `run` accepte ensuite."""
+    schema.schema_version.create(engine)
+    with engine.begin() as conn:
+        schema.stamp_schema_version(conn)
+        schema.stamp_schema_version(conn)
+    assert schema.get_schema_version(engine) == schema.SCHEMA_VERSION
+    schema.check_schema_version(engine)
+
+
+def test_version_incompatible(engine):
+    """Une base d'une autre version est signalée."""
+    schema.schema_version.create(engine)
+    with engine.begin() as conn:
+        schema.stamp_schema_version(conn, version=schema.SCHEMA_VERSION + 1)
+    with pytest.raises(RuntimeError, match="incompatible"):
+        schema.check_schema_version(engine)
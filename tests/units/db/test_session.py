@@ -0,0 +1,105 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from app.db import session as session_module
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    """Isole le registre des engines pour chaque test."""
+    monkeypatch.setattr(session_module, "_ENGINES", {})
+    monkeypatch.setattr(session_module, "_SESSION_FACTORIES", {})
+
+
+def test_get_engine_reutilise_le_meme_engine_par_url(monkeypatch):
+    """Un seul engine (et donc un seul pool) est créé par URL."""
+    created = []
+
+    def fake_create_engine(url, **kwargs):
+        created.append((url, kwargs))
+        return SimpleNamespace(url=url)
+
+    monkeypatch.setattr(session_module, "create_engine", fake_create_engine)
+    first = session_module.get_engine()
+    second = session_module.get_engine()
+    other = session_module.get_engine("autre_base")
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+    options = created[0][1]
+    assert options["poolclass"] is session_module.InstrumentedQueuePool
+    assert options["pool_size"] == session_module.DB_POOL_SIZE
+    assert options["pool_pre_ping"] == session_module.DB_POOL_PRE_PING
+
+
+def test_kwargs_surchargent_les_options_du_pool(monkeypatch):
+    """Les kwargs fournis à la création remplacent les réglages par défaut."""
+    captured = {}
+    monkeypatch.setattr(session_module, "create_engine", lambda url, **kw: captured.update(kw) or SimpleNamespace())
+    session_module.get_engine(pool_size=20)
+    assert captured["pool_size"] == 20
+
+
+def test_pool_instrumente_mesure_les_checkouts():
+    """Le pool instrumenté compte les checkouts et conserve ses stats après recreate()."""
+    pool = session_module.InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0)
+    conn = pool.connect()
+    assert pool.checkedout() == 1
+    conn.close()
+    assert pool.stats.checkouts == 1
+    assert pool.stats.wait_max >= 0.0
+    assert pool.recreate().stats is pool.stats
+
+
+def test_pool_statistics_vide_sans_engine():
+    """Aucune statistique tant que l'engine n'existe pas."""
+    assert session_module.pool_statistics() == {}
+
+
+def test_url_selon_le_backend(monkeypatch, tmp_path):
+    """Le moteur configuré choisit l'URL : MySQL, fichier SQLite ou mémoire partagée."""
+    monkeypatch.setattr(session_module, "DB_SQLITE_DIR", str(tmp_path))
+    assert session_module.get_database_url("crm", backend="mysql").startswith("mysql+pymysql://")
+    assert session_module.get_database_url("crm", backend="sqlite") == f"sqlite:///{tmp_path / 'crm.sqlite3'}"
+    memory = session_module.get_database_url("crm", backend="sqlite-memory")
+    assert memory.startswith("sqlite:///file:crm?mode=memory&cache=shared")
+    with pytest.raises(ValueError):
+        session_module.get_backend("postgres")
+
+
+def test_sqlite_memoire_partagee_entre_connexions(monkeypatch):
+    """Les connexions du pool voient la même base en mémoire, clés étrangères actives."""
+    monkeypatch.setattr(session_module, "DB_BACKEND", "sqlite-memory")
+    monkeypatch.setattr(session_module, "_MEMORY_KEEPERS", {})
+    engine = session_module.get_engine("test_partage")
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+            conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        engine.dispose()
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM t").scalar() == 1
+            assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    finally:
+        session_module.drop_memory_database("test_partage")
+    assert session_module._MEMORY_KEEPERS == {}
+
+
+def test_sqlite_savepoint_annule_par_le_rollback(monkeypatch):
+    """Un SAVEPOINT émis avant toute écriture reste dans la transaction : le rollback l'annule."""
+    monkeypatch.setattr(session_module, "DB_BACKEND", "sqlite-memory")
+    monkeypatch.setattr(session_module, "_MEMORY_KEEPERS", {})
+    engine, SessionLocal = session_module.create_engine_and_session("test_savepoint")
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+        with SessionLocal() as session:
+            with session.begin_nested():
+                session.execute(text("INSERT INTO t VALUES (1)"))
+            session.rollback()
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM t").scalar() == 0
+    finally:
+        session_module.drop_memory_database("test_savepoint")
@@ -0,0 +1,16 @@
+from app.repositories import batching
+
+
+def test_in_chunks_dedoublonne_et_decoupe():
+    """Les identifiants sont dédoublonnés, dans l'ordre, par lots de taille bornée."""
+    assert list(batching.in_chunks([3, 1, 3, 2, 5, 1], size=2)) == [[3, 1], [2, 5]]
+
+
+def test_in_chunks_vide():
+    """Aucun lot (donc aucune requête) pour une liste vide."""
+    assert list(batching.in_chunks([])) == []
+
+
+def test_in_chunks_taille_par_defaut(monkeypatch):
+    monkeypatch.setattr(batching, "IN_CHUNK_SIZE", 3)
+    assert [len(c) for c in batching.in_chunks(range(7))] == [3, 3, 1]
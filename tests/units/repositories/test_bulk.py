@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import count_queries
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.customer_repository import CustomerRepository
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Un commercial, sans client."""
+    with Session(engine) as s:
+        role = Role(name="sales")
+        s.add(role)
+        s.flush()
+        user = User(role_id=role.id, user_first_name="S", user_last_name="S", email="s@x.fr",
+                    phone_number="1", username="s", password_hash="h")
+        s.add(user)
+        s.commit()
+        s.user_id = user.id
+        yield s
+
+
+def _customer(user_id, n, **overrides):
+    row = {"user_sales_id": user_id, "customer_first_name": "C", "customer_last_name": str(n),
+           "email": f"c{n}@x.fr", "phone_number": f"0{n}", "company_name": f"Société {n}"}
+    row.update(overrides)
+    return row
+
+
+def test_bulk_create_un_insert_par_lot(engine, session):
+    """25 lignes en lots de 10 : trois INSERT multi-lignes (plus les SAVEPOINT)."""
+    rows = [_customer(session.user_id, n) for n in range(25)]
+    with count_queries(engine) as stats:
+        result = CustomerRepository(session).bulk_create(rows, chunk_size=10)
+    assert result.affected == 25 and result.failures == []
+    inserts = [s for s in stats.statements if s.startswith("INSERT")]
+    assert len(inserts) == 3
+    assert session.query(Customer).count() == 25
+
+
+def test_bulk_create_isole_les_lignes_refusees(session):
+    """Un doublon en base n'annule que sa ligne : les autres lignes du lot sont insérées."""
+    rows = [_customer(session.user_id, n) for n in range(4)]
+    rows[2]["email"] = "c0@x.fr"
+    result = CustomerRepository(session).bulk_create(rows, chunk_size=10)
+    assert result.affected == 3
+    assert [index for index, _ in result.failures] == [2]
+    assert sorted(e for (e,) in session.query(Customer.email)) == ["c0@x.fr", "c1@x.fr", "c3@x.fr"]
+
+
+def test_bulk_update_par_cle_primaire(session):
+    """Les lignes sont mises à jour par `id` et les instances chargées sont relues."""
+    repo = ContractRepository(session)
+    customer = CustomerRepository(session).create(**_customer(session.user_id, 1))
+    result = repo.bulk_create([
+        {"customer_id": customer.id, "user_management_id": session.user_id,
+         "total_amount": Decimal("100"), "balance_due": Decimal("100"), "signed": False}
+        for _ in range(3)
+    ])
+    assert result.affected == 3
+    contracts = repo.list_by_ids([c.id for c in session.query(Contract)])
+    assert len(contracts) == 3
+    result = repo.bulk_update([{"id": c.id, "balance_due": Decimal("0")} for c in contracts[:2]]
+                              + [{"id": contracts[2].id, "signed": True}])
+    assert result.affected == 3
+    assert sorted((c.signed, c.balance_due) for c in contracts) == [
+        (False, Decimal("0")), (False, Decimal("0")), (True, Decimal("100"))]
@@ -0,0 +1,149 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import count_queries
+from app.models.base import Base
+from app.models.contract import Contract  # noqa: F401 - enregistre le mapper
+from app.models.customer import Customer  # noqa: F401 - enregistre le mapper
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.repositories import cache as cache_module
+from app.repositories.cache import (
+    MISSING, CacheStats, LocalSharedClient, MemoryBackend, SharedBackend, build_backend,
+    cache_statistics, configure_cache,
+)
+from app.repositories.user_repository import USER_CACHE, UserRepository
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Backend mémoire neuf et compteurs remis à zéro pour chaque test."""
+    backend = MemoryBackend(max_size=100)
+    previous = configure_cache(backend)
+    monkeypatch.setattr(USER_CACHE, "stats", CacheStats())
+    yield backend
+    configure_cache(previous)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Base SQLite sur fichier (une base en mémoire privée n'est pas mise en cache)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        role = Role(name="sales")
+        s.add(role)
+        s.flush()
+        s.add(User(role_id=role.id, user_first_name="S", user_last_name="S", email="s@x.fr",
+                   phone_number="1", username="sales1", password_hash="h"))
+        s.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_memoire_ttl_et_lru():
+    """Une entrée expire après son TTL ; au-delà de max_size, la moins récemment lue est évincée."""
+    clock = Clock()
+    backend = MemoryBackend(max_size=2, clock=clock)
+    backend.set("a", 1, ttl=10)
+    backend.set("b", 2, ttl=10)
+    assert backend.get("a") == 1          # "a" devient la plus récente
+    backend.set("c", 3, ttl=10)
+    assert backend.get("b") is MISSING
+    assert (backend.get("a"), backend.get("c"), backend.evictions) == (1, 3, 1)
+    clock.now = 10
+    assert backend.get("a") is MISSING
+    assert len(backend) == 1
+
+    with pytest.raises(ValueError):
+        build_backend("memcached")
+    assert build_backend("none").get("a") is MISSING
+
+
+def test_backend_partage_avec_client_local():
+    """SharedBackend sérialise les valeurs, délègue le TTL au client et vide un espace de noms."""
+    clock = Clock()
+    client = LocalSharedClient(clock=clock)
+    backend = SharedBackend(client, prefix="test:")
+    backend.set("users:db:id:1", (1, "sales1"), ttl=5)
+    backend.set("roles:db:id:1", "sales", ttl=60)
+    assert backend.get("users:db:id:1") == (1, "sales1")
+    assert list(client.scan_iter("test:*")) == ["test:users:db:id:1", "test:roles:db:id:1"]
+    clock.now = 5
+    assert backend.get("users:db:id:1") is MISSING
+    backend.clear("roles:")
+    assert backend.get("roles:db:id:1") is MISSING
+
+
+def test_lecture_en_cache_et_compteurs(backend, engine):
+    """La seconde lecture ne touche pas la base ; les succès et échecs sont comptés."""
+    with Session(engine) as s:
+        repo = UserRepository(s)
+        user_id = repo.get_by_username("sales1").id
+        with count_queries(engine) as stats:
+            first = repo.get_summary(user_id)
+        assert stats.count == 1
+        assert (first.username, first.role_name) == ("sales1", "sales")
+    with Session(engine) as s:
+        repo = UserRepository(s)
+        with count_queries(engine) as stats:
+            assert repo.get_summary(user_id) == first
+            assert repo.get_by_username("sales1").id == user_id
+        # get_by_username : accès par clé primaire au lieu de la recherche par nom
+        assert stats.count == 1
+        assert repo.get_summary(999) is None
+    assert (USER_CACHE.stats.hits, USER_CACHE.stats.misses) == (2, 3)
+    assert cache_statistics()["users"]["hits"] == 2
+
+
+def test_invalidation_par_le_repository(backend, engine):
+    """update et delete invalident les clés de l'utilisateur, y compris l'ancien nom."""
+    with Session(engine) as s:
+        repo = UserRepository(s)
+        user = repo.get_by_username("sales1")
+        user_id = user.id
+        repo.get_summary(user_id)
+        repo.update(user, username="vendeur1")
+        s.commit()
+    with Session(engine) as s:
+        repo = UserRepository(s)
+        assert repo.get_by_username("sales1") is None
+        assert repo.get_summary(user_id).username == "vendeur1"
+        repo.delete(repo.get_by_username("vendeur1"))
+        s.commit()
+    with Session(engine) as s:
+        assert UserRepository(s).get_summary(user_id) is None
+
+
+def test_rollback_et_renommage_de_role(backend, engine):
+    """Une valeur relue pendant une transaction annulée est écartée ; un rôle modifié vide le cache."""
+    with Session(engine) as s:
+        repo = UserRepository(s)
+        user = repo.get_by_username("sales1")
+        repo.update(user, username="temporaire")
+        repo.get_summary(user.id)   # lu dans la transaction, avant le rollback
+        s.rollback()
+        assert repo.get_summary(user.id).username == "sales1"
+    with Session(engine) as s:
+        s.query(Role).one().name = "commercial"
+        s.commit()
+        assert UserRepository(s).get_summary(user.id).role_name == "commercial"
+
+
+def test_base_en_memoire_privee_non_mise_en_cache(backend):
+    """Sans base identifiable (SQLite en mémoire privée), le cache est contourné."""
+    engine = create_engine("sqlite://")
+    with Session(engine) as s:
+        assert cache_module.database_key(s) is None
+    assert len(backend) == 0
@@ -0,0 +1,97 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import assert_max_queries, count_queries
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.event_repository import EventRepository
+
+NOW = datetime.datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def session():
+    """Base SQLite en mémoire : un client, quatre contrats et trois évènements."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        role = Role(name="management")
+        s.add(role)
+        s.flush()
+        manager = User(role_id=role.id, user_first_name="M", user_last_name="M", email="m@x.fr",
+                       phone_number="1", username="m", password_hash="h")
+        s.add(manager)
+        s.flush()
+        customer = Customer(user_sales_id=manager.id, customer_first_name="C", customer_last_name="C",
+                            email="c@x.fr", phone_number="2", company_name="Société")
+        s.add(customer)
+        s.flush()
+        for signed, balance in ((False, "100"), (False, "0"), (True, "50"), (True, "0")):
+            s.add(Contract(customer_id=customer.id, user_management_id=manager.id,
+                           total_amount=Decimal("100"), balance_due=Decimal(balance), signed=signed))
+        s.flush()
+        contract_id = s.query(Contract.id).first()[0]
+        for days, support in ((0, None), (1, manager.id), (10, None)):
+            s.add(Event(contract_id=contract_id, customer_id=customer.id, user_support_id=support,
+                        event_name=f"J+{days}", start_datetime=NOW + datetime.timedelta(days=days)))
+        s.commit()
+        s.manager_id = manager.id
+        s.customer_id = customer.id
+        yield s
+    engine.dispose()
+
+
+def _balances(contracts):
+    return sorted((c.signed, c.balance_due) for c in contracts)
+
+
+def test_contrats_filtres_en_sql(session):
+    """Signé / impayé / bornes de solde se combinent dans une seule requête."""
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+    repo = ContractRepository(session)
+    assert _balances(repo.list_by_management_user(session.manager_id, signed=False)) == [
+        (False, Decimal("0")), (False, Decimal("100"))]
+    assert _balances(repo.list_by_customer_ids([session.customer_id], unpaid=True)) == [
+        (False, Decimal("100")), (True, Decimal("50"))]
+    assert _balances(repo.list_all(unpaid=False, signed=True)) == [(True, Decimal("0"))]
+    assert _balances(repo.list_all(min_balance=Decimal("50"), max_balance=Decimal("100"))) == [
+        (False, Decimal("100")), (True, Decimal("50"))]
+    assert len(statements) == 4
+    assert all("balance_due" in sql or "signed" in sql for sql in statements)
+
+
+def test_evenements_sans_support_et_fenetre(session):
+    """Évènements non assignés, éventuellement restreints à une fenêtre de dates."""
+    repo = EventRepository(session)
+    assert [e.event_name for e in repo.list_without_support()] == ["J+0", "J+10"]
+    window = repo.list_without_support(start_after=NOW, start_before=NOW + datetime.timedelta(days=2))
+    assert [e.event_name for e in window] == ["J+0"]
+    assert [e.event_name for e in repo.list_by_customer(session.customer_id, unassigned=False)] == ["J+1"]
+
+
+def test_evenements_par_commercial_en_une_requete(session):
+    """Jointure sur `Customer.user_sales_id` : une requête quel que soit le nombre de clients."""
+    with assert_max_queries(session.get_bind(), 1):
+        events = EventRepository(session).list_by_sales_user(session.manager_id, unassigned=True)
+    assert [e.event_name for e in events] == ["J+0", "J+10"]
+
+
+def test_evenements_par_clients_decoupes_en_lots(session, monkeypatch):
+    """Les listes d'identifiants trop longues sont découpées en plusieurs clauses IN."""
+    from app.repositories import batching
+    monkeypatch.setattr(batching, "IN_CHUNK_SIZE", 2)
+    with count_queries(session.get_bind()) as stats:
+        events = EventRepository(session).list_by_customer_ids([session.customer_id, 998, 999, session.customer_id])
+    assert len(events) == 3
+    assert stats.count == 2
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.repositories import loading
+from app.repositories.contract_repository import ContractRepository
+
+
+@pytest.fixture
+def session():
+    """Base SQLite en mémoire avec un commercial, un manager et trois clients sous contrat."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        role = Role(name="management")
+        s.add(role)
+        s.flush()
+        manager = User(role_id=role.id, user_first_name="M", user_last_name="M", email="m@x.fr",
+                       phone_number="1", username="m", password_hash="h")
+        s.add(manager)
+        s.flush()
+        for i in range(3):
+            customer = Customer(user_sales_id=manager.id, customer_first_name="C", customer_last_name="C",
+                                email=f"c{i}@x.fr", phone_number=f"2{i}", company_name=f"Société {i}")
+            s.add(customer)
+            s.flush()
+            s.add(Contract(customer_id=customer.id, user_management_id=manager.id,
+                           total_amount=Decimal("10"), balance_due=Decimal("0"), signed=True))
+        s.commit()
+        yield s
+    engine.dispose()
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_load_options_rejette_une_strategie_inconnue():
+    """Une stratégie non référencée lève une ValueError explicite."""
+    with pytest.raises(ValueError):
+        loading.load_options(Contract, {"customer": "magique"})
+
+
+def test_load_options_gere_les_chemins_pointes():
+    """Un chemin `a.b` produit une seule option chaînée."""
+    assert len(loading.load_options(User, {"role.permissions": "selectin"})) == 1
+    assert loading.load_options(User, None) == []
+
+
+def test_liste_avec_client_precharge_en_nombre_constant_de_requetes(session):
+    """Les libellés `c.customer.company_name` ne déclenchent plus une requête par contrat."""
+    session.expire_all()
+    statements = count_statements(session.get_bind())
+    contracts = ContractRepository(session).list_all(load={"customer": "joined"})
+    labels = [c.customer.company_name for c in contracts]
+    assert len(labels) == 3
+    assert len(statements) == 1
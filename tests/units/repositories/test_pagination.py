@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+from app.repositories import pagination
+
+
+class IdColumn:
+    """Simule la colonne `id` : `id > x` produit un prédicat exploitable."""
+    def __gt__(self, other):
+        return lambda row: row.id > other
+
+
+class FakeQuery:
+    """Requête factice qui applique réellement filter/order_by/limit sur une liste."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.limit_value = None
+    def filter(self, predicate):
+        return FakeQuery([r for r in self.rows if predicate(r)])
+    def order_by(self, *_):
+        return FakeQuery(sorted(self.rows, key=lambda r: r.id))
+    def limit(self, n):
+        self.limit_value = n
+        return self
+    def all(self):
+        return self.rows[:self.limit_value]
+
+
+ROWS = [SimpleNamespace(id=i) for i in range(1, 8)]
+
+
+def test_paginate_renvoie_un_curseur_tant_quil_reste_des_lignes():
+    """La première page expose le dernier id comme curseur suivant."""
+    page = pagination.paginate(FakeQuery(ROWS), IdColumn(), limit=3)
+    assert [r.id for r in page.items] == [1, 2, 3]
+    assert page.next_cursor == 3
+    assert page.has_next
+
+
+def test_paginate_reprend_apres_le_curseur():
+    """La dernière page n'a plus de curseur."""
+    page = pagination.paginate(FakeQuery(ROWS), IdColumn(), after_id=6, limit=3)
+    assert [r.id for r in page.items] == [7]
+    assert page.next_cursor is None
+
+
+def test_clamp_limit_borne_la_taille_de_page():
+    """Les tailles nulles ou excessives sont ramenées dans les bornes."""
+    assert pagination.clamp_limit(None) == pagination.DEFAULT_PAGE_SIZE
+    assert pagination.clamp_limit(10_000) == pagination.MAX_PAGE_SIZE
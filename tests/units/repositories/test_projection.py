@@ -0,0 +1,92 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import count_queries
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.event_repository import EventRepository
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Un commercial, trois clients, un contrat et un évènement (sans support) par client."""
+    with Session(engine) as s:
+        role = Role(name="sales")
+        s.add(role)
+        s.flush()
+        user = User(role_id=role.id, user_first_name="S", user_last_name="S", email="s@x.fr",
+                    phone_number="1", username="s", password_hash="h")
+        s.add(user)
+        s.flush()
+        for n in range(3):
+            customer = Customer(user_sales_id=user.id, customer_first_name="C", customer_last_name=str(n),
+                                email=f"c{n}@x.fr", phone_number=f"0{n}", company_name=f"Société {n}")
+            s.add(customer)
+            s.flush()
+            contract = Contract(customer_id=customer.id, user_management_id=user.id,
+                                total_amount=Decimal("10"), balance_due=Decimal("10"), signed=n == 0)
+            s.add(contract)
+            s.flush()
+            s.add(Event(contract_id=contract.id, customer_id=customer.id, event_name=f"Évènement {n}",
+                        start_datetime=datetime.datetime(2026, 6, 1)))
+        s.commit()
+        s.user_id = user.id
+        s.expunge_all()
+        yield s
+
+
+def test_lignes_nommees_hors_identity_map(engine, session):
+    """Les listes projetées retournent des lignes nommées, sans entité suivie par la session."""
+    with count_queries(engine) as stats:
+        page = CustomerRepository(session).list_page(limit=2, columns=CustomerService.LIST_COLUMNS)
+    assert stats.count == 1
+    assert [row.id for row in page.items] == [1, 2] and page.next_cursor == 2
+    assert page.items[0]._fields == CustomerService.LIST_COLUMNS
+    assert page.items[0].company_name == "Société 0"
+    assert "email" not in stats.statements[0]
+    assert len(session.identity_map) == 0
+
+
+def test_colonne_de_relation_par_jointure(engine, session):
+    """`customer.company_name` est lu par jointure et exposé sous `customer_company_name`."""
+    repo = ContractRepository(session)
+    with count_queries(engine) as stats:
+        rows = repo.list_by_management_user(session.user_id, columns=ContractService.LIST_COLUMNS, signed=False)
+    assert stats.count == 1
+    assert [(r.id, r.customer_company_name) for r in rows] == [(2, "Société 1"), (3, "Société 2")]
+    rows = repo.list_by_customer_ids([1, 3], columns=ContractService.LIST_COLUMNS)
+    assert [r.customer_company_name for r in rows] == ["Société 0", "Société 2"]
+    assert len(session.identity_map) == 0
+
+
+def test_evenements_projetes(session):
+    """Critères et jointures des listes d'évènements restent valables avec une projection."""
+    repo = EventRepository(session)
+    columns = EventService.LIST_COLUMNS
+    assert [tuple(r) for r in repo.list_by_sales_user(session.user_id, columns=columns)] == [
+        (1, "Évènement 0"), (2, "Évènement 1"), (3, "Évènement 2")]
+    assert len(repo.list_without_support(columns=columns)) == 3
+    assert repo.list_page(columns=columns).items[0].event_name == "Évènement 0"
+    assert len(session.identity_map) == 0
@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import count_queries
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.repositories.references import count_references, ensure_unreferenced, has_references
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def session():
+    """Base SQLite en mémoire : un commercial avec un client et deux contrats, un second commercial sans client."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        role = Role(name="sales")
+        s.add(role)
+        s.flush()
+        users = [User(role_id=role.id, user_first_name="S", user_last_name="S", email=f"s{n}@x.fr",
+                      phone_number=str(n), username=f"s{n}", password_hash="h") for n in (1, 2)]
+        s.add_all(users)
+        s.flush()
+        customer = Customer(user_sales_id=users[0].id, customer_first_name="C", customer_last_name="C",
+                            email="c@x.fr", phone_number="0100", company_name="Société")
+        s.add(customer)
+        s.flush()
+        s.add_all([Contract(customer_id=customer.id, user_management_id=users[0].id,
+                            total_amount=Decimal("10"), balance_due=Decimal("0")) for _ in range(2)])
+        s.commit()
+        s.users, s.customer = users, customer
+        yield s
+    engine.dispose()
+
+
+def test_comptes_en_une_requete(session):
+    """Tous les comptes sont lus par une seule instruction ; EXISTS répond oui/non."""
+    references = UserService.DELETE_REFERENCES
+    sales_id, free_id = session.users[0].id, session.users[1].id
+    with count_queries(session.get_bind()) as stats:
+        counts = count_references(session, references, sales_id)
+    assert stats.count == 1
+    assert counts == {"contrat(s)": 2, "évènement(s)": 0, "client(s)": 1}
+    assert has_references(session, references, sales_id) is True
+    assert has_references(session, references, free_id) is False
+    assert count_references(session, (), sales_id) == {}
+
+
+def test_suppression_refusee_avec_detail(session):
+    """Sans référence : une requête EXISTS ; sinon le message détaille les comptes non nuls."""
+    references = (("contrat(s)", Contract.customer_id), ("évènement(s)", Event.customer_id))
+    customer_id = session.customer.id
+    with count_queries(session.get_bind()) as stats:
+        ensure_unreferenced(session, references, customer_id + 1, "Impossible :")
+    assert stats.count == 1
+    with pytest.raises(ValueError, match=r"^Impossible : 2 contrat\(s\)\.$"):
+        ensure_unreferenced(session, references, customer_id, "Impossible :")
@@ -0,0 +1,113 @@
+import asyncio
+import datetime
+import inspect
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.async_session import get_async_database_url
+from app.db.transaction import async_transactional
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.user import User
+from app.repositories.async_repositories import AsyncEventRepository, AsyncUserRepository
+from app.services.async_services import AsyncEventService
+from app.services.event_service import EventService
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Base SQLite sur fichier : deux commerciaux, un client et un contrat du premier."""
+    path = tmp_path / "async.sqlite3"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        role = Role(name="sales", permissions=[Permission(name="event:create"), Permission(name="event:read")])
+        s.add(role)
+        s.flush()
+        users = [User(role_id=role.id, user_first_name="S", user_last_name="S", email=f"s{n}@x.fr",
+                      phone_number=str(n), username=f"sales{n}", password_hash="h") for n in (1, 2)]
+        s.add_all(users)
+        s.flush()
+        customer = Customer(user_sales_id=users[0].id, customer_first_name="C", customer_last_name="C",
+                            email="c@x.fr", phone_number="0100", company_name="Société")
+        s.add(customer)
+        s.flush()
+        s.add(Contract(customer_id=customer.id, user_management_id=users[0].id,
+                       total_amount=Decimal("10"), balance_due=Decimal("0"), signed=True))
+        s.commit()
+    engine.dispose()
+    return path
+
+
+def _run(db_path, scenario):
+    pytest.importorskip("aiosqlite")  # extra `async` (poetry install --extras async)
+
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        try:
+            return await scenario(lambda: AsyncSession(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+def test_urls_asyncio():
+    """Le driver synchrone est remplacé par son équivalent asyncio."""
+    assert get_async_database_url("x", "sqlite").startswith("sqlite+aiosqlite:///")
+    assert get_async_database_url("x", "mysql").startswith("mysql+aiomysql://")
+
+
+def test_adaptateur_expose_les_methodes_du_service():
+    """Méthodes publiques en coroutines, constantes reprises, itérateurs exclus."""
+    assert inspect.iscoroutinefunction(AsyncEventService.create)
+    assert AsyncEventService.LIST_COLUMNS == EventService.LIST_COLUMNS
+    assert not hasattr(AsyncEventRepository, "stream_columns")
+
+
+def test_validation_et_permissions_partagees(db_path):
+    """create applique les mêmes contrôles que le service synchrone, puis le commit est attendu."""
+    start = datetime.datetime.now() + datetime.timedelta(days=30)
+
+    async def scenario(new_session):
+        async with new_session() as session:
+            users = AsyncUserRepository(session)
+            owner = await users.get_by_username("sales1", load={"role": "joined"})
+            other = await users.get_by_username("sales2", load={"role": "joined"})
+            service = AsyncEventService(session)
+            fields = {"contract_id": 1, "customer_id": 1, "event_name": "Salon",
+                      "start_datetime": start, "end_datetime": start}
+            with pytest.raises(PermissionError):
+                await service.create(other, **fields)
+            with pytest.raises(ValueError, match="Données invalides"):
+                await service.create(owner, **dict(fields, attendees=-1))
+            async with async_transactional(session):
+                event = await service.create(owner, **fields)
+            return event.id, event.event_name
+
+    assert _run(db_path, scenario) == (1, "Salon")
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as s:
+        assert s.query(Event).count() == 1
+    engine.dispose()
+
+
+def test_taches_concurrentes_une_session_chacune(db_path):
+    """Des requêtes simultanées (une AsyncSession par tâche) renvoient les mêmes résultats."""
+    async def scenario(new_session):
+        async def request(username):
+            async with new_session() as session:
+                user = await AsyncUserRepository(session).get_by_username(username, load={"role": "joined"})
+                page = await AsyncEventService(session).list_page(user, columns=AsyncEventService.LIST_COLUMNS)
+                return user.username, len(page.items)
+
+        return await asyncio.gather(*(request(f"sales{n % 2 + 1}") for n in range(6)))
+
+    assert sorted(_run(db_path, scenario)) == [("sales1", 0)] * 3 + [("sales2", 0)] * 3
@@ -1,3 +1,4 @@
+import pytest
 from unittest.mock import patch
 from app.services.auth_service import AuthService
 from datetime import datetime, timezone, timedelta
@@ -42,4 +43,83 @@ def test_decode_token_retourne_le_payload(monkeypatch):
         "app.services.auth_service.jwt.decode",
         lambda token, secret, algorithms: sentinel_payload,
     )
-    assert AuthService().decode_token("fake") is sentinel_payload
\ No newline at end of file
+    assert AuthService().decode_token("fake") is sentinel_payload
+def test_hash_passwords_par_lot_conserve_lordre():
+    """Le hachage par lot renvoie un hash par mot de passe, dans l'ordre, chacun avec son sel."""
+    auth = AuthService(profile="test")
+    hashes = auth.hash_passwords(["un-secret", "deux-secrets", "un-secret"], max_workers=2)
+    assert len(hashes) == 3
+    assert hashes[0] != hashes[2]
+    assert auth.verify_password(hashes[1], "deux-secrets") is True
+    assert auth.verify_password(hashes[2], "un-secret") is True
+
+def test_profil_de_cout_applique():
+    """Le profil choisi fixe les paramètres Argon2 encodés dans le hash."""
+    hashed = AuthService(profile="test").hash_password("secret123")
+    assert "m=8,t=1,p=1" in hashed
+
+def test_profil_inconnu_refuse():
+    with pytest.raises(ValueError):
+        AuthService(profile="inexistant")
+
+def test_verification_sur_le_pool_dedie():
+    """La vérification soumise au pool renvoie un Future avec le même résultat."""
+    auth = AuthService(profile="test")
+    hashed = auth.hash_password("secret123")
+    assert auth.submit_verify_password(hashed, "secret123").result() is True
+    assert auth.submit_verify_password(hashed, "autre").result() is False
+
+def test_verification_async():
+    """La variante async peut être attendue depuis une boucle asyncio."""
+    import asyncio
+    auth = AuthService(profile="test")
+    hashed = auth.hash_password("secret123")
+    assert asyncio.run(auth.verify_password_async(hashed, "secret123")) is True
+
+def test_file_dattente_saturee(monkeypatch):
+    """Au-delà du nombre de vérifications en attente autorisé, la demande est refusée."""
+    import threading
+    from app.services import auth_service
+    monkeypatch.setattr(auth_service, "_verify_slots", threading.BoundedSemaphore(0))
+    with pytest.raises(RuntimeError):
+        AuthService(profile="test").submit_verify_password("hash", "password")
+
+def test_needs_rehash_apres_changement_de_profil():
+    """Un hash produit avec un autre profil doit être rehaché."""
+    hashed = AuthService(profile="test").hash_password("secret123")
+    assert AuthService(profile="seed").needs_rehash(hashed) is True
+    assert AuthService(profile="test").needs_rehash(hashed) is False
+    assert AuthService(profile="test").needs_rehash("pas-un-hash") is False
+
+def test_decode_token_cached_ne_redecode_pas(monkeypatch):
+    """Un token déjà vérifié est servi depuis le cache, sans nouvel appel à jwt.decode."""
+    calls = []
+    def fake_decode(token, secret, algorithms):
+        calls.append(token)
+        return {"sub": "5", "exp": datetime.now(timezone.utc).timestamp() + 3600}
+    monkeypatch.setattr("app.services.auth_service.jwt.decode", fake_decode)
+    auth = AuthService()
+    first = auth.decode_token_cached("jeton-cache-unique")
+    second = auth.decode_token_cached("jeton-cache-unique")
+    assert first is second
+    assert calls == ["jeton-cache-unique"]
+
+def test_decode_token_cached_respecte_lexpiration(monkeypatch):
+    """Les claims d'un token expiré ne sont jamais resservis depuis le cache."""
+    calls = []
+    def fake_decode(token, secret, algorithms):
+        calls.append(token)
+        return {"sub": "5", "exp": datetime.now(timezone.utc).timestamp() - 1}
+    monkeypatch.setattr("app.services.auth_service.jwt.decode", fake_decode)
+    auth = AuthService()
+    auth.decode_token_cached("jeton-expire")
+    auth.decode_token_cached("jeton-expire")
+    assert len(calls) == 2
+
+def test_token_needs_refresh_selon_la_marge():
+    """Seuls les tokens proches de l'expiration doivent être ré-émis."""
+    auth = AuthService()
+    now = datetime.now(timezone.utc).timestamp()
+    assert auth.token_needs_refresh({"exp": now + 3600}) is False
+    assert auth.token_needs_refresh({"exp": now + 10}) is True
+    assert auth.token_needs_refresh({}) is True
@@ -0,0 +1,237 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.instrumentation import count_queries
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.services.contract_service import ContractService
+from app.services.customer_service import CustomerService
+from app.services.event_service import EventService
+
+
+class AllowAll:
+    """Service de permissions factice : tout est autorisé sauf `denied`."""
+    def __init__(self, denied=()):
+        self.denied = set(denied)
+
+    def user_has_permission(self, user, perm):
+        return perm not in self.denied
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Deux commerciaux et un gestionnaire ; un client et un contrat pour le premier commercial."""
+    with Session(engine) as s:
+        roles = {name: Role(name=name) for name in ("sales", "management")}
+        s.add_all(roles.values())
+        s.flush()
+        users = {}
+        for username, role in (("sales1", "sales"), ("sales2", "sales"), ("manager", "management")):
+            users[username] = User(role_id=roles[role].id, user_first_name="U", user_last_name="U",
+                                   email=f"{username}@x.fr", phone_number=username[-1], username=username,
+                                   password_hash="h")
+        s.add_all(users.values())
+        s.flush()
+        customer = Customer(user_sales_id=users["sales1"].id, customer_first_name="C", customer_last_name="C",
+                            email="client@x.fr", phone_number="0100", company_name="Société")
+        s.add(customer)
+        s.flush()
+        contract = Contract(customer_id=customer.id, user_management_id=users["manager"].id,
+                            total_amount=Decimal("100"), balance_due=Decimal("100"), signed=True)
+        s.add(contract)
+        s.commit()
+        s.users, s.customer, s.contract = users, customer, contract
+        yield s
+
+
+def _customer_row(n, **overrides):
+    row = {"customer_first_name": "Client", "customer_last_name": "Test", "email": f"c{n}@x.fr",
+           "phone_number": f"06{n:04d}", "company_name": f"Entreprise {n}"}
+    row.update(overrides)
+    return row
+
+
+def test_clients_crees_en_masse_avec_erreurs_par_ligne(engine, session):
+    """Les lignes invalides sont signalées et les autres créées ; contrôles groupés, nombre de requêtes fixe."""
+    service = CustomerService(session, AllowAll())
+    rows = [_customer_row(n) for n in range(50)]
+    rows[3]["email"] = "pas-un-email"
+    rows[7]["email"] = "client@x.fr"            # déjà en base
+    rows[9]["company_name"] = "Entreprise 8"    # doublon dans le lot
+    rows[11]["user_sales_id"] = 999             # un commercial n'attribue qu'à lui-même
+    user = session.users["sales1"]
+    assert user.role.name == "sales"  # chargé avant la mesure
+    with count_queries(engine) as stats:
+        report = service.bulk_create(user, rows, chunk_size=20)
+    assert (report.total, report.created) == (50, 46)
+    assert [e.index for e in report.errors] == [3, 7, 9, 11]
+    assert report.errors[0].message.startswith("Données invalides")
+    assert [e.message for e in report.errors[1:]] == [
+        "Email déjà utilisé", "Nom de société déjà utilisé", "Un commercial ne peut attribuer un client qu'à lui-même"]
+    # commerciaux + 3 champs uniques, puis 3 lots (SAVEPOINT/INSERT/RELEASE)
+    assert stats.count == 4 + 3 * 3
+    owners = {owner for (owner,) in session.query(Customer.user_sales_id)}
+    assert owners == {session.users["sales1"].id}
+    report = service.bulk_create(session.users["manager"], [_customer_row(99, user_sales_id=999)])
+    assert report.errors[0].message == "Utilisateur commercial (sales) introuvable"
+
+
+def test_permission_verifiee_une_fois_pour_le_lot(session):
+    """Sans la permission, le lot entier est refusé."""
+    service = CustomerService(session, AllowAll(denied={"customer:create"}))
+    with pytest.raises(PermissionError):
+        service.bulk_create(session.users["sales1"], [_customer_row(1)])
+
+
+def test_clients_mis_a_jour_en_masse(session):
+    """Seuls les clients du commercial sont modifiés ; les autres lignes sont signalées."""
+    service = CustomerService(session, AllowAll())
+    report = service.bulk_update(session.users["sales2"], [{"id": session.customer.id, "company_name": "Autre"}])
+    assert report.updated == 0 and "propriétaire" in report.errors[0].message
+    report = service.bulk_update(session.users["sales1"], [
+        {"id": session.customer.id, "company_name": "nouvelle société"},
+        {"id": 999, "company_name": "X"},
+        {"company_name": "Y"},
+    ])
+    assert report.updated == 1
+    assert [(e.index, e.message) for e in report.errors] == [(1, "Client non trouvé"), (2, "id est requis")]
+    assert session.customer.company_name == "Nouvelle société"
+
+
+def test_contrats_crees_et_mis_a_jour_en_masse(session):
+    """Gestionnaire par défaut, clients vérifiés en lot, solde comparé au montant actuel."""
+    service = ContractService(session, AllowAll())
+    manager = session.users["manager"]
+    report = service.bulk_create(manager, [
+        {"customer_id": session.customer.id, "total_amount": "500", "balance_due": "500"},
+        {"customer_id": 999, "total_amount": "10", "balance_due": "0"},
+        {"customer_id": session.customer.id, "total_amount": "10", "balance_due": "20"},
+    ])
+    assert report.created == 1
+    assert [(e.index, e.message) for e in report.errors][0] == (1, "Client introuvable")
+    assert report.errors[1].index == 2
+    assert session.query(Contract).filter(Contract.user_management_id == manager.id).count() == 2
+
+    report = service.bulk_update(manager, [
+        {"id": session.contract.id, "balance_due": "0"},
+        {"id": session.contract.id, "balance_due": "1000"},
+    ])
+    assert report.updated == 1 and report.errors[0].index == 1
+    session.refresh(session.contract)
+    assert session.contract.balance_due == Decimal("0")
+    assert session.contract.signed is True
+
+
+def test_evenements_crees_en_masse(session):
+    """Contrat, client et appartenance au commercial sont vérifiés en une requête pour tout le lot."""
+    service = EventService(session, AllowAll())
+    start = datetime.datetime.now() + datetime.timedelta(days=30)
+    base = {"contract_id": session.contract.id, "customer_id": session.customer.id, "event_name": "Salon",
+            "start_datetime": start, "end_datetime": start + datetime.timedelta(hours=2)}
+    rows = [dict(base), dict(base, contract_id=999), dict(base, customer_id=999)]
+    report = service.bulk_create(session.users["sales1"], rows)
+    assert report.created == 1
+    assert [(e.index, e.message) for e in report.errors] == [
+        (1, "Contrat non trouvé"), (2, "Le contrat n'est pas lié au client spécifié")]
+
+    report = service.bulk_create(session.users["sales2"], [dict(base)])
+    assert report.created == 0 and isinstance(report.errors[0].message, str)
+    assert session.query(Event).count() == 1
+
+    event_id = session.query(Event.id).scalar()
+    report = service.bulk_update(session.users["manager"], [
+        {"id": event_id, "user_support_id": session.users["sales2"].id},
+        {"id": event_id, "event_name": "Renommé"},
+    ])
+    assert report.updated == 1
+    assert report.errors[0].index == 1 and "user_support_id" in report.errors[0].message
+
+
+def test_ecritures_unitaires_d_evenement_en_peu_de_requetes(engine, session):
+    """
+    create : une lecture (contrat joint au client) puis l'INSERT ; update par le commercial :
+    l'événement, son contrat (appartenance) puis l'UPDATE ; un autre commercial est refusé.
+    """
+    service = EventService(session, AllowAll())
+    start = datetime.datetime.now() + datetime.timedelta(days=30)
+    user = session.users["sales1"]
+    assert user.role.name == "sales"  # chargé avant la mesure
+    refs = {"contract_id": session.contract.id, "customer_id": session.customer.id}
+    with count_queries(engine) as stats:
+        event = service.create(user, event_name="Salon", start_datetime=start, end_datetime=start, **refs)
+    assert stats.count == 2
+    with count_queries(engine) as stats:
+        service.update(user, event.id, event_name="Renommé")
+    assert stats.count == 3
+    with pytest.raises(ValueError, match="does not belong"):
+        service.update(user, event.id, customer_id=999)
+    other = session.users["sales2"]
+    with pytest.raises(PermissionError):
+        service.create(other, event_name="Salon", **refs)
+    with pytest.raises(PermissionError):
+        service.update(other, event.id, event_name="Pris")
+    with pytest.raises(PermissionError):
+        service.delete(other, event.id)
+    report = service.bulk_update(other, [{"id": event.id, "event_name": "Pris"}])
+    assert report.updated == 0 and isinstance(report.errors[0].message, str)
+    with pytest.raises(PermissionError):
+        EventService(session, AllowAll(denied={"event:update"})).update(user, event.id, event_name="Refusé")
+
+
+def test_evenement_refuse_sur_contrat_non_signe(session):
+    """Un lot ne peut pas rattacher d'événement à un contrat non signé, ni en création ni en mise à jour."""
+    unsigned = Contract(customer_id=session.customer.id, user_management_id=session.users["manager"].id,
+                        total_amount=Decimal("10"), balance_due=Decimal("10"), signed=False)
+    session.add(unsigned)
+    session.flush()
+    service = EventService(session, AllowAll())
+    start = datetime.datetime.now() + datetime.timedelta(days=30)
+    base = {"contract_id": unsigned.id, "customer_id": session.customer.id, "event_name": "Salon",
+            "start_datetime": start, "end_datetime": start + datetime.timedelta(hours=2)}
+    report = service.bulk_create(session.users["sales1"], [base, dict(base, contract_id=session.contract.id)])
+    assert report.created == 1
+    assert [(e.index, e.message) for e in report.errors] == [(0, "Le contrat doit être signé")]
+
+    event_id = session.query(Event.id).scalar()
+    report = service.bulk_update(session.users["sales1"], [{"id": event_id, "contract_id": unsigned.id}])
+    assert report.updated == 0 and report.errors[0].message == "Le contrat doit être signé"
+
+
+def test_meme_message_de_validation_unitaire_et_en_masse(session):
+    """Une même donnée invalide donne le même message via `create` et via `bulk_create`."""
+    service = CustomerService(session, AllowAll())
+    row = _customer_row(1, email="pas-un-email", user_sales_id=session.users["sales1"].id)
+    with pytest.raises(ValueError) as exc:
+        service.create(session.users["sales1"], **row)
+    report = service.bulk_create(session.users["sales1"], [row])
+    assert report.errors[0].message == str(exc.value)
+    assert str(exc.value).startswith("Données invalides : email")
+
+
+def test_lignes_qui_ne_sont_pas_des_objets_refusees(session):
+    """Création comme mise à jour : une ligne qui n'est pas un dictionnaire est refusée seule."""
+    manager = session.users["manager"]
+    for service in (ContractService(session, AllowAll()), EventService(session, AllowAll())):
+        report = service.bulk_create(manager, [["pas", "un", "objet"]])
+        assert (report.created, report.errors[0].message) == (0, "Enregistrement invalide : objet attendu, reçu list")
+    report = CustomerService(session, AllowAll()).bulk_update(session.users["sales1"], [
+        "texte", {"id": session.customer.id, "company_name": "Renommée"}])
+    assert report.updated == 1
+    assert [(e.index, e.message) for e in report.errors] == [(0, "Enregistrement invalide : objet attendu, reçu str")]
@@ -1,5 +1,6 @@
 from types import SimpleNamespace
 import pytest
+from app.repositories import references
 from app.services import contract_service
 
 class DummyPermService:
@@ -29,18 +30,18 @@ class DummyContractRepository:
         return updated
     def delete(self, contract):
         self.deleted.append(contract.id)
-    def list_all(self):
+    def list_all(self, load=None, **criteria):
         return [SimpleNamespace(id=1)]
-    def list_by_management_user(self, user_id):
+    def list_by_management_user(self, user_id, load=None, **criteria):
         return [SimpleNamespace(id=2, user_management_id=user_id)]
-    def list_by_customer_ids(self, customer_ids):
+    def list_by_customer_ids(self, customer_ids, load=None, **criteria):
         return [SimpleNamespace(customer_id=cid) for cid in customer_ids]
 
 class DummyContractCreate:
     """Remplace ContractCreate pour les tests."""
     def __init__(self, **data):
         self._data = data
-    def model_dump(self):
+    def model_dump(self, exclude_none=False):
         return dict(self._data)
 
 class DummyContractUpdate(DummyContractCreate):
@@ -113,6 +114,8 @@ def test_update_verifie_permissions_et_proprietaire():
 def test_delete_refuse_si_evenements_associes(monkeypatch):
     """Interdit la suppression lorsqu’un évènement référence le contrat."""
     session = DummySession(events=2)
+    monkeypatch.setattr(references, "has_references", lambda s, refs, value: True)
+    monkeypatch.setattr(references, "count_references", lambda s, refs, value: {"évènement(s)": s.events})
     service = make_service(session, {'contract:delete': True})
     service._ensure_management_user_exists = lambda user_id: None
     contract = service.repo.contract
@@ -1,5 +1,6 @@
 from types import SimpleNamespace
 import pytest
+from app.repositories import references
 from app.services import customer_service
 
 
@@ -14,32 +15,46 @@ class DummyPermService:
 
 class DummyQuery:
     """Représente une requête SQLAlchemy minimale pour les tests."""
-    def __init__(self, count_result=None, record=None):
+    def __init__(self, count_result=None, record=None, rows=None):
         self._count_result = count_result
         self._record = record
+        self._rows = rows or []
 
     def filter(self, *args, **kwargs):
         return self
 
+    def options(self, *args):
+        return self
+
     def count(self):
         return self._count_result or 0
 
     def one_or_none(self):
         return self._record
 
+    def limit(self, n):
+        return self
+
+    def all(self):
+        return self._rows
+
 
 class DummySession:
     """Simule la session SQLAlchemy avec des comptes de références configurables."""
-    def __init__(self, user_exists=True, contracts=0, events=0):
+    def __init__(self, user_exists=True, contracts=0, events=0, conflicts=None):
         self.user_exists = user_exists
         self.contracts = contracts
         self.events = events
+        self.conflicts = conflicts or []
         self.rollback_called = False
 
     def rollback(self):
         self.rollback_called = True
 
-    def query(self, model):
+    def query(self, model, *columns):
+        if columns:
+            # requête d'unicité sur les colonnes email / téléphone / société
+            return DummyQuery(rows=self.conflicts)
         if model.__name__ == "User":
             record = SimpleNamespace(id=1) if self.user_exists else None
             return DummyQuery(record=record)
@@ -71,10 +86,10 @@ class DummyCustomerRepository:
     def delete(self, customer):
         self.deleted.append(customer.id)
 
-    def list_all(self):
+    def list_all(self, columns=None):
         return [SimpleNamespace(id=1, company_name="Acme")]
 
-    def list_by_sales_user(self, user_id):
+    def list_by_sales_user(self, user_id, columns=None):
         return [SimpleNamespace(id=2, user_sales_id=user_id)]
 
 
@@ -150,10 +165,13 @@ def test_update_verifie_proprietaire_et_permissions():
 def test_delete_refuse_si_references(monkeypatch):
     """Interdit la suppression lorsque des contrats ou événements pointent encore le client."""
     session = DummySession(contracts=1, events=1)
+    monkeypatch.setattr(references, "has_references", lambda s, refs, value: True)
+    monkeypatch.setattr(references, "count_references",
+                        lambda s, refs, value: {"contrat(s)": s.contracts, "évènement(s)": s.events})
     service = make_service(session, {'customer:delete': True})
     service.repo.existing_customer = SimpleNamespace(id=9, user_sales_id=5)
     current_user = SimpleNamespace(id=5)
-    with pytest.raises(ValueError, match="référencé"):
+    with pytest.raises(ValueError, match=r"référencé par 1 contrat\(s\), 1 évènement\(s\)"):
         service.delete(current_user, 9)
 
 
@@ -172,4 +190,31 @@ def test_list_mine_appelle_les_clients_du_commercial():
     current_user = SimpleNamespace(id=17)
     result = service.list_mine(current_user)
     assert len(result) == 1
-    assert result[0].user_sales_id == current_user.id
\ No newline at end of file
+    assert result[0].user_sales_id == current_user.id
+
+def test_create_signale_le_champ_deja_utilise():
+    """Une seule requête d'unicité identifie le champ en conflit."""
+    conflict = SimpleNamespace(email="autre@example.com", phone_number="0123456", company_name="Autre")
+    session = DummySession(conflicts=[conflict])
+    service = make_service(session, {'customer:create': True})
+    user = SimpleNamespace(id=7, role=SimpleNamespace(name="sales"))
+    with pytest.raises(ValueError, match="Numéro de téléphone déjà utilisé"):
+        service.create(user, customer_first_name="A", customer_last_name="B", company_name="Acme",
+                       email="a@example.com", phone_number="0123456")
+
+
+def test_violation_dunicite_en_base_traduite_par_champ():
+    """Un doublon détecté par l'index unique à l'INSERT donne le même message par champ."""
+    from sqlalchemy.exc import IntegrityError
+    session = DummySession()
+    service = make_service(session, {'customer:create': True})
+
+    def failing_create(**kwargs):
+        raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed: customers.company_name"))
+
+    service.repo.create = failing_create
+    user = SimpleNamespace(id=7, role=SimpleNamespace(name="sales"))
+    with pytest.raises(ValueError, match="Nom de société déjà utilisé"):
+        service.create(user, customer_first_name="A", customer_last_name="B", company_name="Acme",
+                       email="a@example.com", phone_number="0123456")
+    assert session.rollback_called
@@ -32,20 +32,15 @@ class DummyEventRepository:
     def list_all(self):
         return list(self.events.values())
 
-class DummyContractRepository:
-    """Simule la vérification d’existence d’un contrat."""
-    def __init__(self, session):
-        self.session = session
-    def get_by_id(self, contract_id):
-        if contract_id == 1:
-            return SimpleNamespace(id=1, customer_id=10)
-        return None
+def dummy_contract_owners(self, contract_ids):
+    """Simule la lecture groupée des contrats : contrat 1 (client 10, commercial 5) signé, contrat 2 non signé."""
+    return {cid: owner for cid, owner in {1: (10, 5, True), 2: (10, 5, False)}.items() if cid in contract_ids}
 
 class DummyEventCreate:
     """Remplace la validation Pydantic pour la création."""
     def __init__(self, **data):
         self._data = data
-    def model_dump(self):
+    def model_dump(self, exclude_none=False):
         return dict(self._data)
 
 class DummyEventUpdate(DummyEventCreate):
@@ -57,7 +52,7 @@ class DummyEventUpdate(DummyEventCreate):
 def patch_dependencies(monkeypatch):
     """Injecte des implémentations factices pour isoler la logique métier."""
     monkeypatch.setattr(event_service, "EventRepository", DummyEventRepository)
-    monkeypatch.setattr(event_service, "ContractRepository", DummyContractRepository)
+    monkeypatch.setattr(event_service.EventService, "_contract_owners", dummy_contract_owners)
     monkeypatch.setattr(event_service, "EventCreate", DummyEventCreate)
     monkeypatch.setattr(event_service, "EventUpdate", DummyEventUpdate)
     monkeypatch.setattr(event_service.EventService, "_resolve_role_name", lambda self, user: getattr(getattr(user, 'role', None), 'name', None))
@@ -78,12 +73,16 @@ def test_create_requiert_permission():
 def test_create_injecte_contrat_et_customer(monkeypatch):
     """Vérifie qu’un contrat existant est requis et que la création appelle le dépôt."""
     service = make_service({'event:create': True})
-    service._ensure_customer_exists = lambda customer_id: None
-    service._ensure_customer_belongs_to_sales_user = lambda customer_id, user: None
     current_user = SimpleNamespace(id=5, role=SimpleNamespace(name="sales"))
     event = service.create(current_user, contract_id=1, customer_id=10, event_name="Lancement")
     assert event.event_name == "Lancement"
     assert event.contract_id == 1
+    with pytest.raises(ValueError, match="pas lié au client"):
+        service.create(current_user, contract_id=1, customer_id=11, event_name="Autre")
+    with pytest.raises(PermissionError):
+        service.create(SimpleNamespace(id=6, role=current_user.role), contract_id=1, customer_id=10, event_name="Autre")
+    with pytest.raises(ValueError, match="signé"):
+        service.create(current_user, contract_id=2, customer_id=10, event_name="Autre")
 
 def test_update_refuse_evenement_inexistant():
     """La mise à jour échoue si l’événement n’existe pas."""
@@ -0,0 +1,98 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.base import Base
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.services.export_service import ExportService
+
+
+class Perms:
+    def __init__(self, denied=()):
+        self.denied = set(denied)
+
+    def user_has_permission(self, user, perm):
+        return perm not in self.denied
+
+
+@pytest.fixture
+def session():
+    """Deux commerciaux (trois clients et deux clients), un contrat par client, un gestionnaire."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        roles = {name: Role(name=name) for name in ("sales", "management")}
+        s.add_all(roles.values())
+        s.flush()
+        users = {name: User(role_id=roles[role].id, user_first_name="U", user_last_name="U", email=f"{name}@x.fr",
+                            phone_number=name, username=name, password_hash="h")
+                 for name, role in (("s1", "sales"), ("s2", "sales"), ("m", "management"))}
+        s.add_all(users.values())
+        s.flush()
+        for n, owner in enumerate(("s1", "s1", "s1", "s2", "s2")):
+            customer = Customer(user_sales_id=users[owner].id, customer_first_name="C", customer_last_name="C",
+                                email=f"c{n}@x.fr", phone_number=f"0{n}", company_name=f"Société {n}")
+            s.add(customer)
+            s.flush()
+            s.add(Contract(customer_id=customer.id, user_management_id=users["m"].id,
+                           total_amount=Decimal("10.50"), balance_due=Decimal("0"), signed=True))
+        s.commit()
+        s.users = users
+        yield s
+    engine.dispose()
+
+
+def test_export_csv_restreint_au_commercial(session):
+    """Un commercial n'exporte que ses clients ; seules les colonnes demandées sont lues, sans objet ORM."""
+    session.expunge_all()
+    out = io.StringIO()
+    sales = session.query(User).filter(User.username == "s1").one()
+    assert sales.role.name == "sales"
+    result = ExportService(session, Perms()).export(sales, "customers", out, "csv", ["id", "email"], batch_size=2)
+    assert result.rows == 3
+    assert out.getvalue().splitlines() == ["id,email", "1,c0@x.fr", "2,c1@x.fr", "3,c2@x.fr"]
+    assert not any(isinstance(obj, Customer) for obj in session.identity_map.values())
+
+
+def test_export_jsonl_des_contrats(session):
+    """JSONL : montants en texte, dates ISO ; le gestionnaire exporte tous les contrats."""
+    out = io.StringIO()
+    result = ExportService(session, Perms()).export(session.users["m"], "contracts", out, "jsonl")
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert result.rows == 5 and len(lines) == 5
+    assert list(lines[0])[0] == "id"
+    assert lines[0]["total_amount"] == "10.50" and lines[0]["signed"] is True
+    assert "T" in lines[0]["created_at"]
+
+    out = io.StringIO()
+    ExportService(session, Perms()).export(session.users["s2"], "contracts", out, "jsonl", ["id", "customer_id"])
+    assert [json.loads(line)["customer_id"] for line in out.getvalue().splitlines()] == [4, 5]
+
+
+def test_export_refuse(session):
+    """Permission de lecture requise ; colonne inconnue signalée."""
+    with pytest.raises(PermissionError):
+        ExportService(session, Perms(denied={"event:read"})).export(session.users["m"], "events", io.StringIO())
+    with pytest.raises(ValueError, match="inconnue"):
+        ExportService(session, Perms()).export(session.users["m"], "customers", io.StringIO(), columns=["password"])
+
+
+def test_stream_verifie_avant_lecture_et_transmet_les_criteres(session):
+    """Colonne inconnue refusée dès `stream` ; les critères du repository filtrent l'export."""
+    service = ExportService(session, Perms())
+    with pytest.raises(ValueError, match="inconnue"):
+        service.stream(session.users["m"], "customers", ["password"])
+    out = io.StringIO()
+    assert service.export(session.users["m"], "contracts", out, "csv", ["id"], signed=False).rows == 0
+    assert service.export(session.users["m"], "customers", io.StringIO()).rows == 5
+    with pytest.raises(TypeError):
+        service.stream(session.users["m"], "customers", signed=True)
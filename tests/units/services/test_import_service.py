@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.base import Base
+from app.models.contract import Contract  # noqa: F401 - enregistre le mapper
+from app.models.customer import Customer
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission  # noqa: F401 - enregistre le mapper
+from app.models.role import Role
+from app.models.user import User
+from app.services.import_service import ImportService, batches, detect_format, read_records
+
+
+class AllowAll:
+    def user_has_permission(self, user, perm):
+        return True
+
+
+@pytest.fixture
+def session():
+    """Base SQLite en mémoire avec un commercial."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        role = Role(name="sales")
+        s.add(role)
+        s.flush()
+        user = User(role_id=role.id, user_first_name="S", user_last_name="S", email="s@x.fr",
+                    phone_number="1", username="s", password_hash="h")
+        s.add(user)
+        s.commit()
+        s.user = user
+        yield s
+    engine.dispose()
+
+
+def _rows(count):
+    return [{"customer_first_name": "Client", "customer_last_name": "Import", "email": f"c{n}@x.fr",
+             "phone_number": f"06{n:05d}", "company_name": f"Entreprise {n}"} for n in range(count)]
+
+
+def test_lecture_csv_et_jsonl(tmp_path):
+    """CSV : cellules vides à None ; JSONL : lignes vides ignorées, ligne invalide signalée."""
+    csv_path = tmp_path / "clients.csv"
+    csv_path.write_text("email,company_name\na@x.fr,\n", encoding="utf-8")
+    assert list(read_records(csv_path)) == [{"email": "a@x.fr", "company_name": None}]
+
+    jsonl_path = tmp_path / "clients.jsonl"
+    jsonl_path.write_text('{"email": "a@x.fr"}\n\n{"email": "b@x.fr"}\n{oups\n', encoding="utf-8")
+    records = read_records(jsonl_path)
+    assert [next(records), next(records)] == [{"email": "a@x.fr"}, {"email": "b@x.fr"}]
+    with pytest.raises(ValueError, match="Ligne 4"):
+        next(records)
+
+    with pytest.raises(ValueError):
+        detect_format(tmp_path / "clients.xlsx")
+    assert [len(c) for c in batches(range(7), 3)] == [3, 3, 1]
+
+
+def test_import_par_lots_avec_erreurs(tmp_path, session):
+    """Chaque lot est validé en base ; les positions des erreurs sont relatives au fichier."""
+    rows = _rows(25)
+    rows[12]["email"] = "invalide"
+    path = tmp_path / "clients.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    errors, offsets = [], []
+    progress = ImportService(session, AllowAll()).import_records(
+        session.user, "customers", read_records(path), chunk_size=10,
+        on_chunk=lambda p: offsets.append(p.offset), on_error=lambda i, m: errors.append(i),
+    )
+    assert (progress.read, progress.created, progress.rejected) == (25, 24, 1)
+    assert errors == [12]
+    assert offsets == [10, 20, 25]
+    assert session.query(Customer).count() == 24
+
+
+def test_reprise_apres_interruption(session):
+    """Les lots validés avant l'erreur restent en base ; la reprise à `offset` termine l'import."""
+    rows = _rows(30)
+
+    def failing():
+        for n, row in enumerate(rows):
+            if n == 15:
+                raise OSError("disque indisponible")
+            yield row
+
+    service = ImportService(session, AllowAll())
+    offsets = []
+    with pytest.raises(OSError):
+        service.import_records(session.user, "customers", failing(), chunk_size=10,
+                               on_chunk=lambda p: offsets.append(p.offset))
+    assert offsets == [10]
+    assert session.query(Customer).count() == 10
+
+    progress = service.import_records(session.user, "customers", iter(rows), offset=offsets[-1], chunk_size=10)
+    assert (progress.offset, progress.created, progress.rejected) == (30, 20, 0)
+    assert session.query(Customer).count() == 30
+
+
+def test_enregistrements_mal_formes_refuses_un_par_un(tmp_path, session):
+    """Tableau ou scalaire JSON, cellules CSV en trop : la ligne est refusée, l'import continue."""
+    good = _rows(3)
+    jsonl_path = tmp_path / "clients.jsonl"
+    jsonl_path.write_text(json.dumps(good[0]) + '\n["a", "b"]\n42\n' + json.dumps(good[1]) + "\n", encoding="utf-8")
+    errors = {}
+    service = ImportService(session, AllowAll())
+    progress = service.import_records(session.user, "customers", read_records(jsonl_path),
+                                      on_error=lambda i, m: errors.setdefault(i, m))
+    assert (progress.read, progress.created, progress.rejected) == (4, 2, 2)
+    assert errors == {1: "Enregistrement invalide : objet attendu, reçu list",
+                      2: "Enregistrement invalide : objet attendu, reçu int"}
+
+    csv_path = tmp_path / "clients.csv"
+    columns = list(good[2])
+    csv_path.write_text(",".join(columns) + "\n" + ",".join(good[2].values()) + ",en trop\n", encoding="utf-8")
+    errors.clear()
+    progress = service.import_records(session.user, "customers", read_records(csv_path),
+                                      on_error=lambda i, m: errors.setdefault(i, m))
+    assert (progress.created, progress.rejected) == (0, 1)
+    assert errors == {0: "Enregistrement invalide : 1 valeur(s) sans colonne"}
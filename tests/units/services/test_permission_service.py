@@ -35,4 +35,62 @@ def test_available_menus_filtre_bien_selon_permissions():
     assert "display_menu_users" in menus
     assert "display_menu_contracts" in menus
     assert "display_menu_customers" not in menus
-    assert "display_menu_events" not in menus
\ No newline at end of file
+    assert "display_menu_events" not in menus
+
+class CountingSession:
+    """Session factice qui compte les requêtes de chargement des permissions."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+    def query(self, *columns):
+        self.queries += 1
+        rows = self.rows
+        class Query:
+            def join(self, *args, **kwargs):
+                return self
+            def all(self):
+                return rows
+        return Query()
+
+
+def test_permissions_precalculees_une_seule_fois_pour_tous_les_roles():
+    """Les permissions de tous les rôles sont lues en une requête puis servies depuis le cache."""
+    session = CountingSession([(1, "user:read"), (1, "event:read"), (2, "customer:read")])
+    service = PermissionService(session=session)
+    manager = SimpleNamespace(id=1, role_id=1)
+    sales = SimpleNamespace(id=2, role_id=2)
+    assert service.user_has_permission(manager, "user:read") is True
+    assert service.user_has_permission(sales, "user:read") is False
+    assert service.available_menus_for_user(sales) == ["display_menu_customers"]
+    assert session.queries == 1
+    assert service.permissions_for(manager) == frozenset({"user:read", "event:read"})
+
+
+def test_invalidation_recharge_les_permissions():
+    """Une modification des rôles/permissions force un rechargement au prochain appel."""
+    from app.services.permission_service import invalidate_permission_cache
+    session = CountingSession([(1, "user:read")])
+    service = PermissionService(session=session)
+    user = SimpleNamespace(id=1, role_id=1)
+    service.user_has_permission(user, "user:read")
+    session.rows = [(1, "user:read"), (1, "user:delete")]
+    invalidate_permission_cache()
+    assert service.user_has_permission(user, "user:delete") is True
+    assert session.queries == 2
+
+
+def test_flush_dun_role_invalide_le_cache():
+    """Le listener `after_flush` incrémente la génération quand un rôle est modifié."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.models.base import Base
+    from app.models.role import Role
+    from app.services import permission_service
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    before = permission_service._cache_state["generation"]
+    with Session(engine) as session:
+        session.add(Role(name="audit"))
+        session.flush()
+    assert permission_service._cache_state["generation"] > before
+    engine.dispose()
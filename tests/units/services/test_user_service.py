@@ -36,7 +36,7 @@ class DummyRepository:
     def get_by_username(self, username):
         return None
 
-    def list_all(self):
+    def list_all(self, load=None):
         return [SimpleNamespace(id=1, username="foo")]
 
     def delete(self, user):
@@ -116,7 +116,7 @@ def test_create_hashes_and_normalizes(monkeypatch):
     service = make_service(session, {'user:create': True})
     # éviter les vérifications additionnelles
     service._ensure_role_exists = lambda role_id: None
-    service._check_uniqueness = lambda *args, **kwargs: None
+    monkeypatch.setattr(user_service, "check_unique", lambda *args, **kwargs: None)
     service._hash_password_if_present = user_service.UserService._hash_password_if_present.__get__(service)  # utiliser la méthode originale
     user = service.create(
         SimpleNamespace(id=1),
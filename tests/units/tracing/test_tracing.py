@@ -0,0 +1,87 @@
+import pytest
+import sentry_sdk
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import sentry
+from app.models.base import Base
+from app.models.contract import Contract  # noqa: F401 - enregistre le mapper
+from app.models.customer import Customer  # noqa: F401 - enregistre le mapper
+from app.models.event import Event  # noqa: F401 - enregistre le mapper
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.user import User
+from app.services.customer_service import CustomerService
+from app.services.permission_service import PermissionService
+
+
+class AllowAll:
+    def user_has_permission(self, user, perm):
+        return True
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Client Sentry local (rien n'est envoyé), toutes les traces échantillonnées."""
+    monkeypatch.setattr(sentry, "_TRACES_RATE", 1.0)
+    monkeypatch.setattr(sentry, "_OP_RATES", {})
+    recording = sentry.RecordingTransport()
+    sentry.init_sentry(transport=recording)
+    yield recording
+    sentry_sdk.get_global_scope().set_client(None)
+
+
+def test_spans_action_service_repository_sql(transport):
+    """Une action CLI produit une transaction contenant service, repository et requête SQL."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        with sentry.trace(sentry.CLI_INTERACTION_OP, "CustomersView.list_all_customers"):
+            CustomerService(session, AllowAll()).list_all(object())
+    engine.dispose()
+    sentry_sdk.flush()
+    [transaction] = transport.transactions()
+    assert transaction["transaction"] == "CustomersView.list_all_customers"
+    spans = {(span["op"], span.get("description", "").split(" ")[0]) for span in transaction["spans"]}
+    assert ("service", "CustomerService.list_all") in spans
+    assert ("db.repository", "CustomerRepository.list_all") in spans
+    assert ("db", "SELECT") in spans
+
+
+def test_echantillonnage_par_operation(monkeypatch):
+    """Le taux dépend de l'op racine (ou de son préfixe), puis de SENTRY_TRACES."""
+    monkeypatch.setattr(sentry, "_TRACES_RATE", 0.05)
+    monkeypatch.setattr(sentry, "_OP_RATES", sentry._parse_op_rates("cli.interaction=1.0, db=0.2"))
+    assert sentry.traces_sampler({"transaction_context": {"op": "cli.interaction"}}) == 1.0
+    assert sentry.traces_sampler({"transaction_context": {"op": "db.repository"}}) == 0.2
+    assert sentry.traces_sampler({"transaction_context": {"op": "service"}}) == 0.05
+    assert sentry.traces_sampler({"transaction_context": {"op": "service"}, "parent_sampled": True}) == 1.0
+
+
+def test_sans_client_aucun_span():
+    """Sans Sentry initialisé, les méthodes tracées s'exécutent telles quelles."""
+    assert not sentry._is_enabled()
+
+    @sentry.traced("service")
+    def double(x):
+        return 2 * x
+
+    assert double(21) == 42
+    assert sentry_sdk.get_current_span() is None
+
+
+def test_verifications_de_permission_non_tracees(transport):
+    """Les vérifications de PermissionService ne produisent aucun span, seul le service en a un."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Role(name="sales", permissions=[Permission(name="customer:read")]))
+        session.flush()
+        user = User(id=1, role_id=1)
+        with sentry.trace(sentry.CLI_INTERACTION_OP, "CustomersView.list_all_customers"):
+            CustomerService(session, PermissionService(session)).list_all(user)
+    engine.dispose()
+    sentry_sdk.flush()
+    [transaction] = transport.transactions()
+    services = [span["description"] for span in transaction["spans"] if span["op"] == "service"]
+    assert services == ["CustomerService.list_all"]
@@ -11,10 +11,11 @@ class FakePerm:
 class FakeSession:
     def __init__(self, get_map=None):
         self.get_map = get_map or {}
-    def get(self, model, _id):
+    def get(self, model, _id, **kwargs):
         return self.get_map.get(_id)
 
 class FakeContractService:
+    LIST_COLUMNS = ("id", "customer.company_name")
     def __init__(self, return_contract=None, list_result=None):
         self.return_contract = return_contract
         self.list_result = list_result or []
@@ -24,11 +25,11 @@ class FakeContractService:
         return True
     def delete(self, user, cid):
         return True
-    def list_all(self, user):
+    def list_all(self, user, **criteria):
         return self.list_result
-    def list_by_management_user(self, user, uid=None):
+    def list_by_management_user(self, user, uid=None, **criteria):
         return self.list_result
-    def list_by_customer_ids(self, user, ids):
+    def list_by_customer_ids(self, user, ids, **criteria):
         return self.list_result
 
 # -------------------------------------------------------
@@ -97,4 +98,24 @@ def test_list_all_contracts_empty(monkeypatch):
     monkeypatch.setattr('cli.helpers.prompt_menu', lambda *a, **k: None)
     logs = []
     monkeypatch.setattr('click.echo', lambda msg=None, **k: logs.append(msg))
-    view.list_all_contracts(user)
\ No newline at end of file
+    view.list_all_contracts(user)
+# ---------------- my_unsigned / my_unpaid ----------------
+def test_my_unsigned_et_unpaid_filtrent_en_base(monkeypatch):
+    """Les vues délèguent le filtre au service au lieu de trier les contrats en Python."""
+    user = SimpleNamespace(id=1, role=SimpleNamespace(name='management'))
+    perm = FakePerm({'contract:read'})
+    view = ContractsView(session=FakeSession(), perm_service=perm)
+    calls = []
+
+    class RecordingService(FakeContractService):
+        def list_by_management_user(self, user, uid=None, **criteria):
+            calls.append(criteria)
+            return []
+
+    monkeypatch.setattr('cli.views.contracts.ContractService', lambda s, p: RecordingService())
+    monkeypatch.setattr(view, 'prompt_menu', lambda *a, **k: None)
+    monkeypatch.setattr('click.echo', lambda *a, **k: None)
+    view.my_unsigned_contracts(user)
+    view.my_unpaid_contracts(user)
+    columns = FakeContractService.LIST_COLUMNS
+    assert calls == [{'signed': False, 'columns': columns}, {'unpaid': True, 'columns': columns}]
@@ -25,12 +25,14 @@ def test_user_from_token_returns_user(tmp_path, monkeypatch):
     _setup_token(tmp_path, monkeypatch)
     crm_interface._write_token("valid-token")
 
-    auth = SimpleNamespace(decode_token=lambda token: {"sub": "7"})
+    auth = SimpleNamespace(decode_token_cached=lambda token: {"sub": "7"})
     user = SimpleNamespace(id=7)
 
     class DummySession:
-        def get(self, model, object_id):
+        def get(self, model, object_id, **kwargs):
             assert model is crm_interface.User
+            # rôle et permissions chargés dans la même requête que l'utilisateur
+            assert kwargs.get("options")
             return user if object_id == 7 else None
 
     retrieved = crm_interface._user_from_token(DummySession(), auth)
@@ -42,11 +44,11 @@ def test_user_from_token_with_invalid_token_clears_file(tmp_path, monkeypatch):
     crm_interface._write_token("bad-token")
 
     class DummyAuth:
-        def decode_token(self, token):
+        def decode_token_cached(self, token):
             raise ValueError("boom")
 
     class DummySession:
-        def get(self, model, object_id):  # pragma: no cover - ne doit pas etre appele
+        def get(self, model, object_id, **kwargs):  # pragma: no cover - ne doit pas etre appele
             raise AssertionError("get ne doit pas etre invoque pour un token invalide")
 
     assert crm_interface._user_from_token(DummySession(), DummyAuth()) is None
@@ -57,12 +59,43 @@ def test_user_from_token_with_unknown_user_clears_file(tmp_path, monkeypatch):
     token_path = _setup_token(tmp_path, monkeypatch)
     crm_interface._write_token("orphan-token")
 
-    auth = SimpleNamespace(decode_token=lambda token: {"sub": "42"})
+    auth = SimpleNamespace(decode_token_cached=lambda token: {"sub": "42"})
 
     class DummySession:
-        def get(self, model, object_id):
+        def get(self, model, object_id, **kwargs):
             assert model is crm_interface.User
             return None
 
     assert crm_interface._user_from_token(DummySession(), auth) is None
     assert not token_path.exists()
+
+
+def test_prompt_login_rehache_un_mot_de_passe_obsolete(monkeypatch):
+    from app.services.auth_service import AuthService
+    old_hash = AuthService(profile="test").hash_password("password")
+    user = SimpleNamespace(id=1, username="bob", password_hash=old_hash, role=SimpleNamespace(name="sales"))
+    updates = []
+
+    class FakeRepo:
+        def __init__(self, session):
+            pass
+        def get_by_username(self, username):
+            return user
+        def update(self, target, **fields):
+            updates.append(fields)
+            target.password_hash = fields["password_hash"]
+
+    class FakeSession:
+        def commit(self):
+            pass
+        def rollback(self):
+            pass
+
+    answers = iter(["bob", "password"])
+    monkeypatch.setattr(crm_interface.click, "prompt", lambda *a, **k: next(answers))
+    monkeypatch.setattr(crm_interface.click, "echo", lambda *a, **k: None)
+    monkeypatch.setattr(crm_interface, "UserRepository", FakeRepo)
+    auth = AuthService(profile="seed")
+    assert crm_interface.prompt_login(FakeSession(), auth) is user
+    assert len(updates) == 1
+    assert not auth.needs_rehash(user.password_hash)
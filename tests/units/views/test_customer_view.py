@@ -11,10 +11,11 @@ class FakePerm:
 class FakeSession:
     def __init__(self, get_map=None):
         self.get_map = get_map or {}
-    def get(self, model, _id):
+    def get(self, model, _id, **kwargs):
         return self.get_map.get(_id)
 
 class FakeCustomerService:
+    LIST_COLUMNS = ("id", "customer_first_name", "customer_last_name", "company_name", "user_sales_id")
     def __init__(self, customers=None, new_customer=None):
         self.customers = customers or []
         self.new_customer = new_customer
@@ -24,9 +25,9 @@ class FakeCustomerService:
         return True
     def delete(self, user, cid):
         return True
-    def list_all(self, user):
+    def list_all(self, user, columns=None):
         return self.customers
-    def list_mine(self, user):
+    def list_mine(self, user, columns=None):
         return self.customers
 
 # -----------------------------------------
@@ -111,4 +112,35 @@ def test_display_detail_customers_not_found(monkeypatch):
 
     view = CustomersView(session, perm)
     view.display_detail_customers(user, 3)
-    assert any("introuvable" in (m or "") for m in logs)
\ No newline at end of file
+    assert any("introuvable" in (m or "") for m in logs)
+# ---------------- pagination ------------------------------
+def test_list_all_customers_charge_page_par_page(monkeypatch):
+    from app.repositories.pagination import Page
+    user = SimpleNamespace(id=1)
+    pages = {
+        None: Page(items=[SimpleNamespace(id=1, customer_first_name="A", customer_last_name="B", company_name="C", user_sales_id=1)], next_cursor=1),
+        1: Page(items=[SimpleNamespace(id=2, customer_first_name="D", customer_last_name="E", company_name="F", user_sales_id=1)]),
+    }
+    requested = []
+
+    class PagedService:
+        LIST_COLUMNS = FakeCustomerService.LIST_COLUMNS
+        def __init__(self, session, perm):
+            pass
+        def list_page(self, user, after_id=None, columns=None):
+            assert columns == self.LIST_COLUMNS
+            requested.append(after_id)
+            return pages[after_id]
+
+    monkeypatch.setattr("cli.views.customers.CustomerService", PagedService)
+    choices = iter(["next", "stop"])
+
+    def fake_prompt_menu(options, **kwargs):
+        if next(choices) == "next":
+            return options[-1][1]
+        return None
+
+    monkeypatch.setattr("cli.helpers.prompt_menu", fake_prompt_menu)
+    monkeypatch.setattr("click.echo", lambda msg=None, **k: None)
+    CustomersView(FakeSession(), FakePerm({"customer:read"})).list_all_customers(user)
+    assert requested == [None, 1]
@@ -15,6 +15,7 @@ class FakeSession:
         return self.get_map.get(_id)
 
 class FakeEventService:
+    LIST_COLUMNS = ("id", "event_name")
     def __init__(self, events=None, new_event=None):
         self.events = events or []
         self.new_event = new_event
@@ -22,9 +23,11 @@ class FakeEventService:
         return self.new_event
     def list_all(self, user):
         return self.events
-    def list_by_support_user(self, uid):
+    def list_by_support_user(self, uid, **criteria):
         return self.events
-    def list_by_customer(self, cid):
+    def list_by_customer(self, cid, **criteria):
+        return self.events
+    def list_by_sales_user(self, uid, **criteria):
         return self.events
     def update(self, user, event_id, **fields):
         return True
@@ -101,4 +104,26 @@ def test_delete_event_not_found(monkeypatch):
     monkeypatch.setattr("click.echo", lambda msg=None, **k: logs.append(msg))
 
     view.delete_event(user, 2)
-    assert any("introuvable" in (m or "") for m in logs)
\ No newline at end of file
+    assert any("introuvable" in (m or "") for m in logs)
+
+# ---------------- my_events ------------------------------
+def test_my_events_sales_une_seule_requete(monkeypatch):
+    """Pour un commercial, les évènements de tous ses clients viennent d'un seul appel."""
+    user = SimpleNamespace(id=4, role=SimpleNamespace(name="sales"),
+                           customers=[SimpleNamespace(id=i) for i in range(50)])
+    view = EventsView(session=FakeSession(), perm_service=FakePerm({"event:read"}))
+    calls = []
+
+    class RecordingService(FakeEventService):
+        def list_by_customer(self, cid, **criteria):
+            calls.append(("customer", cid))
+            return []
+        def list_by_sales_user(self, uid, **criteria):
+            calls.append(("sales", uid))
+            return []
+
+    monkeypatch.setattr("cli.views.events.EventService", lambda s, p: RecordingService())
+    monkeypatch.setattr(view, "prompt_menu", lambda *a, **k: None)
+    monkeypatch.setattr("click.echo", lambda *a, **k: None)
+    view.my_events(user)
+    assert calls == [("sales", 4)]
@@ -13,7 +13,7 @@ class FakeSession:
         self.get_map = get_map or {}
         self.roles = roles or []
         self.users = users or []
-    def get(self, model, _id):
+    def get(self, model, _id, **kwargs):
         return self.get_map.get(_id)
     def query(self, model):
         return SimpleNamespace(all=lambda: self.roles)